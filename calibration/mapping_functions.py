@@ -8,6 +8,11 @@ Version: 1.1
 Date: 2026-01-17
 Framework: Conduit Monism v9.2
 Updated: Integrated Compass research data (Ketamine PCI = 0.44 mean)
+
+CalibratedValue and GroundedState are frozen dataclasses: assigning to a
+field raises dataclasses.FrozenInstanceError. States are shared through
+src/calibration_registry.py, so derive a modified copy with
+dataclasses.replace() instead of editing one in place.
 """
 
 import json
@@ -15,7 +20,9 @@ import math
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
 
 
 class Confidence(Enum):
@@ -25,7 +32,7 @@ class Confidence(Enum):
     THEORETICAL = "THEORETICAL"
 
 
-@dataclass
+@dataclass(frozen=True)
 class CalibratedValue:
     """A framework variable value with empirical grounding."""
     value: float
@@ -355,11 +362,48 @@ def coherence_descriptive_to_kappa(description: str) -> CalibratedValue:
     )
 
 
+# MSE complexity ratio (mean SampEn over scales 2-20 / SampEn at scale 1,
+# m = 2, r = 0.15 SD) of the two reference noises
+MSE_RATIO_WHITE = 0.55  # Uncorrelated noise: entropy averages away
+MSE_RATIO_PINK = 0.95   # 1/f noise: entropy preserved across scales
+
+def mse_ratio_to_kappa(ratio: float) -> CalibratedValue:
+    """
+    Map the multiscale-entropy complexity ratio to κ.
+
+    Linear in the ratio, anchored so that white noise gives κ = 0.20
+    ('random') and 1/f noise κ = 0.85 ('fractal'), then clamped to [0, 1].
+    (Costa et al., 2002, 2005)
+
+    Args:
+        ratio: Coarse-scale to scale-1 sample entropy ratio
+               (see src.multiscale_entropy.mse_complexity_ratio)
+
+    Returns:
+        CalibratedValue with κ
+    """
+    if not ratio >= 0:
+        raise ValueError(f"MSE ratio must be non-negative, got {ratio}")
+
+    slope = (0.85 - 0.20) / (MSE_RATIO_PINK - MSE_RATIO_WHITE)
+    kappa_value = _clamp(0.20 + slope * (ratio - MSE_RATIO_WHITE))
+
+    # Outside the white-to-pink span the anchors are extrapolated
+    inside = MSE_RATIO_WHITE - 0.15 <= ratio <= MSE_RATIO_PINK + 0.15
+    return CalibratedValue(
+        value=kappa_value,
+        confidence=Confidence.MODERATE if inside else Confidence.LOW,
+        source="MSE complexity ratio",
+        empirical_measure=ratio,
+        notes=f"κ = 0.20 + {slope:.3g} × (ratio - {MSE_RATIO_WHITE}) (Costa et al., 2002)"
+    )
+
+
 # =============================================================================
 # Composite Functions
 # =============================================================================
 
-@dataclass
+@dataclass(frozen=True)
 class GroundedState:
     """A consciousness state with empirically grounded variable values."""
     name: str
@@ -500,6 +544,301 @@ def create_grounded_state(
     )
 
 
+# =============================================================================
+# Columnar Mappers (Cohorts)
+# =============================================================================
+#
+# Array-in/array-out counterparts of the scalar mappers above, for mapping
+# whole cohorts of measurements. Values and confidence levels are arrays;
+# provenance (source and notes) is stored once per column, with a small
+# per-row code when a column mixes several sources. NaN marks a missing
+# measurement and propagates through the mappers.
+
+# Confidence codes used in columnar results (index into this tuple)
+CONFIDENCE_ORDER = (Confidence.HIGH, Confidence.MODERATE,
+                    Confidence.LOW, Confidence.THEORETICAL)
+_CODE = {level: code for code, level in enumerate(CONFIDENCE_ORDER)}
+
+
+@dataclass(frozen=True)
+class CalibratedColumn:
+    """
+    A framework variable for many measurements at once.
+
+    Attributes:
+        values: Variable values (float array, NaN where missing)
+        confidence: Confidence codes (int8, index into CONFIDENCE_ORDER)
+        sources: Provenance strings, one per distinct source in the column
+        source_code: Index into sources for each row (int8)
+        empirical_measure: The measurement each value was mapped from
+        notes: Mapping notes, aligned with sources
+    """
+    values: np.ndarray
+    confidence: np.ndarray
+    sources: Tuple[str, ...]
+    source_code: np.ndarray
+    empirical_measure: Optional[np.ndarray] = None
+    notes: Tuple[str, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def confidence_levels(self) -> list:
+        """Confidence enum for each row."""
+        return [CONFIDENCE_ORDER[c] for c in self.confidence]
+
+    def value_at(self, i: int) -> CalibratedValue:
+        """Materialize row i as a scalar CalibratedValue."""
+        code = self.source_code[i]
+        measure = None
+        if self.empirical_measure is not None and not np.isnan(self.empirical_measure[i]):
+            measure = float(self.empirical_measure[i])
+        return CalibratedValue(
+            value=float(self.values[i]),
+            confidence=CONFIDENCE_ORDER[self.confidence[i]],
+            source=self.sources[code],
+            empirical_measure=measure,
+            notes=self.notes[code] if self.notes else ""
+        )
+
+
+def _column(values, confidence, source: str, measure=None, notes: str = "") -> CalibratedColumn:
+    values = np.asarray(values, dtype=float)
+    confidence = np.broadcast_to(np.asarray(confidence, dtype=np.int8), values.shape).copy()
+    return CalibratedColumn(
+        values=values,
+        confidence=confidence,
+        sources=(source,),
+        source_code=np.zeros(values.shape, dtype=np.int8),
+        empirical_measure=None if measure is None else np.asarray(measure, dtype=float),
+        notes=(notes,)
+    )
+
+
+def _check_unit_interval(values: np.ndarray, label: str):
+    bad = ~np.isnan(values) & ((values < 0) | (values > 1))
+    if bad.any():
+        raise ValueError(f"{label} must be between 0 and 1, got {values[bad][0]}")
+
+
+def pci_to_rho_array(pci) -> CalibratedColumn:
+    """Columnar pci_to_rho: ρ = PCI (HIGH confidence)."""
+    pci = np.asarray(pci, dtype=float)
+    _check_unit_interval(pci, "PCI")
+    return _column(pci, _CODE[Confidence.HIGH], "PCI direct mapping", pci,
+                   "Direct mapping: ρ = PCI (Casali et al., 2013)")
+
+
+def pci_range_to_rho_array(pci_min, pci_max) -> CalibratedColumn:
+    """Columnar pci_range_to_rho: ρ = midpoint of [PCI_min, PCI_max]."""
+    midpoint = np.clip((np.asarray(pci_min, dtype=float) + np.asarray(pci_max, dtype=float)) / 2,
+                       0.0, 1.0)
+    return _column(midpoint, _CODE[Confidence.HIGH], "PCI range midpoint", midpoint,
+                   "Midpoint of PCI range")
+
+
+def lzc_to_H_array(lzc_normalized) -> CalibratedColumn:
+    """Columnar lzc_to_H: H = LZc_normalized (HIGH confidence)."""
+    lzc = np.asarray(lzc_normalized, dtype=float)
+    _check_unit_interval(lzc, "Normalized LZc")
+    return _column(lzc, _CODE[Confidence.HIGH], "LZc normalized", lzc,
+                   "H = LZc_normalized (Schartner et al., 2015, 2017)")
+
+
+def lzc_percent_change_to_H_array(percent_change, baseline: float = LZC_BASELINE) -> CalibratedColumn:
+    """Columnar lzc_percent_change_to_H: H = baseline × (1 + change%), clamped."""
+    change = np.asarray(percent_change, dtype=float)
+    h_value = np.clip(baseline * (1 + change / 100), 0.0, 1.0)
+    confidence = np.where(np.abs(change) <= 30, _CODE[Confidence.HIGH], _CODE[Confidence.MODERATE])
+    return _column(h_value, confidence, "LZc percent change", change,
+                   f"H = {baseline} × (1 + LZc change%)")
+
+
+def temporal_window_to_tau_array(window_ms) -> CalibratedColumn:
+    """Columnar temporal_window_to_tau: τ = window_ms / 3000, clamped."""
+    window = np.asarray(window_ms, dtype=float)
+    tau_value = np.clip(window / TAU_BASELINE_MS, 0.0, 1.0)
+    confidence = np.select(
+        [(window >= 2000) & (window <= 4000), (window >= 1000) & (window <= 6000)],
+        [_CODE[Confidence.HIGH], _CODE[Confidence.MODERATE]],
+        default=_CODE[Confidence.LOW]
+    )
+    return _column(tau_value, confidence, "Temporal window normalization", window,
+                   f"τ = window_ms / {TAU_BASELINE_MS}ms (Pöppel 1997 baseline)")
+
+
+def effective_connectivity_to_phi_array(connectivity_ratio,
+                                        baseline: float = PHI_BASELINE) -> CalibratedColumn:
+    """Columnar effective_connectivity_to_phi: φ = baseline × ratio, clamped."""
+    ratio = np.asarray(connectivity_ratio, dtype=float)
+    return _column(np.clip(baseline * ratio, 0.0, 1.0), _CODE[Confidence.MODERATE],
+                   "Effective connectivity ratio", ratio,
+                   f"φ = {baseline} × connectivity ratio (relative to waking)")
+
+
+def connectivity_reduction_to_phi_array(percent_reduction,
+                                        baseline: float = PHI_BASELINE) -> CalibratedColumn:
+    """Columnar connectivity_reduction_to_phi: φ = baseline × (1 - reduction%), clamped."""
+    reduction = np.asarray(percent_reduction, dtype=float)
+    phi_value = np.clip(baseline * (1 - reduction / 100), 0.0, 1.0)
+    return _column(phi_value, _CODE[Confidence.MODERATE], "Connectivity reduction", reduction,
+                   f"φ = {baseline} × (1 - reduction%) (Ferrarelli 2010 method)")
+
+
+def _merge_columns(n: int, candidates: Sequence[CalibratedColumn],
+                   default: float) -> CalibratedColumn:
+    """
+    Per row, take the first candidate with a value; rows with no value
+    anywhere get the THEORETICAL default ("no data").
+    """
+    values = np.full(n, np.nan)
+    confidence = np.full(n, _CODE[Confidence.THEORETICAL], dtype=np.int8)
+    measure = np.full(n, np.nan)
+    source_code = np.zeros(n, dtype=np.int8)
+    sources, notes = [], []
+    for column in candidates:
+        take = np.isnan(values) & ~np.isnan(column.values)
+        if not take.any():
+            continue
+        values[take] = column.values[take]
+        confidence[take] = column.confidence[take]
+        source_code[take] = column.source_code[take] + len(sources)
+        if column.empirical_measure is not None:
+            measure[take] = column.empirical_measure[take]
+        sources.extend(column.sources)
+        notes.extend(column.notes or ("",) * len(column.sources))
+    missing = np.isnan(values)
+    if missing.any():
+        values[missing] = default
+        source_code[missing] = len(sources)
+        sources.append("no data")
+        notes.append("")
+    return CalibratedColumn(values, confidence, tuple(sources), source_code,
+                            measure, tuple(notes))
+
+
+@dataclass(frozen=True)
+class GroundedStateTable:
+    """Columnar counterpart of GroundedState for a cohort of measurements."""
+    names: Tuple[str, ...]
+    phi: CalibratedColumn
+    tau: CalibratedColumn
+    rho: CalibratedColumn
+    H: CalibratedColumn
+    kappa: CalibratedColumn
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def invariants(self) -> np.ndarray:
+        """(N, 5) array of φ, τ, ρ, H, κ."""
+        return np.column_stack([self.phi.values, self.tau.values, self.rho.values,
+                                self.H.values, self.kappa.values])
+
+    def density(self) -> np.ndarray:
+        """v9.2 density for every row."""
+        h = self.H.values
+        structure = self.phi.values * self.tau.values * self.rho.values
+        entropy_gate = (1 - np.sqrt(h)) + (h * self.kappa.values)
+        return structure * entropy_gate
+
+    def overall_confidence(self) -> np.ndarray:
+        """Lowest confidence among the five variables, as codes."""
+        return np.max([self.phi.confidence, self.tau.confidence, self.rho.confidence,
+                       self.H.confidence, self.kappa.confidence], axis=0).astype(np.int8)
+
+    def state(self, i: int) -> GroundedState:
+        """Materialize row i as a GroundedState."""
+        return GroundedState(
+            name=self.names[i],
+            phi=self.phi.value_at(i),
+            tau=self.tau.value_at(i),
+            rho=self.rho.value_at(i),
+            H=self.H.value_at(i),
+            kappa=self.kappa.value_at(i),
+            citations=[]
+        )
+
+
+def create_grounded_states(
+    table: Mapping[str, Sequence[float]],
+    names: Optional[Sequence[str]] = None
+) -> GroundedStateTable:
+    """
+    Create grounded states for a whole table of empirical measurements.
+
+    Bulk counterpart of create_grounded_state. Each column is an array with
+    one entry per subject/recording; NaN means the measurement is missing.
+    Per row and variable, the first available source wins, in this order:
+
+        ρ: pci, then pci_min/pci_max, then rho override
+        H: lzc_normalized, then lzc_change, then H override
+        τ: temporal_window_ms, then tau override
+        φ: connectivity_ratio, then connectivity_reduction, then phi override
+        κ: kappa override
+
+    Overrides are LOW confidence ("manual override"). Rows with nothing
+    get the same THEORETICAL defaults as create_grounded_state.
+
+    Args:
+        table: Column name → array of measurements
+        names: Row names (default state_0, state_1, ...)
+
+    Returns:
+        GroundedStateTable with one CalibratedColumn per variable
+    """
+    known = {"pci", "pci_min", "pci_max", "lzc_normalized", "lzc_change",
+             "temporal_window_ms", "connectivity_ratio", "connectivity_reduction",
+             "phi", "tau", "rho", "H", "kappa"}
+    unknown = set(table) - known
+    if unknown:
+        raise ValueError(f"Unknown measurement columns: {sorted(unknown)}")
+    if ("pci_min" in table) != ("pci_max" in table):
+        raise ValueError("pci_min and pci_max must be given together")
+
+    columns: Dict[str, np.ndarray] = {k: np.asarray(v, dtype=float) for k, v in table.items()}
+    lengths = {len(v) for v in columns.values()}
+    if names is not None:
+        lengths.add(len(names))
+    if len(lengths) > 1:
+        raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+    n = lengths.pop() if lengths else 0
+    names = tuple(names) if names is not None else tuple(f"state_{i}" for i in range(n))
+
+    def override(key: str) -> list:
+        if key not in columns:
+            return []
+        return [_column(columns[key], _CODE[Confidence.LOW], "manual override")]
+
+    rho = []
+    if "pci" in columns:
+        rho.append(pci_to_rho_array(columns["pci"]))
+    if "pci_min" in columns:
+        rho.append(pci_range_to_rho_array(columns["pci_min"], columns["pci_max"]))
+    H = []
+    if "lzc_normalized" in columns:
+        H.append(lzc_to_H_array(columns["lzc_normalized"]))
+    if "lzc_change" in columns:
+        H.append(lzc_percent_change_to_H_array(columns["lzc_change"]))
+    tau = []
+    if "temporal_window_ms" in columns:
+        tau.append(temporal_window_to_tau_array(columns["temporal_window_ms"]))
+    phi = []
+    if "connectivity_ratio" in columns:
+        phi.append(effective_connectivity_to_phi_array(columns["connectivity_ratio"]))
+    if "connectivity_reduction" in columns:
+        phi.append(connectivity_reduction_to_phi_array(columns["connectivity_reduction"]))
+
+    return GroundedStateTable(
+        names=names,
+        phi=_merge_columns(n, phi + override("phi"), 0.80),
+        tau=_merge_columns(n, tau + override("tau"), 0.50),
+        rho=_merge_columns(n, rho + override("rho"), 0.50),
+        H=_merge_columns(n, H + override("H"), 0.50),
+        kappa=_merge_columns(n, override("kappa"), 0.50),
+    )
+
+
 # =============================================================================
 # Pre-defined Grounded States
 # =============================================================================
@@ -736,22 +1075,90 @@ def get_calibrated_states() -> dict:
     return states
 
 
+# =============================================================================
+# State Index Tables
+# =============================================================================
+
+# Category of each calibrated state (keys of get_calibrated_states)
+STATE_CATEGORIES = {
+    "wakefulness": "waking",
+    "flow_state": "waking",
+    "deep_meditation": "waking",
+    "propofol_anesthesia": "anesthesia",
+    "xenon_anesthesia": "anesthesia",
+    "midazolam_anesthesia": "anesthesia",
+    "ketamine_anesthesia": "anesthesia",
+    "REM_sleep": "sleep",
+    "NREM_sleep_N3": "sleep",
+    "vegetative_state": "disorder_of_consciousness",
+    "minimally_conscious": "disorder_of_consciousness",
+    "locked_in_syndrome": "disorder_of_consciousness",
+    "psilocybin": "psychedelic",
+    "LSD": "psychedelic",
+    "DMT_breakthrough": "psychedelic",
+    "panic_attack": "acute",
+    "epileptic_seizure": "acute",
+}
+
+# Short names used in CANON.md and the scripts, beyond those derived from
+# each state's key and display name
+STATE_ALIASES = {
+    "Propofol": "propofol_anesthesia",
+    "Xenon": "xenon_anesthesia",
+    "Midazolam": "midazolam_anesthesia",
+    "Ketamine": "ketamine_anesthesia",
+    "K-hole": "ketamine_anesthesia",
+    "REM": "REM_sleep",
+    "NREM N3": "NREM_sleep_N3",
+    "N3": "NREM_sleep_N3",
+    "Vegetative": "vegetative_state",
+    "Vegetative (UWS)": "vegetative_state",
+    "UWS": "vegetative_state",
+    "MCS": "minimally_conscious",
+    "Locked-in": "locked_in_syndrome",
+    "DMT": "DMT_breakthrough",
+    "Flow": "flow_state",
+    "Meditation": "deep_meditation",
+    "Panic": "panic_attack",
+    "Seizure": "epileptic_seizure",
+}
+
+# CANON.md "Calibrated Reference States" table (human states). These are
+# the framework's reference vectors, distinct from the empirically
+# grounded values above.
+CANON_REFERENCE_STATES = {
+    "Wakefulness":  {"phi": 0.80, "tau": 0.75, "rho": 0.65, "H": 0.50, "kappa": 0.65},
+    "REM Sleep":    {"phi": 0.60, "tau": 0.50, "rho": 0.45, "H": 0.55, "kappa": 0.55},
+    "NREM N3":      {"phi": 0.40, "tau": 0.15, "rho": 0.23, "H": 0.40, "kappa": 0.30},
+    "Propofol":     {"phi": 0.25, "tau": 0.10, "rho": 0.24, "H": 0.35, "kappa": 0.20},
+    "Ketamine":     {"phi": 0.50, "tau": 0.50, "rho": 0.44, "H": 0.55, "kappa": 0.80},
+    "Psilocybin":   {"phi": 0.70, "tau": 0.65, "rho": 0.55, "H": 0.60, "kappa": 0.85},
+    "DMT":          {"phi": 0.85, "tau": 0.90, "rho": 0.70, "H": 0.70, "kappa": 0.90},
+    "Flow":         {"phi": 0.90, "tau": 0.70, "rho": 0.65, "H": 0.55, "kappa": 0.75},
+    "Meditation":   {"phi": 0.85, "tau": 0.80, "rho": 0.70, "H": 0.40, "kappa": 0.80},
+}
+
+
 # =============================================================================
 # Utility Functions
 # =============================================================================
 
+# Header of the grounded-states JSON export
+EXPORT_METADATA = {
+    "version": "1.1",
+    "date": "2026-01-17",
+    "framework": "Conduit Monism v9.2",
+    "description": "Empirically grounded consciousness states",
+    "changes": "Integrated Compass research: Ketamine PCI=0.44, added xenon/midazolam, PCI* threshold 0.31"
+}
+
+
 def export_grounded_states_json(output_path: str = None) -> str:
     """Export all grounded states to JSON."""
     states = get_calibrated_states()
 
     output = {
-        "metadata": {
-            "version": "1.1",
-            "date": "2026-01-17",
-            "framework": "Conduit Monism v9.2",
-            "description": "Empirically grounded consciousness states",
-            "changes": "Integrated Compass research: Ketamine PCI=0.44, added xenon/midazolam, PCI* threshold 0.31"
-        },
+        "metadata": EXPORT_METADATA,
         "states": {name: state.to_dict() for name, state in states.items()}
     }
 
@@ -20,11 +20,36 @@ import json
 import itertools
 import os
 import sys
+import time
 from datetime import datetime
-from collections import defaultdict
+from pathlib import Path
 
 import numpy as np
 
+# Add project paths
+PROJECT_ROOT = Path(__file__).parent.parent
+for path in [str(PROJECT_ROOT), str(PROJECT_ROOT / "calibration"), str(PROJECT_ROOT / "src")]:
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from src.calibration_registry import canon_states, get_grounded_state
+from src.batch_operators import INVARIANTS
+from src.conditional_variance import conditional_variance
+from src.density_distribution import DensityDistribution
+from src.diameter import farthest_pair
+from src.cache import cache_key
+from src.density_models import FORMULA_VERSION
+from src.grid_sweep import (
+    DEFAULT_CHUNK_SIZE,
+    GridSweep,
+    IsoclineCollector,
+    grid_coords,
+    run_sweep,
+    sweep_isoclines,
+)
+from src.stage_runner import SharedArray, Task, run_tasks
+from src.isosurface import trace_isosurface
+
 # ---------------------------------------------------------------------------
 # Core formula
 # ---------------------------------------------------------------------------
@@ -37,30 +62,40 @@ def density(phi, tau, rho, H, kappa):
 
 
 # ---------------------------------------------------------------------------
-# Calibrated canonical states from CANON.md (lines 338-348)
+# Calibrated canonical states from CANON.md (shared table in the
+# calibration library)
 # ---------------------------------------------------------------------------
 
-CANONICAL_STATES = {
-    "Wakefulness":  {"phi": 0.80, "tau": 0.75, "rho": 0.65, "H": 0.50, "kappa": 0.65},
-    "REM Sleep":    {"phi": 0.60, "tau": 0.50, "rho": 0.45, "H": 0.55, "kappa": 0.55},
-    "NREM N3":      {"phi": 0.40, "tau": 0.15, "rho": 0.23, "H": 0.40, "kappa": 0.30},
-    "Propofol":     {"phi": 0.25, "tau": 0.10, "rho": 0.24, "H": 0.35, "kappa": 0.20},
-    "Ketamine":     {"phi": 0.50, "tau": 0.50, "rho": 0.44, "H": 0.55, "kappa": 0.80},
-    "Psilocybin":   {"phi": 0.70, "tau": 0.65, "rho": 0.55, "H": 0.60, "kappa": 0.85},
-    "DMT":          {"phi": 0.85, "tau": 0.90, "rho": 0.70, "H": 0.70, "kappa": 0.90},
-    "Flow":         {"phi": 0.90, "tau": 0.70, "rho": 0.65, "H": 0.55, "kappa": 0.75},
-    "Meditation":   {"phi": 0.85, "tau": 0.80, "rho": 0.70, "H": 0.40, "kappa": 0.80},
-}
+CANONICAL_STATES = {name: dict(values) for name, values in canon_states().items()}
+
+
+def library_state(name):
+    """Invariants of a calibration-library state, by any known spelling."""
+    state = get_grounded_state(name)
+    return {var: getattr(state, var).value for var in INVARIANTS}
+
 
-# Additional states from calibration library for degeneracy tests
+# Additional states for degeneracy tests. Library states are read from
+# the registry so they track the calibration; Light Anesthesia and
+# Drowsiness have no library entry and are set by hand.
 EXTENDED_STATES = {
-    "Panic Attack":     {"phi": 0.88, "tau": 0.50, "rho": 0.70, "H": 0.675, "kappa": 0.20},
-    "Light Anesthesia": {"phi": 0.40, "tau": 0.25, "rho": 0.35, "H": 0.40, "kappa": 0.30},
-    "Drowsiness":       {"phi": 0.65, "tau": 0.40, "rho": 0.50, "H": 0.45, "kappa": 0.45},
-    "Epileptic Seizure":{"phi": 0.80, "tau": 0.10, "rho": 0.15, "H": 0.70, "kappa": 0.10},
-    "Locked-in":        {"phi": 0.80, "tau": 0.75, "rho": 0.57, "H": 0.50, "kappa": 0.50},
-    "Vegetative (UWS)": {"phi": 0.20, "tau": 0.25, "rho": 0.29, "H": 0.375, "kappa": 0.30},
-    "MCS":              {"phi": 0.40, "tau": 0.25, "rho": 0.41, "H": 0.425, "kappa": 0.50},
+    "Panic Attack":      library_state("Panic Attack"),
+    "Light Anesthesia":  {"phi": 0.40, "tau": 0.25, "rho": 0.35, "H": 0.40, "kappa": 0.30},
+    "Drowsiness":        {"phi": 0.65, "tau": 0.40, "rho": 0.50, "H": 0.45, "kappa": 0.45},
+    "Epileptic Seizure": library_state("Epileptic Seizure"),
+    "Locked-in":         library_state("Locked-in"),
+    "Vegetative (UWS)":  library_state("Vegetative (UWS)"),
+    "MCS":               library_state("MCS"),
+}
+
+# Hand-copied values used before the library lookup (e.g. in the published
+# 20260222 run) that differ from the library; recorded in the results so
+# changed degeneracy numbers can be traced to their inputs
+SUPERSEDED_STATE_VALUES = {
+    "Epileptic Seizure": {"H": 0.70},
+    "Locked-in":         {"tau": 0.75, "rho": 0.57},
+    "Vegetative (UWS)":  {"rho": 0.29},
+    "MCS":               {"rho": 0.41},
 }
 
 ALL_STATES = {**CANONICAL_STATES, **EXTENDED_STATES}
@@ -78,112 +113,113 @@ def compute_state_D(state_dict):
 # 1. Dense grid sampling
 # ---------------------------------------------------------------------------
 
-def generate_grid(resolution=21):
+def generate_grid(resolution=21, chunk_size=DEFAULT_CHUNK_SIZE):
     """
-    Generate a dense grid of states in [0,1]^5.
+    Dense grid of states in [0,1]^5, swept in chunks (src/grid_sweep.py).
     resolution=21 gives 0.00, 0.05, 0.10, ..., 1.00 per axis.
     Total points: 21^5 = 4,084,101
+
+    Coordinates are computed from flat indices one chunk at a time, so
+    memory stays constant at resolution 41 (115M points) or 51 (345M).
     """
-    axis = np.linspace(0.0, 1.0, resolution)
     print(f"  Grid resolution: {resolution} points per axis")
     print(f"  Total grid points: {resolution**5:,}")
-
-    # Use meshgrid for vectorized computation
-    phi, tau, rho, H, kappa = np.meshgrid(axis, axis, axis, axis, axis, indexing='ij')
-    phi_flat = phi.ravel()
-    tau_flat = tau.ravel()
-    rho_flat = rho.ravel()
-    H_flat = H.ravel()
-    kappa_flat = kappa.ravel()
-
-    D_flat = density(phi_flat, tau_flat, rho_flat, H_flat, kappa_flat)
-
-    return phi_flat, tau_flat, rho_flat, H_flat, kappa_flat, D_flat
+    return GridSweep(resolution, chunk_size)
 
 
 # ---------------------------------------------------------------------------
 # 2. Isocline extraction at specific D levels
 # ---------------------------------------------------------------------------
 
-def extract_isocline(phi, tau, rho, H, kappa, D_all, target_D, tolerance=0.005):
-    """Find all grid points within tolerance of target D."""
-    mask = np.abs(D_all - target_D) <= tolerance
-    n_hits = np.sum(mask)
+def isocline_points(grid, isocline):
+    """Coordinates of an Isocline's grid points, in the dict form used below."""
+    points = grid.coords(isocline.cells)
     return {
-        "phi": phi[mask],
-        "tau": tau[mask],
-        "rho": rho[mask],
-        "H": H[mask],
-        "kappa": kappa[mask],
-        "D": D_all[mask],
-        "count": int(n_hits),
-        "fraction": float(n_hits) / len(D_all),
+        "phi": points[:, 0],
+        "tau": points[:, 1],
+        "rho": points[:, 2],
+        "H": points[:, 3],
+        "kappa": points[:, 4],
+        "D": isocline.D,
+        "count": isocline.count,
+        "fraction": isocline.fraction,
     }
 
 
+def extract_isocline(grid, target_D, tolerance=0.005):
+    """Find all grid points within tolerance of target D (one sweep)."""
+    collector = run_sweep(grid, IsoclineCollector([target_D], tolerance))
+    return isocline_points(grid, collector.isoclines()[float(target_D)])
+
+
 # ---------------------------------------------------------------------------
 # 3. Phenomenological classification
 # ---------------------------------------------------------------------------
 
+# (parameter, label below 0.35, label in between, label above 0.65), in the
+# order the labels appear in a profile string
+PROFILE_AXES = (
+    ("H", "low-entropy", "mid-entropy", "high-entropy"),
+    ("kappa", "incoherent", "mid-coherence", "coherent"),
+    ("phi", "fragmented", "mid-integration", "integrated"),
+    ("tau", "shallow-temporal", "mid-temporal", "deep-temporal"),
+    ("rho", "unbound", "mid-binding", "bound"),
+)
+N_PROFILES = 3 ** len(PROFILE_AXES)
+
+
+def profile_codes(phi, tau, rho, H, kappa):
+    """
+    Profile codes for whole arrays of parameter vectors.
+
+    Each axis is classed 0 (< 0.35), 1 (in between) or 2 (> 0.65); the
+    code is those classes read as base-3 digits in PROFILE_AXES order,
+    so codes lie in [0, N_PROFILES). profile_label() turns a code back
+    into the string classify_profile() would give.
+    """
+    values = {"phi": phi, "tau": tau, "rho": rho, "H": H, "kappa": kappa}
+    codes = np.zeros(np.shape(phi), dtype=np.uint8)
+    for name, *_ in PROFILE_AXES:
+        x = np.asarray(values[name])
+        codes *= 3
+        codes += 1 + (x > 0.65).astype(np.uint8) - (x < 0.35).astype(np.uint8)
+    return codes
+
+
+def profile_label(code):
+    """Profile string of a profile code."""
+    code = int(code)
+    labels = []
+    for _, *names in reversed(PROFILE_AXES):
+        code, level = divmod(code, 3)
+        labels.append(names[level])
+    return "|".join(reversed(labels))
+
+
 def classify_profile(phi, tau, rho, H, kappa):
     """
     Classify a parameter vector into a phenomenological profile string.
-    Uses threshold of 0.5 as boundary between 'low' and 'high'.
+    Uses 0.35 and 0.65 as the boundaries between 'low', 'mid' and 'high'.
     """
-    labels = []
-    if H < 0.35:
-        labels.append("low-entropy")
-    elif H > 0.65:
-        labels.append("high-entropy")
-    else:
-        labels.append("mid-entropy")
-
-    if kappa < 0.35:
-        labels.append("incoherent")
-    elif kappa > 0.65:
-        labels.append("coherent")
-    else:
-        labels.append("mid-coherence")
-
-    if phi > 0.65:
-        labels.append("integrated")
-    elif phi < 0.35:
-        labels.append("fragmented")
-    else:
-        labels.append("mid-integration")
-
-    if tau > 0.65:
-        labels.append("deep-temporal")
-    elif tau < 0.35:
-        labels.append("shallow-temporal")
-    else:
-        labels.append("mid-temporal")
-
-    if rho > 0.65:
-        labels.append("bound")
-    elif rho < 0.35:
-        labels.append("unbound")
-    else:
-        labels.append("mid-binding")
-
-    return "|".join(labels)
+    return profile_label(profile_codes(phi, tau, rho, H, kappa))
 
 
 def profile_distribution(isocline):
-    """Classify all points on an isocline by phenomenological profile."""
-    profiles = defaultdict(int)
-    n = isocline["count"]
-    if n == 0:
-        return profiles
-
-    for i in range(n):
-        p = classify_profile(
-            isocline["phi"][i], isocline["tau"][i], isocline["rho"][i],
-            isocline["H"][i], isocline["kappa"][i]
-        )
-        profiles[p] += 1
+    """
+    Classify all points on an isocline by phenomenological profile.
 
-    return dict(profiles)
+    Codes are counted with np.bincount; only the profiles that occur are
+    formatted, in order of first appearance.
+    """
+    codes = profile_codes(isocline["phi"], isocline["tau"], isocline["rho"],
+                          isocline["H"], isocline["kappa"])
+    n = len(codes)
+    counts = np.bincount(codes, minlength=N_PROFILES)
+    first = np.full(N_PROFILES, n)
+    np.minimum.at(first, codes, np.arange(n))
+    present = np.flatnonzero(counts)
+    present = present[np.argsort(first[present], kind="stable")]
+    return {profile_label(code): int(counts[code]) for code in present}
 
 
 # ---------------------------------------------------------------------------
@@ -201,70 +237,40 @@ def euclidean_distance_5d(s1, s2):
     )
 
 
-def find_maximum_degeneracy(isocline, n_samples=5000):
+def find_maximum_degeneracy(isocline):
     """
     Find the pair of points on the isocline with maximum 5D distance.
     This represents the most phenomenologically distant pair sharing the same D.
+
+    Exact over every isocline point: farthest_pair prunes by projection
+    extremes and bounding boxes instead of sampling pairs.
     """
     n = isocline["count"]
     if n < 2:
         return None
 
-    # Sample if too many points
-    if n > n_samples:
-        idx = np.random.choice(n, n_samples, replace=False)
-    else:
-        idx = np.arange(n)
-
     points = np.column_stack([
-        isocline["phi"][idx],
-        isocline["tau"][idx],
-        isocline["rho"][idx],
-        isocline["H"][idx],
-        isocline["kappa"][idx],
+        isocline["phi"],
+        isocline["tau"],
+        isocline["rho"],
+        isocline["H"],
+        isocline["kappa"],
     ])
 
-    # Find maximum pairwise distance efficiently
-    max_dist = 0.0
-    best_pair = (None, None)
-
-    # Use random sampling of pairs for large sets
-    n_pts = len(points)
-    if n_pts > 500:
-        # Sample 50000 random pairs
-        n_pairs = min(50000, n_pts * (n_pts - 1) // 2)
-        for _ in range(n_pairs):
-            i, j = np.random.choice(n_pts, 2, replace=False)
-            d = np.linalg.norm(points[i] - points[j])
-            if d > max_dist:
-                max_dist = d
-                best_pair = (
-                    {k: float(v) for k, v in zip(
-                        ["phi", "tau", "rho", "H", "kappa"], points[i])},
-                    {k: float(v) for k, v in zip(
-                        ["phi", "tau", "rho", "H", "kappa"], points[j])}
-                )
-    else:
-        for i in range(n_pts):
-            for j in range(i + 1, n_pts):
-                d = np.linalg.norm(points[i] - points[j])
-                if d > max_dist:
-                    max_dist = d
-                    best_pair = (
-                        {k: float(v) for k, v in zip(
-                            ["phi", "tau", "rho", "H", "kappa"], points[i])},
-                        {k: float(v) for k, v in zip(
-                            ["phi", "tau", "rho", "H", "kappa"], points[j])}
-                    )
+    pair = farthest_pair(points)
+    point_a, point_b = (
+        {k: float(v) for k, v in zip(["phi", "tau", "rho", "H", "kappa"], points[i])}
+        for i in (pair.i, pair.j)
+    )
 
     return {
-        "distance_5d": float(max_dist),
+        "distance_5d": pair.distance,
         "max_possible": math.sqrt(5),  # diagonal of unit 5-cube
-        "degeneracy_ratio": float(max_dist) / math.sqrt(5),
-        "point_a": best_pair[0],
-        "point_b": best_pair[1],
-        "profile_a": classify_profile(**best_pair[0]) if best_pair[0] else None,
-        "profile_b": classify_profile(**best_pair[1]) if best_pair[1] else None,
+        "degeneracy_ratio": pair.distance / math.sqrt(5),
+        "point_a": point_a,
+        "point_b": point_b,
+        "profile_a": classify_profile(**point_a),
+        "profile_b": classify_profile(**point_b),
     }
 
 
@@ -318,27 +324,25 @@ def test_specific_pairs():
 # 6. Isocline volume and dimensionality analysis
 # ---------------------------------------------------------------------------
 
-def compute_isocline_volumes(D_all, n_bins=100):
+def compute_isocline_volumes(n_bins=50, distribution=None):
     """
     Compute the fraction of parameter space mapping to each D level.
     This gives the 'isocline volume' -- how degenerate each D level is.
-    """
-    # Filter out D=0 (trivial degeneracy when any multiplicative term is 0)
-    D_nonzero = D_all[D_all > 0.001]
-    D_max = np.max(D_all)
 
-    bins = np.linspace(0.0, D_max, n_bins + 1)
-    counts, edges = np.histogram(D_all, bins=bins)
-    total = len(D_all)
+    The fractions are exact masses of D under uniform priors (from
+    DensityDistribution, over [0, max D] in n_bins bins), not grid counts.
+    """
+    distribution = distribution or DensityDistribution()
+    edges = np.linspace(0.0, distribution.support[1], n_bins + 1)
+    masses = np.diff(distribution.cdf(edges))
 
     volumes = []
-    for i in range(len(counts)):
+    for i in range(n_bins):
         d_center = (edges[i] + edges[i + 1]) / 2.0
         volumes.append({
             "D_center": float(d_center),
             "D_range": (float(edges[i]), float(edges[i + 1])),
-            "count": int(counts[i]),
-            "fraction": float(counts[i]) / total,
+            "fraction": float(masses[i]),
         })
 
     return volumes
@@ -401,66 +405,40 @@ def compute_sensitivity_analysis():
 # 7. Information loss quantification
 # ---------------------------------------------------------------------------
 
-def compute_information_loss():
+def compute_information_loss(n_samples=500_000, n_workers=1, chunk_size=1 << 20):
     """
     Quantify information loss by measuring how much of the 5D variance
     is captured by D alone.
 
     Method: sample random states, compute D, then measure the variance
-    in each parameter conditional on D being in a narrow band.
+    in each parameter conditional on D being in a narrow band. Every
+    sample is assigned to its band once and streamed into per-band
+    moment accumulators, so n_samples is not limited by memory.
     """
-    np.random.seed(42)
-    n_samples = 500000
-    phi = np.random.uniform(0, 1, n_samples)
-    tau = np.random.uniform(0, 1, n_samples)
-    rho = np.random.uniform(0, 1, n_samples)
-    H = np.random.uniform(0, 1, n_samples)
-    kappa = np.random.uniform(0, 1, n_samples)
-    D = density(phi, tau, rho, H, kappa)
+    target_bands = [0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.40]
+    band_width = 0.005
+    cv = conditional_variance(target_bands, band_width, n_samples=n_samples, seed=42,
+                              n_workers=n_workers, chunk_size=chunk_size)
 
     # Overall variance of each parameter
-    overall_var = {
-        "phi": float(np.var(phi)),
-        "tau": float(np.var(tau)),
-        "rho": float(np.var(rho)),
-        "H": float(np.var(H)),
-        "kappa": float(np.var(kappa)),
-    }
+    overall_var = dict(zip(INVARIANTS, map(float, cv.overall_variance)))
 
     # Conditional variance: for points with D in a narrow band,
     # how much variance remains in each parameter?
-    target_bands = [0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.40]
-    band_width = 0.005
-
     conditional_results = {}
-    for target in target_bands:
-        mask = np.abs(D - target) <= band_width
-        n_in_band = np.sum(mask)
-        if n_in_band < 10:
+    for k, target in enumerate(target_bands):
+        if cv.counts[k] < 10:
             continue
-
-        cond_var = {
-            "phi": float(np.var(phi[mask])),
-            "tau": float(np.var(tau[mask])),
-            "rho": float(np.var(rho[mask])),
-            "H": float(np.var(H[mask])),
-            "kappa": float(np.var(kappa[mask])),
-        }
-
-        # Variance retained = conditional / overall
-        retained = {k: cond_var[k] / overall_var[k] if overall_var[k] > 0 else 0
-                    for k in cond_var}
-
+        band = cv.band(k)
+        mean_retention = float(np.mean(list(band["variance_retained_fraction"].values())))
         conditional_results[f"D={target:.2f}"] = {
-            "n_points": int(n_in_band),
-            "conditional_variance": cond_var,
-            "variance_retained_fraction": retained,
-            "mean_retention": float(np.mean(list(retained.values()))),
+            **band,
+            "mean_retention": mean_retention,
             "interpretation": (
                 "Knowing D barely constrains parameters"
-                if np.mean(list(retained.values())) > 0.7
+                if mean_retention > 0.7
                 else "D provides moderate constraint"
-                if np.mean(list(retained.values())) > 0.4
+                if mean_retention > 0.4
                 else "D significantly constrains parameters"
             ),
         }
@@ -646,6 +624,8 @@ def analyze_D_zero():
     kappa = np.random.uniform(0, 1, n)
     D = density(phi, tau, rho, H, kappa)
 
+    # Sampled fractions, next to the exact CDF under uniform priors
+    distribution = DensityDistribution()
     thresholds = [0.001, 0.005, 0.01, 0.02, 0.05, 0.10]
     near_zero = {}
     for t in thresholds:
@@ -653,8 +633,15 @@ def analyze_D_zero():
         near_zero[f"D<{t}"] = {
             "fraction": frac,
             "percentage": f"{frac*100:.2f}%",
+            "exact_fraction": float(distribution.cdf(t)),
         }
 
+    # Can D be ~0 with high integration? Exact over the phi >= 0.8 slice
+    high_phi = {
+        "threshold": 0.01,
+        "fraction_below": float(DensityDistribution({"phi": (0.8, 1.0)}).cdf(0.01)),
+    }
+
     # Median and percentiles
     return {
         "D_median": float(np.median(D)),
@@ -668,6 +655,36 @@ def analyze_D_zero():
             "95th": float(np.percentile(D, 95)),
         },
         "near_zero_fractions": near_zero,
+        "high_phi_near_zero": high_phi,
+    }
+
+
+# Consciousness threshold used by conduit_telemetry, project_chimera and
+# zombie_gradient_test
+CONSCIOUSNESS_THRESHOLD = 0.05
+
+
+def trace_threshold_surface(spacing=0.15):
+    """
+    Points on the D = CONSCIOUSNESS_THRESHOLD hypersurface.
+
+    The tracer refines adaptively along the surface, so the cost follows
+    the surface area at the given spacing instead of a resolution^5 grid.
+    """
+    return trace_isosurface(CONSCIOUSNESS_THRESHOLD, spacing=spacing)
+
+
+def summarize_threshold_surface(surface):
+    """Extent of the threshold surface and mean |normal| per invariant."""
+    points, normals = surface.points, np.abs(surface.normals)
+    return {
+        "level": surface.level,
+        "n_points": len(surface),
+        "complete": surface.complete,
+        "extent": {name: [float(points[:, j].min()), float(points[:, j].max())]
+                   for j, name in enumerate(INVARIANTS)},
+        "mean_abs_normal": {name: float(normals[:, j].mean())
+                            for j, name in enumerate(INVARIANTS)},
     }
 
 
@@ -675,7 +692,112 @@ def analyze_D_zero():
 # MAIN EXECUTION
 # ===========================================================================
 
-def main():
+# Isocline levels extracted from the grid (label, target D)
+TARGET_D_VALUES = [
+    ("REM/Ketamine", 0.077),
+    ("Wakefulness", 0.241),
+    ("Meditation", 0.327),
+    ("Psilocybin", 0.184),
+    ("DMT", 0.425),
+    ("Flow", 0.275),
+    ("Low (NREM)", 0.007),
+]
+ISOCLINE_TOLERANCE = 0.005
+
+
+def isocline_stage_name(target_D):
+    return f"isocline D={target_D:.3f}"
+
+
+def isocline_level_stage(resolution, shared_cells, start, stop, fraction):
+    """
+    Profile distribution and maximum degeneracy of one isocline.
+
+    The isocline's grid indices are rows [start, stop) of a SharedArray
+    holding every level's indices, so workers attach instead of copying.
+    """
+    cells = shared_cells.array[start:stop]
+    points = grid_coords(resolution, cells)
+    iso = {
+        "phi": points[:, 0],
+        "tau": points[:, 1],
+        "rho": points[:, 2],
+        "H": points[:, 3],
+        "kappa": points[:, 4],
+        "count": len(cells),
+        "fraction": fraction,
+    }
+    profiles = profile_distribution(iso)
+    max_degen = find_maximum_degeneracy(iso) if len(cells) > 1 else None
+    return profiles, max_degen
+
+
+# Bump a stage's version when its code changes, to invalidate its cached results
+STAGE_VERSIONS = {
+    "isocline_level": "1",
+    "absurd_degeneracies": "1",
+    "D_zero_analysis": "4",
+    "information_loss": "1",
+    "sensitivity_analysis": "1",
+    "H_kappa_tradeoff": "1",
+    "specific_pairs": "1",
+    "threshold_surface": "1",
+}
+
+
+def stage_key(stage, **params):
+    """Cache key of a stage result: its version, the formula, the states and params."""
+    return cache_key(stage=stage, version=STAGE_VERSIONS[stage], formula=FORMULA_VERSION,
+                     states=ALL_STATES, **params)
+
+
+def run_analysis_stages(grid, isoclines, n_workers=1, info_samples=500_000, use_cache=True,
+                        surface_spacing=0.15):
+    """
+    Run the per-isocline work and the independent analysis stages.
+
+    Stage results are cached (see STAGE_VERSIONS), so a rerun only
+    recomputes stages whose inputs or version changed.
+
+    Returns:
+        RunReport with results keyed by stage name and per-stage timings
+    """
+    levels = [isoclines[d] for _, d in TARGET_D_VALUES]
+    offsets = np.cumsum([0] + [iso.count for iso in levels])
+    all_cells = np.concatenate([iso.cells for iso in levels])
+
+    with SharedArray(all_cells) as shared_cells:
+        # Longest stages first so the pool stays busy
+        tasks = [
+            Task("absurd_degeneracies", find_absurd_degeneracies,
+                 key=stage_key("absurd_degeneracies")),
+            Task("D_zero_analysis", analyze_D_zero, key=stage_key("D_zero_analysis")),
+            Task("information_loss", compute_information_loss,
+                 kwargs={"n_samples": info_samples},
+                 key=stage_key("information_loss", n_samples=info_samples)),
+        ]
+        tasks += [
+            Task(isocline_stage_name(iso.target), isocline_level_stage,
+                 (grid.resolution, shared_cells, int(offsets[k]), int(offsets[k + 1]),
+                  iso.fraction),
+                 key=stage_key("isocline_level", resolution=grid.resolution,
+                               target=iso.target, tolerance=iso.tolerance))
+            for k, iso in enumerate(levels)
+        ]
+        tasks += [
+            Task("sensitivity_analysis", compute_sensitivity_analysis,
+                 key=stage_key("sensitivity_analysis")),
+            Task("H_kappa_tradeoff", analyze_H_kappa_tradeoff, key=stage_key("H_kappa_tradeoff")),
+            Task("specific_pairs", test_specific_pairs, key=stage_key("specific_pairs")),
+            Task("threshold_surface", trace_threshold_surface,
+                 kwargs={"spacing": surface_spacing},
+                 key=stage_key("threshold_surface", spacing=surface_spacing)),
+        ]
+        return run_tasks(tasks, n_workers, use_cache=use_cache)
+
+
+def main(resolution=21, chunk_size=DEFAULT_CHUNK_SIZE, n_workers=1, info_samples=500_000,
+         use_cache=True, surface_spacing=0.15, surface_out=None):
     print("=" * 70)
     print("ISOCLINE DEGENERACY ANALYSIS")
     print("Conduit Monism v9.2 -- Experiment 260222_IDA")
@@ -689,6 +811,11 @@ def main():
             "framework": "Conduit Monism v9.2",
             "formula": "D = phi * tau * rho * [(1 - sqrt(H)) + (H * kappa)]",
             "purpose": "Identify and analyze isocline degeneracies where phenomenologically distinct states share identical D values",
+            "state_sources": {
+                name: "hand-set" if name in ("Light Anesthesia", "Drowsiness")
+                else "calibration library" for name in EXTENDED_STATES
+            },
+            "superseded_state_values": SUPERSEDED_STATE_VALUES,
         }
     }
 
@@ -703,48 +830,54 @@ def main():
     print()
 
     # --- Step 1: Dense grid ---
-    print("[1] Generating dense grid (resolution=21 per axis)...")
-    phi, tau, rho, H, kappa, D_all = generate_grid(resolution=21)
-    print(f"    D range: [{np.min(D_all):.6f}, {np.max(D_all):.6f}]")
-    print(f"    D mean: {np.mean(D_all):.6f}")
-    print(f"    D median: {np.median(D_all):.6f}")
+    # One chunked pass feeds the D summary and the isocline bands (step 2);
+    # cached D and isoclines are reused
+    print(f"[1] Sweeping dense grid (resolution={resolution} per axis, "
+          f"{n_workers} worker{'s' if n_workers != 1 else ''})...")
+    sweep_start = time.perf_counter()
+    sweep = sweep_isoclines(resolution, [d for _, d in TARGET_D_VALUES], ISOCLINE_TOLERANCE,
+                            chunk_size=chunk_size, n_workers=n_workers, use_cache=use_cache)
+    sweep_time = time.perf_counter() - sweep_start
+    grid, summary, isoclines = sweep.grid, sweep.summary, sweep.isoclines
+    if sweep.reused:
+        print(f"    Reused from cache: {', '.join(sweep.reused)}")
+    print(f"    D range: [{summary.min:.6f}, {summary.max:.6f}]")
+    print(f"    D mean: {summary.mean:.6f}")
+    print(f"    D median: {summary.median:.6f}")
     print()
 
+    # Steps 2-10 are independent: run them (and each isocline level) as
+    # pool tasks, then report in the usual order
+    stages = run_analysis_stages(grid, isoclines, n_workers, info_samples, use_cache,
+                                 surface_spacing)
+
     # --- Step 2: Isocline extraction at canonical D levels ---
-    target_D_values = [
-        ("REM/Ketamine", 0.077),
-        ("Wakefulness", 0.241),
-        ("Meditation", 0.327),
-        ("Psilocybin", 0.184),
-        ("DMT", 0.425),
-        ("Flow", 0.275),
-        ("Low (NREM)", 0.007),
-    ]
-    print("[2] Extracting isoclines at canonical D levels (tolerance=0.005)...")
+    print(f"[2] Extracting isoclines at canonical D levels (tolerance={ISOCLINE_TOLERANCE})...")
+    distribution = DensityDistribution()
     isocline_results = {}
-    for label, d_target in target_D_values:
-        iso = extract_isocline(phi, tau, rho, H, kappa, D_all, d_target, tolerance=0.005)
-        profiles = profile_distribution(iso)
+    for label, d_target in TARGET_D_VALUES:
+        iso = isoclines[d_target]
+        exact_fraction = float(distribution.mass(d_target - ISOCLINE_TOLERANCE,
+                                                 d_target + ISOCLINE_TOLERANCE))
+        profiles, max_degen = stages.results[isocline_stage_name(d_target)]
         n_profiles = len(profiles)
 
-        print(f"    D={d_target:.3f} ({label}): {iso['count']:,} states, "
+        print(f"    D={d_target:.3f} ({label}): {iso.count:,} states, "
               f"{n_profiles} distinct profiles, "
-              f"volume fraction = {iso['fraction']:.6f}")
-
-        # Find max degeneracy on this isocline
-        max_degen = None
-        if iso["count"] > 1:
-            max_degen = find_maximum_degeneracy(iso)
-            if max_degen:
-                print(f"      Max 5D distance on isocline: {max_degen['distance_5d']:.4f} "
-                      f"({max_degen['degeneracy_ratio']*100:.1f}% of max)")
-                print(f"      Profile A: {max_degen['profile_a']}")
-                print(f"      Profile B: {max_degen['profile_b']}")
+              f"volume fraction = {iso.fraction:.6f} (exact {exact_fraction:.6f})")
+
+        # Max degeneracy on this isocline
+        if max_degen:
+            print(f"      Max 5D distance on isocline: {max_degen['distance_5d']:.4f} "
+                  f"({max_degen['degeneracy_ratio']*100:.1f}% of max)")
+            print(f"      Profile A: {max_degen['profile_a']}")
+            print(f"      Profile B: {max_degen['profile_b']}")
 
         isocline_results[f"D={d_target:.3f} ({label})"] = {
             "target_D": d_target,
-            "count": iso["count"],
-            "volume_fraction": iso["fraction"],
+            "count": iso.count,
+            "volume_fraction": iso.fraction,
+            "exact_volume_fraction": exact_fraction,
             "n_distinct_profiles": n_profiles,
             "top_profiles": dict(sorted(profiles.items(), key=lambda x: -x[1])[:10]),
             "max_degeneracy": max_degen,
@@ -754,7 +887,7 @@ def main():
 
     # --- Step 3: Specific pair tests ---
     print("[3] Testing specific phenomenological pairs...")
-    pair_results = test_specific_pairs()
+    pair_results = stages.results["specific_pairs"]
     for p in pair_results:
         severity = p["degeneracy_severity"]
         marker = "***" if severity in ("CRITICAL", "HIGH") else "   "
@@ -766,7 +899,7 @@ def main():
 
     # --- Step 4: Isocline volumes ---
     print("[4] Computing isocline volume distribution...")
-    volumes = compute_isocline_volumes(D_all, n_bins=50)
+    volumes = compute_isocline_volumes(n_bins=50, distribution=distribution)
     peak_vol = max(volumes, key=lambda x: x["fraction"])
     print(f"    Peak volume at D ~ {peak_vol['D_center']:.3f}: "
           f"{peak_vol['fraction']*100:.2f}% of space")
@@ -775,7 +908,7 @@ def main():
 
     # --- Step 5: Sensitivity analysis ---
     print("[5] Computing parameter sensitivity at each state...")
-    sensitivity = compute_sensitivity_analysis()
+    sensitivity = stages.results["sensitivity_analysis"]
     for name, s in sensitivity.items():
         print(f"    {name:25s}  most={s['most_sensitive']}, "
               f"least={s['least_sensitive']}, |grad|={s['gradient_magnitude']:.4f}")
@@ -783,8 +916,8 @@ def main():
     print()
 
     # --- Step 6: Information loss ---
-    print("[6] Quantifying information loss (500k Monte Carlo samples)...")
-    info_loss = compute_information_loss()
+    print(f"[6] Quantifying information loss ({info_samples:,} Monte Carlo samples)...")
+    info_loss = stages.results["information_loss"]
     for band, data in info_loss["conditional_analysis"].items():
         print(f"    {band}: mean retention = {data['mean_retention']:.3f} "
               f"-- {data['interpretation']}")
@@ -793,7 +926,7 @@ def main():
 
     # --- Step 7: H-kappa trade-off ---
     print("[7] Analyzing H-kappa trade-off surface...")
-    hk_tradeoff = analyze_H_kappa_tradeoff()
+    hk_tradeoff = stages.results["H_kappa_tradeoff"]
     for gate_label, curve in hk_tradeoff["iso_gate_curves"].items():
         print(f"    {gate_label}: H in [{curve['H_range'][0]:.2f}, {curve['H_range'][1]:.2f}], "
               f"kappa in [{curve['kappa_range'][0]:.2f}, {curve['kappa_range'][1]:.2f}]")
@@ -802,7 +935,7 @@ def main():
 
     # --- Step 8: Absurd degeneracies ---
     print("[8] Searching for maximally absurd degeneracies (2M samples)...")
-    absurd = find_absurd_degeneracies()
+    absurd = stages.results["absurd_degeneracies"]
     for a in absurd[:5]:
         print(f"    {a['canonical_state']:15s} (D={a['canonical_D']:.4f}): "
               f"dist={a['distance_5d']:.4f} ({a['degeneracy_ratio']*100:.1f}%)")
@@ -814,14 +947,49 @@ def main():
 
     # --- Step 9: D=0 analysis ---
     print("[9] Analyzing D ~ 0 concentration...")
-    d_zero = analyze_D_zero()
+    d_zero = stages.results["D_zero_analysis"]
     print(f"    D median: {d_zero['D_median']:.4f}")
     print(f"    D mean: {d_zero['D_mean']:.4f}")
     for threshold, data in d_zero["near_zero_fractions"].items():
-        print(f"    {threshold}: {data['percentage']} of parameter space")
+        print(f"    {threshold}: {data['percentage']} of parameter space "
+              f"(exact {data['exact_fraction']*100:.2f}%)")
+    fraction = d_zero["high_phi_near_zero"]["fraction_below"]
+    print(f"    D<0.01 with phi >= 0.8: {fraction*100:.2f}% of that slice")
     results["D_zero_analysis"] = d_zero
     print()
 
+    # --- Step 10: Threshold surface ---
+    print(f"[10] Tracing the D = {CONSCIOUSNESS_THRESHOLD} threshold surface "
+          f"(spacing={surface_spacing})...")
+    surface = stages.results["threshold_surface"]
+    surface_summary = summarize_threshold_surface(surface)
+    print(f"    {len(surface):,} points{'' if surface.complete else ' (point budget reached)'}")
+    for name in INVARIANTS:
+        low, high = surface_summary["extent"][name]
+        print(f"    {name:6s} in [{low:.3f}, {high:.3f}], "
+              f"mean |normal| {surface_summary['mean_abs_normal'][name]:.3f}")
+    if surface_out:
+        surface_summary["point_cloud"] = str(surface.save(surface_out))
+        print(f"    Point cloud saved to: {surface_out}")
+    results["threshold_surface"] = surface_summary
+    print()
+
+    # --- Stage timings ---
+    print("[11] Stage timings (seconds inside each worker)...")
+    timings = {"grid_sweep": sweep_time, **stages.timings}
+    for stage, seconds in sorted(timings.items(), key=lambda kv: -kv[1]):
+        print(f"    {stage:28s} {seconds:8.3f}s")
+    print(f"    {'stages wall time':28s} {stages.wall_time:8.3f}s")
+    if stages.reused:
+        print(f"    Reused from cache: {', '.join(stages.reused)}")
+    results["stage_timings"] = {
+        "n_workers": n_workers,
+        "stages": timings,
+        "stages_wall_time": stages.wall_time,
+        "cached": list(sweep.reused) + list(stages.reused),
+    }
+    print()
+
     # --- Save results ---
     output_dir = os.path.join(os.path.dirname(__file__), "..", "research_output")
     os.makedirs(output_dir, exist_ok=True)
@@ -858,4 +1026,25 @@ def main():
 
 
 if __name__ == "__main__":
-    results = main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Isocline degeneracy analysis")
+    parser.add_argument("--resolution", type=int, default=21,
+                        help="Grid points per axis (memory does not grow with it)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Grid points per chunk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for the grid sweep and analysis stages")
+    parser.add_argument("--info-samples", type=int, default=500_000,
+                        help="Uniform samples for the information-loss estimate (streamed)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Recompute everything instead of reusing cached grid and stage results")
+    parser.add_argument("--surface-spacing", type=float, default=0.15,
+                        help="Target point spacing on the D = 0.05 threshold surface")
+    parser.add_argument("--surface-out", default=None,
+                        help="Export the threshold surface point cloud (.csv or .npz)")
+    args = parser.parse_args()
+    results = main(resolution=args.resolution, chunk_size=args.chunk_size,
+                   n_workers=args.workers, info_samples=args.info_samples,
+                   use_cache=not args.no_cache, surface_spacing=args.surface_spacing,
+                   surface_out=args.surface_out)
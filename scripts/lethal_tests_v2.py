@@ -26,14 +26,21 @@ import argparse
 import requests
 import time
 import zlib
-import struct
 import numpy as np
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+# Add project root for src imports
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.density_distribution import DensityDistribution
+from src.threshold_regions import threshold_regions
+
 # Output directory
-OUTPUT_DIR = Path(__file__).parent.parent / "research_output"
+OUTPUT_DIR = PROJECT_ROOT / "research_output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
 # ==============================================================================
@@ -146,9 +153,14 @@ def lempel_ziv_complexity(data: bytes) -> float:
     return len(compressed) / len(data)
 
 
-def float_array_to_bytes(arr: List[float]) -> bytes:
-    """Convert a list of floats to bytes for LZc calculation."""
-    return b''.join(struct.pack('f', x) for x in arr)
+def float_array_to_bytes(arr: List[float]) -> memoryview:
+    """
+    Byte view of a float array for LZc calculation.
+
+    Same native float32 bytes as packing each value with struct; a
+    contiguous float32 ndarray is viewed without copying.
+    """
+    return memoryview(np.ascontiguousarray(arr, dtype=np.float32)).cast('B')
 
 
 def test_recall(client: RWKVCloudClient, secret: str, context: str = "") -> dict:
@@ -969,6 +981,22 @@ def test_threshold_discovery() -> Dict:
     print(f"  Liminal (0.1 <= D <= 0.3): {liminal_count:5} ({100*liminal_count/total:.1f}%)")
     print(f"  Conscious (D > 0.3):      {conscious_count:5} ({100*conscious_count/total:.1f}%)")
 
+    # Exact volumes of the swept box under uniform priors, and where D > 0.3
+    # is possible from branch-and-bound (the gate never leaves [0, 1], so
+    # the v8.1 clamp does not change D here)
+    sweep_box = [(0.1, 0.9)] * 5
+    sweep_distribution = DensityDistribution(sweep_box)
+    volumes = {
+        'unconscious': float(sweep_distribution.cdf(0.1)),
+        'conscious': float(1.0 - sweep_distribution.cdf(0.3)),
+    }
+    conscious_extent = threshold_regions(0.3, sweep_box).extent("above")
+    print(f"\n  Exact volume of [0.1, 0.9]^5:")
+    for label, volume in volumes.items():
+        print(f"    {label:12s} {100*volume:5.1f}%")
+    print(f"  D > 0.3 is impossible below: phi {conscious_extent[0, 0]:.3f}, "
+          f"tau {conscious_extent[1, 0]:.3f}, rho {conscious_extent[2, 0]:.3f}")
+
     # =========================================================================
     # Critical threshold analysis
     # =========================================================================
@@ -1087,6 +1115,7 @@ Thresholds need recalibration."""
             'liminal': liminal_count,
             'conscious': conscious_count
         },
+        'exact_volume_fractions': volumes,
         'thresholds': {
             'unconscious': 0.1,
             'conscious': 0.3,
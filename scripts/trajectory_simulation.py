@@ -15,6 +15,9 @@ Key insight from multi-AI review:
 - τ may extend during peak (temporal depth increases)
 """
 
+import sys
+from pathlib import Path
+
 import numpy as np
 import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend for headless execution
@@ -22,6 +25,14 @@ import matplotlib.pyplot as plt
 from dataclasses import dataclass
 from typing import List, Tuple
 
+# Add project root for src imports
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.calibration_registry import canon_states
+
+
 @dataclass
 class State:
     """Consciousness state at a moment in time."""
@@ -79,9 +90,7 @@ def simulate_psilocybin_trajectory(
     states = []
 
     # Baseline values (waking consciousness from CANON)
-    baseline = {
-        'phi': 0.80, 'tau': 0.75, 'rho': 0.65, 'H': 0.50, 'kappa': 0.65
-    }
+    baseline = dict(canon_states()["Wakefulness"])
 
     # Target values at peak (from CANON psilocybin calibration)
     peak_targets = {
@@ -10,12 +10,21 @@ Tests the core claims of Conduit Monism:
 - Zero-elimination property
 - Coherence gate behavior
 - Sensitivity analysis
+- Response cubes (D along every axis, for both models, in one pass)
 """
 
+import itertools
 import math
+import os
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from .encoder import StateVector, compute_density_v92
+from .cache import cache_key, cache_path
+from .density_models import FORMULA_VERSION, density_v92_vectorized
+
+
+RESPONSE_VARIABLES = ('phi', 'tau', 'rho', 'H', 'kappa')
+RESPONSE_MODELS = ('multiplicative', 'additive')
 
 
 def perspectival_density(phi: float, tau: float, rho: float,
@@ -52,23 +61,18 @@ def analyze_asymptotic_behavior(
     Tests whether the multiplicative relationship creates the predicted
     asymptotic curve toward zero.
     """
-    phi_range = np.linspace(0.01, 1.0, resolution)
     tau_fixed = 0.9
     rho_fixed = 0.9
-
-    multiplicative = []
-    additive = []
-
-    for phi in phi_range:
-        mult = perspectival_density(phi, tau_fixed, rho_fixed, H, kappa)
-        add = perspectival_density_additive(phi, tau_fixed, rho_fixed, H, kappa)
-        multiplicative.append(mult)
-        additive.append(add)
+    cube = response_cube(
+        variables=('phi',), H_values=(H,), kappa_values=(kappa,),
+        resolution=resolution, low=0.01, high=1.0,
+        base={'tau': tau_fixed, 'rho': rho_fixed}, use_cache=False,
+    )
 
     return {
-        'phi_range': phi_range,
-        'multiplicative': np.array(multiplicative),
-        'additive': np.array(additive),
+        'phi_range': cube['range'],
+        'multiplicative': cube['densities'][0, 0, 0, 0],
+        'additive': cube['densities'][1, 0, 0, 0],
         'tau_fixed': tau_fixed,
         'rho_fixed': rho_fixed,
         'H': H,
@@ -205,48 +209,206 @@ def sensitivity_analysis(
     return sensitivities
 
 
-def find_fixed_points(resolution: int = 20) -> List[Dict]:
+def find_fixed_points(
+    resolution: int = 20,
+    H_values: Sequence[float] = (0.3, 0.5, 0.7),
+    tau_values: Sequence[float] = (0.5,),
+    kappa_values: Sequence[float] = (0.5,),
+    d_tolerance: float = 0.001,
+    min_topology_diff: float = 0.5,
+    top_k: int = 20,
+    rank_by_topology: bool = False,
+) -> List[Dict]:
     """
     Search for degenerate regions where different states produce
     identical density values (potential formula weakness).
 
     Returns pairs of states that have similar D but different topology.
+
+    States are sorted by D once, so each state is only compared with the
+    states inside its D tolerance window (found by binary search), with
+    vectorized topology-distance checks. Two selection modes:
+    - grid order (default): the first top_k pairs in grid enumeration
+      order. The sweep stops as soon as they are known.
+    - rank_by_topology: the top_k most topologically distant pairs.
+      Each state's farthest partner in its window is found in
+      O(N log N) total. States are expanded in decreasing order of that
+      distance until none can beat the current k-th best.
+
+    Parameters:
+        resolution: Grid points along φ and ρ (spanning 0.1 - 0.9)
+        H_values: Entropy levels to include
+        tau_values: Temporal depth levels to include
+        kappa_values: Coherence levels to include
+        d_tolerance: Pairs must satisfy |ΔD| < d_tolerance
+        min_topology_diff: Pairs must satisfy L1 topology distance > this
+        top_k: Maximum number of pairs returned
+        rank_by_topology: Return the most distant pairs instead of the
+                          first pairs in grid order
+
+    Returns:
+        List of dicts with state1, state2, density_diff and topology_diff
     """
-    degeneracies = []
-    states = []
-
-    # Generate a grid of states
-    for phi in np.linspace(0.1, 0.9, resolution):
-        for rho in np.linspace(0.1, 0.9, resolution):
-            for H in [0.3, 0.5, 0.7]:
-                kappa = 0.5
-                tau = 0.5
-                d = perspectival_density(phi, tau, rho, H, kappa)
-                states.append({
-                    'phi': phi, 'tau': tau, 'rho': rho,
-                    'H': H, 'kappa': kappa, 'D': d
-                })
-
-    # Find pairs with similar D but different topology
-    for i in range(len(states)):
-        for j in range(i + 1, len(states)):
-            s1, s2 = states[i], states[j]
-            d_diff = abs(s1['D'] - s2['D'])
-            topo_diff = (
-                abs(s1['phi'] - s2['phi']) +
-                abs(s1['rho'] - s2['rho']) +
-                abs(s1['H'] - s2['H'])
-            )
-
-            if d_diff < 0.001 and topo_diff > 0.5:
-                degeneracies.append({
-                    'state1': s1,
-                    'state2': s2,
-                    'density_diff': d_diff,
-                    'topology_diff': topo_diff
-                })
-
-    return degeneracies[:20]  # Return top 20
+    grid = np.meshgrid(
+        np.linspace(0.1, 0.9, resolution),
+        np.linspace(0.1, 0.9, resolution),
+        np.asarray(H_values, dtype=float),
+        np.asarray(tau_values, dtype=float),
+        np.asarray(kappa_values, dtype=float),
+        indexing='ij',
+    )
+    phi, rho, H, tau, kappa = (g.ravel() for g in grid)
+    points = np.column_stack([phi, tau, rho, H, kappa])
+    D = density_v92_vectorized(phi, tau, rho, H, kappa)
+    n = len(D)
+
+    order = np.argsort(D, kind='stable')
+    D_sorted = D[order]
+    points_sorted = points[order]
+    # Partners of sorted position i lie before window_hi[i]
+    window_hi = np.searchsorted(D_sorted, D_sorted + d_tolerance, side='left')
+
+    first = np.empty(0, dtype=np.int64)
+    second = np.empty(0, dtype=np.int64)
+    topology = np.empty(0)
+
+    def collect(positions: np.ndarray, lo: np.ndarray, hi: np.ndarray,
+                grid_order: bool):
+        nonlocal first, second, topology
+        for a, b in _window_pairs(positions, lo, hi):
+            d_diff = np.abs(D_sorted[b] - D_sorted[a])
+            topo = np.abs(points_sorted[b] - points_sorted[a]).sum(axis=1)
+            i, j = order[a], order[b]
+            hit = (d_diff < d_tolerance) & (topo > min_topology_diff)
+            if grid_order:
+                hit &= j > i
+            if not hit.any():
+                continue
+            first = np.concatenate([first, np.minimum(i[hit], j[hit])])
+            second = np.concatenate([second, np.maximum(i[hit], j[hit])])
+            topology = np.concatenate([topology, topo[hit]])
+            if len(topology) > top_k:
+                keep = _select_pairs(first, second, topology, n, top_k, rank_by_topology)
+                first, second, topology = first[keep], second[keep], topology[keep]
+
+    if not rank_by_topology:
+        # Walk states in grid order; later blocks can only add larger keys.
+        window_lo = np.searchsorted(D_sorted, D_sorted - d_tolerance, side='right')
+        position_of = np.empty(n, dtype=np.int64)
+        position_of[order] = np.arange(n)
+        start, block = 0, 64
+        while start < n and len(topology) < top_k:
+            positions = position_of[start:start + block]
+            collect(positions, window_lo[positions], window_hi[positions], True)
+            start += block
+            block = min(2 * block, 4096)
+    else:
+        # Pairs (i, j) with i < j in sorted order. The farthest partner of
+        # each i bounds every pair it can form, so states are visited by
+        # decreasing bound until none can beat the current k-th best.
+        lo = np.arange(1, n + 1)
+        farthest = _window_max_l1(points_sorted, lo, window_hi)
+        visit = np.argsort(-farthest, kind='stable')
+        visit = visit[farthest[visit] > min_topology_diff]
+        block = max(top_k, 64)
+        for start in range(0, len(visit), block):
+            if len(topology) >= top_k and farthest[visit[start]] < topology.min():
+                break
+            positions = visit[start:start + block]
+            collect(positions, lo[positions], window_hi[positions], False)
+
+    keep = _select_pairs(first, second, topology, n, top_k, rank_by_topology)
+
+    def as_dict(k: int) -> Dict[str, float]:
+        return {
+            'phi': float(phi[k]), 'tau': float(tau[k]), 'rho': float(rho[k]),
+            'H': float(H[k]), 'kappa': float(kappa[k]), 'D': float(D[k])
+        }
+
+    return [
+        {
+            'state1': as_dict(i),
+            'state2': as_dict(j),
+            'density_diff': float(abs(D[i] - D[j])),
+            'topology_diff': float(t)
+        }
+        for i, j, t in zip(first[keep], second[keep], topology[keep])
+    ]
+
+
+def _window_pairs(positions: np.ndarray, lo: np.ndarray, hi: np.ndarray,
+                  max_pairs: int = 2_000_000):
+    """
+    Yield (a, b) index arrays for every b in [lo[k], hi[k]) with a = positions[k],
+    in chunks of at most ~max_pairs pairs (b == a is skipped).
+    """
+    counts = np.maximum(hi - lo, 0)
+    cum = np.cumsum(counts)
+    start = 0
+    while start < len(positions):
+        base = cum[start - 1] if start else 0
+        stop = max(start + 1, int(np.searchsorted(cum, base + max_pairs, side='right')))
+        c = counts[start:stop]
+        total = int(c.sum())
+        if total:
+            a = np.repeat(positions[start:stop], c)
+            offsets = np.arange(total) - np.repeat(np.cumsum(c) - c, c)
+            b = np.repeat(lo[start:stop], c) + offsets
+            distinct = a != b
+            yield a[distinct], b[distinct]
+        start = stop
+
+
+def _window_max_l1(points: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """
+    Largest L1 distance from points[i] to any of points[lo[i]:hi[i]].
+
+    Uses |x - y|_1 = max over sign vectors s of s·(x - y): for each of the
+    16 sign vectors (up to negation) the farthest partner is the window
+    minimum or maximum of the projection, answered for every window at
+    once with a sparse table. Empty windows give -inf.
+    """
+    n = len(points)
+    length = hi - lo
+    valid = np.flatnonzero(length > 0)
+    level = np.zeros(n, dtype=np.int64)
+    level[valid] = np.floor(np.log2(length[valid])).astype(np.int64)
+    by_level = [valid[level[valid] == k] for k in range(int(level.max()) + 1)]
+
+    best = np.full(n, -np.inf)
+    for signs in itertools.product((1.0, -1.0), repeat=points.shape[1] - 1):
+        proj = points @ np.array((1.0,) + signs)
+        table_min, table_max = proj, proj
+        for k, queries in enumerate(by_level):
+            if k:
+                half = 1 << (k - 1)
+                table_min = np.minimum(table_min[:-half], table_min[half:])
+                table_max = np.maximum(table_max[:-half], table_max[half:])
+            if queries.size == 0:
+                continue
+            right = hi[queries] - (1 << k)
+            p = proj[queries]
+            w_min = np.minimum(table_min[lo[queries]], table_min[right])
+            w_max = np.maximum(table_max[lo[queries]], table_max[right])
+            best[queries] = np.maximum(best[queries], np.maximum(p - w_min, w_max - p))
+    return best
+
+
+def _select_pairs(first: np.ndarray, second: np.ndarray, topo: np.ndarray,
+                  n: int, k: int, rank_by_topology: bool) -> np.ndarray:
+    """Indices of the k best candidate pairs, in output order."""
+    grid_order = first * n + second
+    if rank_by_topology:
+        # Largest topology distance first; ties resolved by grid order
+        candidates = np.arange(len(topo))
+        if len(topo) > k:
+            kth = np.partition(topo, len(topo) - k)[len(topo) - k]
+            candidates = np.flatnonzero(topo >= kth)
+        return candidates[np.lexsort((grid_order[candidates], -topo[candidates]))][:k]
+    if len(grid_order) > k:
+        part = np.argpartition(grid_order, k - 1)[:k]
+        return part[np.argsort(grid_order[part])]
+    return np.argsort(grid_order)
 
 
 def gradient_comparison(variable: str = 'phi',
@@ -260,28 +422,129 @@ def gradient_comparison(variable: str = 'phi',
         H: Fixed entropy (when not varying H)
         kappa: Fixed coherence (when not varying kappa)
     """
-    resolution = 100
-    var_range = np.linspace(0.0, 1.0, resolution)
-    densities = []
-
-    for val in var_range:
-        if variable == 'phi':
-            d = perspectival_density(val, 0.9, 0.9, H, kappa)
-        elif variable == 'tau':
-            d = perspectival_density(0.9, val, 0.9, H, kappa)
-        elif variable == 'rho':
-            d = perspectival_density(0.9, 0.9, val, H, kappa)
-        elif variable == 'H':
-            d = perspectival_density(0.9, 0.9, 0.9, val, kappa)
-        elif variable == 'kappa':
-            d = perspectival_density(0.9, 0.9, 0.9, H, val)
-        else:
-            raise ValueError(f"Unknown variable: {variable}")
+    if variable not in RESPONSE_VARIABLES:
+        raise ValueError(f"Unknown variable: {variable}")
 
-        densities.append(d)
+    # One cube covers every variable, so sweeping all of them costs one evaluation
+    cube = response_cube(H_values=(H,), kappa_values=(kappa,), resolution=100,
+                         models=('multiplicative',), use_cache=False)
+    v = cube['variables'].index(variable)
 
     return {
         'variable': variable,
+        'range': cube['range'],
+        'densities': cube['densities'][0, v, 0, 0]
+    }
+
+
+def response_cube(
+    variables: Sequence[str] = RESPONSE_VARIABLES,
+    H_values: Sequence[float] = (0.50,),
+    kappa_values: Sequence[float] = (0.50,),
+    resolution: int = 100,
+    low: float = 0.0,
+    high: float = 1.0,
+    base: Optional[Dict[str, float]] = None,
+    models: Sequence[str] = RESPONSE_MODELS,
+    use_cache: bool = True,
+    cache_root=None,
+) -> Dict[str, object]:
+    """
+    Density response along each variable, for every (H, κ) setting and
+    model, in one broadcast evaluation.
+
+    For each swept variable, that variable runs over linspace(low, high,
+    resolution) while φ, τ, ρ stay at `base` (default 0.9 each) and H, κ
+    take each fixed setting. Sweeping H or κ itself overrides the fixed
+    setting along that axis.
+
+    Results are memoized on disk (see cache.py), keyed by every parameter
+    and the formula version. A single slice is cheap to recompute; pass
+    use_cache=False for those.
+
+    Parameters:
+        variables: Variables to sweep
+        H_values: Fixed entropy settings
+        kappa_values: Fixed coherence settings
+        resolution: Points along each sweep
+        low: Sweep start
+        high: Sweep end
+        base: Fixed φ, τ, ρ values (missing keys default to 0.9)
+        models: 'multiplicative' (v9.2) and/or 'additive' (null hypothesis)
+        use_cache: Read/write the on-disk memo
+        cache_root: Override the cache directory
+
+    Returns:
+        Dict with 'variables', 'models', 'H_values', 'kappa_values',
+        'range' and 'densities' of shape
+        (models, variables, len(H_values), len(kappa_values), resolution)
+
+    Raises:
+        ValueError for unknown variables or models, or values outside [0, 1]
+    """
+    variables = tuple(variables)
+    models = tuple(models)
+    unknown = set(variables) - set(RESPONSE_VARIABLES)
+    if unknown:
+        raise ValueError(f"Unknown variable: {sorted(unknown)[0]}")
+    unknown = set(models) - set(RESPONSE_MODELS)
+    if unknown:
+        raise ValueError(f"Unknown model: {sorted(unknown)[0]}")
+    fixed = {'phi': 0.9, 'tau': 0.9, 'rho': 0.9}
+    fixed.update(base or {})
+    H_values = tuple(float(h) for h in H_values)
+    kappa_values = tuple(float(k) for k in kappa_values)
+    checked = [('H', H_values), ('kappa', kappa_values), ('low', (low,)), ('high', (high,))]
+    checked += [(name, (fixed[name],)) for name in ('phi', 'tau', 'rho')]
+    for name, values in checked:
+        if any(not 0.0 <= v <= 1.0 for v in values):
+            raise ValueError(f"{name} must be in [0, 1], got {values}")
+
+    params = dict(variables=variables, H_values=H_values, kappa_values=kappa_values,
+                  resolution=resolution, low=low, high=high,
+                  base={k: fixed[k] for k in ('phi', 'tau', 'rho')},
+                  models=models, formula=FORMULA_VERSION)
+    path = cache_path("response_cube", cache_key(**params), ".npz", root=cache_root)
+    var_range = np.linspace(low, high, resolution)
+    if use_cache and path.exists():
+        with np.load(path) as cached:
+            densities = cached['densities']
+    else:
+        # Axes: (variable, H setting, κ setting, sweep point)
+        sweep = var_range[None, None, None, :]
+        values = {
+            'phi': np.full((1, 1, 1, 1), fixed['phi']),
+            'tau': np.full((1, 1, 1, 1), fixed['tau']),
+            'rho': np.full((1, 1, 1, 1), fixed['rho']),
+            'H': np.asarray(H_values)[None, :, None, None],
+            'kappa': np.asarray(kappa_values)[None, None, :, None],
+        }
+        args = {}
+        for name, value in values.items():
+            swept = np.array([v == name for v in variables])[:, None, None, None]
+            args[name] = np.where(swept, sweep, value)
+        phi, tau, rho, H, kappa = (args[n] for n in RESPONSE_VARIABLES)
+
+        out = []
+        for model in models:
+            if model == 'multiplicative':
+                d = density_v92_vectorized(phi, tau, rho, H, kappa)
+            else:
+                # Additive structure through the same entropy gate
+                d = density_v92_vectorized((phi + tau + rho) / 3, 1.0, 1.0, H, kappa)
+            out.append(np.broadcast_to(d, (len(variables), len(H_values),
+                                           len(kappa_values), resolution)))
+        densities = np.stack(out)
+        if use_cache:
+            tmp = path.with_suffix(".partial.npz")
+            np.savez(tmp, densities=densities)
+            os.replace(tmp, path)
+
+    return {
+        'variables': variables,
+        'models': models,
+        'H_values': H_values,
+        'kappa_values': kappa_values,
         'range': var_range,
-        'densities': np.array(densities)
+        'densities': densities,
     }
@@ -0,0 +1,223 @@
+"""
+Batch Operators Module - Conduit Engine v0.3
+
+Array versions of the operators in operators.py and advanced_operators.py.
+
+Each kernel applies the same update rule as its scalar counterpart to a
+whole batch of states at once. States are (N, 5) float arrays with columns
+ordered as INVARIANTS = (φ, τ, ρ, H, κ); magnitudes broadcast per row.
+No StateVector objects or description strings are built, so ensembles,
+reachability maps and planners can advance millions of states per call.
+
+The scalar operators remain the reference definitions; BATCH_OPERATORS
+maps each one to its kernel and the magnitude range it is defined on.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from .encoder import StateVector
+from .density_models import density_v92_vectorized
+from . import operators as basic
+from . import advanced_operators as advanced
+
+
+INVARIANTS = ("phi", "tau", "rho", "H", "kappa")
+PHI, TAU, RHO, H, KAPPA = range(5)
+
+
+def states_to_array(*states: StateVector) -> np.ndarray:
+    """Stack StateVectors into an (N, 5) array."""
+    return np.array([s.to_vector() for s in states], dtype=float).reshape(-1, 5)
+
+
+def array_to_state(row: np.ndarray, name: str = None) -> StateVector:
+    """Convert one (5,) row back into a StateVector."""
+    phi, tau, rho, H_, kappa = (float(v) for v in row)
+    return StateVector(phi=phi, tau=tau, rho=rho, H=H_, kappa=kappa, name=name)
+
+
+def density_batch(states: np.ndarray) -> np.ndarray:
+    """Compute v9.2 density for every row of an (N, 5) state array."""
+    return density_v92_vectorized(
+        states[..., PHI], states[..., TAU], states[..., RHO],
+        states[..., H], states[..., KAPPA]
+    )
+
+
+# =============================================================================
+# Basic operator kernels (operators.py)
+# =============================================================================
+
+def _shift(states: np.ndarray, column: int, delta: np.ndarray) -> np.ndarray:
+    out = np.array(states, dtype=float, copy=True)
+    out[:, column] = np.clip(out[:, column] + delta, 0.0, 1.0)
+    return out
+
+
+def batch_perturb_binding(states: np.ndarray, magnitude) -> np.ndarray:
+    """Batch op_perturb_binding: ρ += magnitude, clamped to [0, 1]."""
+    return _shift(states, RHO, magnitude)
+
+
+def batch_fracture_integration(states: np.ndarray, magnitude) -> np.ndarray:
+    """Batch op_fracture_integration: φ -= magnitude, clamped to [0, 1]."""
+    return _shift(states, PHI, -np.asarray(magnitude, dtype=float))
+
+
+def batch_stretch_temporal_depth(states: np.ndarray, magnitude) -> np.ndarray:
+    """Batch op_stretch_temporal_depth: τ += magnitude, clamped to [0, 1]."""
+    return _shift(states, TAU, magnitude)
+
+
+def batch_inject_entropy(states: np.ndarray, magnitude) -> np.ndarray:
+    """Batch op_inject_entropy: H += magnitude, clamped to [0, 1]."""
+    return _shift(states, H, magnitude)
+
+
+def batch_modulate_coherence(states: np.ndarray, magnitude) -> np.ndarray:
+    """Batch op_modulate_coherence: κ += magnitude, clamped to [0, 1]."""
+    return _shift(states, KAPPA, magnitude)
+
+
+# =============================================================================
+# Advanced operator kernels (advanced_operators.py)
+# =============================================================================
+
+def batch_dementia_progression(states: np.ndarray, stage) -> np.ndarray:
+    """Batch op_dementia_progression (stage in [0, 1])."""
+    s = np.asarray(stage, dtype=float)
+    out = np.empty_like(states, dtype=float)
+    out[:, TAU] = np.maximum(0.0, states[:, TAU] * (1.0 - s * 0.9))
+    out[:, PHI] = np.maximum(0.0, states[:, PHI] * (1.0 - s * 0.5))
+    out[:, RHO] = np.maximum(0.0, states[:, RHO] * (1.0 - s * 0.3))
+    out[:, H] = np.minimum(1.0, states[:, H] + s * 0.4)
+    out[:, KAPPA] = np.maximum(0.0, states[:, KAPPA] * (1.0 - s * 0.4))
+    return out
+
+
+def batch_split_brain(states: np.ndarray, magnitude=None) -> np.ndarray:
+    """Batch op_split_brain, returning one hemisphere (both are identical)."""
+    out = np.array(states, dtype=float, copy=True)
+    out[:, PHI] = states[:, PHI] * 0.6
+    return out
+
+
+def batch_anesthesia_gradient(states: np.ndarray, depth) -> np.ndarray:
+    """Batch op_anesthesia_gradient (depth in [0, 1])."""
+    d = np.asarray(depth, dtype=float)
+    out = np.empty_like(states, dtype=float)
+    out[:, RHO] = np.maximum(0.0, states[:, RHO] * (1.0 - d))
+    out[:, TAU] = np.maximum(0.0, states[:, TAU] * (1.0 - d * 0.8))
+    out[:, PHI] = np.maximum(0.0, states[:, PHI] * (1.0 - d * 0.7))
+    out[:, H] = np.maximum(0.0, states[:, H] * (1.0 - d * 0.9))
+    out[:, KAPPA] = np.maximum(0.0, states[:, KAPPA] * (1.0 - d * 0.6))
+    return out
+
+
+def batch_locked_in_syndrome(states: np.ndarray, magnitude=None) -> np.ndarray:
+    """Batch op_locked_in_syndrome (topology unchanged)."""
+    return np.array(states, dtype=float, copy=True)
+
+
+def batch_flow_state_induction(states: np.ndarray, intensity) -> np.ndarray:
+    """Batch op_flow_state_induction (intensity in [0, 1])."""
+    i = np.asarray(intensity, dtype=float)
+    out = np.empty_like(states, dtype=float)
+    out[:, PHI] = np.minimum(1.0, states[:, PHI] + i * 0.3)
+    out[:, TAU] = np.minimum(1.0, states[:, TAU] + i * 0.2)
+    out[:, RHO] = np.minimum(1.0, states[:, RHO] + i * 0.25)
+    out[:, H] = np.maximum(0.0, states[:, H] - i * 0.4)
+    out[:, KAPPA] = np.minimum(1.0, states[:, KAPPA] + i * 0.3)
+    return out
+
+
+def batch_panic_induction(states: np.ndarray, severity) -> np.ndarray:
+    """Batch op_panic_induction (severity in [0, 1])."""
+    s = np.asarray(severity, dtype=float)
+    out = np.empty_like(states, dtype=float)
+    out[:, PHI] = np.minimum(1.0, states[:, PHI] + s * 0.1)
+    out[:, TAU] = np.maximum(0.0, states[:, TAU] - s * 0.3)
+    out[:, RHO] = np.minimum(1.0, states[:, RHO] + s * 0.15)
+    out[:, H] = np.minimum(1.0, states[:, H] + s * 0.5)
+    out[:, KAPPA] = np.maximum(0.0, states[:, KAPPA] - s * 0.4)
+    return out
+
+
+def batch_psychedelic_onset(states: np.ndarray, intensity) -> np.ndarray:
+    """Batch op_psychedelic_onset (intensity in [0, 1]), including the κ lag."""
+    i = np.asarray(intensity, dtype=float)
+    out = np.empty_like(states, dtype=float)
+    out[:, PHI] = np.minimum(1.0, states[:, PHI] + i * 0.1)
+    out[:, TAU] = np.minimum(1.0, states[:, TAU] + i * 0.3)
+    out[:, RHO] = states[:, RHO]
+    out[:, H] = np.minimum(1.0, states[:, H] + i * 0.35)
+    out[:, KAPPA] = np.minimum(1.0, states[:, KAPPA] + i ** 1.5 * 0.4)
+    return out
+
+
+# =============================================================================
+# Registry
+# =============================================================================
+
+@dataclass(frozen=True)
+class BatchOperator:
+    """A scalar operator paired with its batch kernel."""
+    name: str
+    scalar: Callable
+    kernel: Callable[[np.ndarray, np.ndarray], np.ndarray]
+    magnitude_range: Tuple[float, float]
+    takes_magnitude: bool = True
+
+
+BATCH_OPERATORS: Dict[str, BatchOperator] = {
+    op.name: op for op in [
+        BatchOperator("perturb_binding", basic.op_perturb_binding,
+                      batch_perturb_binding, (-1.0, 1.0)),
+        BatchOperator("fracture_integration", basic.op_fracture_integration,
+                      batch_fracture_integration, (-1.0, 1.0)),
+        BatchOperator("stretch_temporal_depth", basic.op_stretch_temporal_depth,
+                      batch_stretch_temporal_depth, (-1.0, 1.0)),
+        BatchOperator("inject_entropy", basic.op_inject_entropy,
+                      batch_inject_entropy, (-1.0, 1.0)),
+        BatchOperator("modulate_coherence", basic.op_modulate_coherence,
+                      batch_modulate_coherence, (-1.0, 1.0)),
+        BatchOperator("dementia_progression", advanced.op_dementia_progression,
+                      batch_dementia_progression, (0.0, 1.0)),
+        BatchOperator("split_brain", advanced.op_split_brain,
+                      batch_split_brain, (0.0, 0.0), takes_magnitude=False),
+        BatchOperator("anesthesia_gradient", advanced.op_anesthesia_gradient,
+                      batch_anesthesia_gradient, (0.0, 1.0)),
+        BatchOperator("locked_in_syndrome", advanced.op_locked_in_syndrome,
+                      batch_locked_in_syndrome, (0.0, 0.0), takes_magnitude=False),
+        BatchOperator("flow_state_induction", advanced.op_flow_state_induction,
+                      batch_flow_state_induction, (0.0, 1.0)),
+        BatchOperator("panic_induction", advanced.op_panic_induction,
+                      batch_panic_induction, (0.0, 1.0)),
+        BatchOperator("psychedelic_onset", advanced.op_psychedelic_onset,
+                      batch_psychedelic_onset, (0.0, 1.0)),
+    ]
+}
+
+
+def get_batch_operator(operator) -> BatchOperator:
+    """
+    Look up a batch operator by registry name or by its scalar function.
+
+    Raises:
+        ValueError if the operator has no batch kernel
+    """
+    if isinstance(operator, BatchOperator):
+        return operator
+    if isinstance(operator, str):
+        key = operator[3:] if operator.startswith("op_") else operator
+        if key in BATCH_OPERATORS:
+            return BATCH_OPERATORS[key]
+    else:
+        for op in BATCH_OPERATORS.values():
+            if op.scalar is operator:
+                return op
+    available = list(BATCH_OPERATORS.keys())
+    raise ValueError(f"No batch kernel for operator {operator!r}. Available: {available}")
@@ -0,0 +1,35 @@
+"""
+Cache Module - Conduit Engine v0.3
+
+On-disk cache locations and content-addressed keys for expensive results
+(transition matrices, sweep cubes, lookup grids).
+
+Entries live under CACHE_DIR/<namespace>/ and are named by a hash of the
+parameters that produced them, so changing any parameter (grid resolution,
+operator set, formula version, ...) simply misses the cache. Set the
+CONDUIT_CACHE_DIR environment variable to relocate the cache.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(os.environ.get("CONDUIT_CACHE_DIR", PROJECT_ROOT / ".cache"))
+
+
+def cache_key(**params) -> str:
+    """Stable hex digest of a parameter dict (order-independent)."""
+    blob = json.dumps(params, sort_keys=True, default=repr)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:24]
+
+
+def cache_path(namespace: str, key: str, suffix: str,
+               root: Optional[Path] = None) -> Path:
+    """Path for a cache entry, creating the namespace directory if needed."""
+    directory = Path(root if root is not None else CACHE_DIR) / namespace
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"{key}{suffix}"
@@ -0,0 +1,281 @@
+"""
+Calibration Registry Module - Conduit Engine v0.3
+
+Process-wide, memoized view of the calibration library.
+
+mapping_functions.get_calibrated_states() rebuilds every GroundedState on
+each call. The registry builds them once and hands out the same read-only
+mapping (plus a precomputed array view) until the calibration sources
+change on disk. Sources are mapping_functions.py and grounded_states.json;
+changes are detected by file mtime and size.
+
+GroundedState and CalibratedValue are frozen and the registry stores
+citations as tuples, so no caller can alter a shared state; derive a
+variant with dataclasses.replace() instead.
+
+When mapping_functions.py itself has changed, the module is reloaded
+before rebuilding, so edits are picked up without restarting the process.
+A reload creates new GroundedState / CalibratedValue classes: objects
+from the registry then fail isinstance() checks against classes imported
+before the reload (e.g. `from mapping_functions import GroundedState`).
+Refer to them as mapping_functions.GroundedState at call time, or
+restart the process, when that matters.
+
+Each snapshot also compiles a CalibrationIndex. It resolves the many
+spellings scripts use ("wakefulness", "Wakefulness (Baseline)",
+"REM Sleep", "K-hole") to registry keys with one dict lookup. It groups
+states by category and carries the CANON.md reference vectors, so no
+module needs its own copy of them.
+"""
+
+import dataclasses
+import importlib
+import os
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+import numpy as np
+
+# Add calibration to path
+CALIBRATION_PATH = Path(__file__).parent.parent / "calibration"
+if str(CALIBRATION_PATH) not in sys.path:
+    sys.path.insert(0, str(CALIBRATION_PATH))
+
+try:
+    import mapping_functions
+    CALIBRATION_AVAILABLE = True
+except ImportError:
+    CALIBRATION_AVAILABLE = False
+
+MAPPING_MODULE_PATH = CALIBRATION_PATH / "mapping_functions.py"
+GROUNDED_STATES_PATH = CALIBRATION_PATH / "grounded_states.json"
+WATCHED_FILES: Tuple[Path, ...] = (MAPPING_MODULE_PATH, GROUNDED_STATES_PATH)
+
+
+@dataclass(frozen=True)
+class CalibrationArrays:
+    """
+    Column view of every calibrated state.
+
+    Attributes:
+        names: State names, in registry order
+        invariants: (N, 5) array of φ, τ, ρ, H, κ (read-only)
+        densities: (N,) array of v9.2 densities (read-only)
+        confidence: Overall confidence label per state
+    """
+    names: Tuple[str, ...]
+    invariants: np.ndarray
+    densities: np.ndarray
+    confidence: Tuple[str, ...]
+
+    def index(self, name: str) -> int:
+        """Row of a state in the arrays."""
+        return self.names.index(name)
+
+
+def normalize_state_name(name: str) -> str:
+    """Case-, space- and punctuation-insensitive form of a state name."""
+    return re.sub(r"[^0-9a-z]+", "_", name.casefold()).strip("_")
+
+
+@dataclass(frozen=True)
+class CalibrationIndex:
+    """
+    Lookup tables compiled from the calibration library.
+
+    Attributes:
+        names: Registry keys, in registry order
+        aliases: Normalized alias → registry key
+        categories: Category → registry keys in that category
+        category_of: Registry key → category ('other' if unlisted)
+        canon: CANON.md reference vectors, by CANON name
+    """
+    names: Tuple[str, ...]
+    aliases: Mapping[str, str]
+    categories: Mapping[str, Tuple[str, ...]]
+    category_of: Mapping[str, str]
+    canon: Mapping[str, Mapping[str, float]]
+
+    def resolve(self, name: str) -> str:
+        """
+        Registry key for any known spelling of a state.
+
+        Raises:
+            ValueError if the name matches no state
+        """
+        key = self.aliases.get(normalize_state_name(name))
+        if key is None:
+            raise ValueError(f"State '{name}' not found. Available: {list(self.names)}")
+        return key
+
+    def members(self, category: str) -> Tuple[str, ...]:
+        """Registry keys in one category."""
+        if category not in self.categories:
+            raise ValueError(f"Unknown category '{category}'. Available: {list(self.categories)}")
+        return self.categories[category]
+
+
+def _compile_index(states: Mapping[str, "mapping_functions.GroundedState"]) -> CalibrationIndex:
+    names = tuple(states)
+
+    # Derived spellings: key, display name, display name without its
+    # parenthetical ("Psilocybin (Peak)" → "psilocybin") and acronyms in
+    # parentheses ("UWS"). A derived spelling shared by two states is
+    # ambiguous and left out; keys and explicit aliases win.
+    derived: dict = {}
+    for key, state in states.items():
+        display = state.name
+        bare = re.sub(r"\s*\(.*?\)", "", display)
+        spellings = {display, bare, *re.findall(r"\(([A-Z0-9]+)\)", display)}
+        for spelling in spellings:
+            derived.setdefault(normalize_state_name(spelling), set()).add(key)
+    aliases = {alias: next(iter(keys)) for alias, keys in derived.items() if len(keys) == 1}
+    for alias, key in getattr(mapping_functions, "STATE_ALIASES", {}).items():
+        if key in states:
+            aliases[normalize_state_name(alias)] = key
+    for key in names:
+        aliases[normalize_state_name(key)] = key
+
+    listed = getattr(mapping_functions, "STATE_CATEGORIES", {})
+    category_of = {key: listed.get(key, "other") for key in names}
+    categories: dict = {}
+    for key in names:
+        categories.setdefault(category_of[key], []).append(key)
+
+    canon = getattr(mapping_functions, "CANON_REFERENCE_STATES", {})
+    return CalibrationIndex(
+        names=names,
+        aliases=MappingProxyType(aliases),
+        categories=MappingProxyType({c: tuple(keys) for c, keys in categories.items()}),
+        category_of=MappingProxyType(category_of),
+        canon=MappingProxyType({name: MappingProxyType(dict(v)) for name, v in canon.items()}),
+    )
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    fingerprint: Tuple
+    module_fingerprint: Tuple
+    states: Mapping[str, "mapping_functions.GroundedState"]
+    arrays: CalibrationArrays
+    index: CalibrationIndex
+
+
+_snapshot: Optional[_Snapshot] = None
+
+
+def _file_fingerprint(path: Path) -> Tuple:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (str(path), None, None)
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _fingerprint() -> Tuple:
+    return tuple(_file_fingerprint(path) for path in WATCHED_FILES)
+
+
+def _build(fingerprint: Tuple, module_fingerprint: Tuple) -> _Snapshot:
+    states = {
+        key: dataclasses.replace(state, citations=tuple(state.citations))
+        for key, state in mapping_functions.get_calibrated_states().items()
+    }
+    names = tuple(states)
+    invariants = np.array([
+        [s.phi.value, s.tau.value, s.rho.value, s.H.value, s.kappa.value]
+        for s in states.values()
+    ], dtype=float).reshape(len(names), 5)
+    densities = np.array([s.density() for s in states.values()], dtype=float)
+    invariants.flags.writeable = False
+    densities.flags.writeable = False
+    arrays = CalibrationArrays(
+        names=names,
+        invariants=invariants,
+        densities=densities,
+        confidence=tuple(s.overall_confidence().value for s in states.values()),
+    )
+    return _Snapshot(fingerprint, module_fingerprint, MappingProxyType(states), arrays,
+                     _compile_index(states))
+
+
+def _current() -> _Snapshot:
+    """
+    Current snapshot, rebuilt when a watched file changes.
+
+    Reloading mapping_functions replaces its classes; see the module
+    docstring for the isinstance() caveat.
+    """
+    global _snapshot
+    if not CALIBRATION_AVAILABLE:
+        raise ValueError("Calibration library not available")
+
+    fingerprint = _fingerprint()
+    if _snapshot is not None and _snapshot.fingerprint == fingerprint:
+        return _snapshot
+
+    module_fingerprint = _file_fingerprint(MAPPING_MODULE_PATH)
+    if _snapshot is not None and module_fingerprint != _snapshot.module_fingerprint:
+        importlib.reload(mapping_functions)
+    _snapshot = _build(fingerprint, module_fingerprint)
+    return _snapshot
+
+
+def calibration_registry() -> Mapping[str, "mapping_functions.GroundedState"]:
+    """
+    All calibrated states, built once per process.
+
+    Returns:
+        Read-only mapping of state name to frozen GroundedState. Repeated
+        calls return the same object until a calibration source changes.
+
+    Raises:
+        ValueError if the calibration library is not available
+    """
+    return _current().states
+
+
+def calibration_arrays() -> CalibrationArrays:
+    """Precomputed (N, 5) invariants and densities for every calibrated state."""
+    return _current().arrays
+
+
+def calibration_index() -> CalibrationIndex:
+    """Compiled alias, category and CANON tables for the current calibration."""
+    return _current().index
+
+
+def resolve_state_name(state_name: str) -> str:
+    """
+    Registry key for any known spelling of a state (see CalibrationIndex).
+
+    Raises:
+        ValueError if the state is not found or calibration is not available
+    """
+    return _current().index.resolve(state_name)
+
+
+def canon_states() -> Mapping[str, Mapping[str, float]]:
+    """CANON.md reference vectors (φ, τ, ρ, H, κ), by CANON name."""
+    return _current().index.canon
+
+
+def get_grounded_state(state_name: str) -> "mapping_functions.GroundedState":
+    """
+    Look up one calibrated state by key or alias.
+
+    Raises:
+        ValueError if the state is not found or calibration is not available
+    """
+    snapshot = _current()
+    return snapshot.states[snapshot.index.resolve(state_name)]
+
+
+def clear_calibration_cache():
+    """Drop the memoized registry; the next access rebuilds it."""
+    global _snapshot
+    _snapshot = None
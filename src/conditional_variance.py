@@ -0,0 +1,191 @@
+"""
+Conditional Variance Module - Conduit Engine v0.3
+
+How much of the variance of each invariant survives once D is known.
+
+States are drawn uniformly from [0, 1]^5 and each one is assigned to its
+D band once (|D - target| <= half_width), in the same pass for every
+band. Per-band moments of (φ, τ, ρ, H, κ) are folded into mergeable
+RunningMoments with update_grouped(), next to the unconditional moments.
+Memory is bounded by chunk_size, so 10^9 samples can be streamed, and
+workers each stream a share and are merged in worker order.
+
+Bands may overlap. They are split into layers of disjoint bands, and
+every layer is resolved with a single np.searchsorted.
+
+Each worker draws from its own child of a seeded numpy SeedSequence,
+so results are reproducible for a fixed (seed, n_workers).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .batch_operators import INVARIANTS, density_batch
+from .online_stats import RunningMoments
+
+
+class DensityBands:
+    """
+    Closed D bands [target - half_width, target + half_width].
+
+    Parameters:
+        targets: Band centres
+        half_width: Half-width shared by all bands, or one per band
+    """
+
+    def __init__(self, targets: Sequence[float], half_width: Union[float, Sequence[float]]):
+        self.targets = np.asarray(targets, dtype=float).ravel()
+        self.half_widths = np.broadcast_to(
+            np.asarray(half_width, dtype=float), self.targets.shape).copy()
+        if np.any(self.half_widths < 0):
+            raise ValueError("Band half-widths must be non-negative")
+
+        # Widened by one ulp so the exact |D - target| test decides membership
+        lo = np.nextafter(self.targets - self.half_widths, -np.inf)
+        hi = np.nextafter(self.targets + self.half_widths, np.inf)
+
+        # Greedy interval colouring: each layer holds disjoint bands sorted by lo
+        layers: List[List[int]] = []
+        layer_end: List[float] = []
+        for k in np.argsort(lo, kind="stable"):
+            for layer, end in enumerate(layer_end):
+                if lo[k] > end:
+                    layers[layer].append(int(k))
+                    layer_end[layer] = hi[k]
+                    break
+            else:
+                layers.append([int(k)])
+                layer_end.append(hi[k])
+        self._layers = [(np.array(ids), lo[ids]) for ids in layers]
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def assign(self, D: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Memberships of a batch of D values.
+
+        Returns:
+            (rows, bands): sample row and band index of every (sample, band)
+            membership; a sample in k overlapping bands appears k times
+        """
+        D = np.asarray(D, dtype=float)
+        rows, bands = [np.empty(0, np.int64)], [np.empty(0, np.int64)]
+        for ids, lo in self._layers:
+            pos = np.searchsorted(lo, D, side="right") - 1
+            cand = np.flatnonzero(pos >= 0)
+            band = ids[pos[cand]]
+            inside = np.abs(D[cand] - self.targets[band]) <= self.half_widths[band]
+            rows.append(cand[inside])
+            bands.append(band[inside])
+        return np.concatenate(rows), np.concatenate(bands)
+
+
+@dataclass
+class ConditionalVarianceResult:
+    """Unconditional and per-band moments of the invariants."""
+    targets: np.ndarray           # (n_bands,)
+    half_widths: np.ndarray       # (n_bands,)
+    n_samples: int
+    overall: RunningMoments       # shape (5,) over INVARIANTS
+    bands: RunningMoments         # shape (n_bands, 5)
+
+    @property
+    def overall_variance(self) -> np.ndarray:
+        return self.overall.variance()
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Samples per band."""
+        return self.bands.count[:, 0]
+
+    @property
+    def conditional_variance(self) -> np.ndarray:
+        """(n_bands, 5) variance of each invariant within each band (NaN if empty)."""
+        return self.bands.variance()
+
+    @property
+    def retained(self) -> np.ndarray:
+        """Conditional / overall variance, 0 where the overall variance is 0."""
+        overall = self.overall_variance
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(overall > 0, self.conditional_variance / overall, 0.0)
+
+    def band(self, k: int) -> dict:
+        """Count, conditional variance and retained fraction of band k, keyed by invariant."""
+        return {
+            "n_points": int(self.counts[k]),
+            "conditional_variance": dict(zip(INVARIANTS, map(float, self.conditional_variance[k]))),
+            "variance_retained_fraction": dict(zip(INVARIANTS, map(float, self.retained[k]))),
+        }
+
+
+def _sample_share(args) -> Tuple[RunningMoments, RunningMoments]:
+    """Stream one worker's share of uniform samples into the accumulators."""
+    bands, n_samples, seed_seq, chunk_size = args
+    rng = np.random.default_rng(seed_seq)
+    overall = RunningMoments(len(INVARIANTS))
+    banded = RunningMoments((len(bands), len(INVARIANTS)))
+
+    remaining = n_samples
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        remaining -= n
+        states = rng.random((n, len(INVARIANTS)))
+        overall.update(states)
+        rows, band = bands.assign(density_batch(states))
+        banded.update_grouped(states[rows], band)
+    return overall, banded
+
+
+def conditional_variance(
+    targets: Sequence[float],
+    half_width: Union[float, Sequence[float]] = 0.005,
+    n_samples: int = 500_000,
+    seed: int = 42,
+    n_workers: int = 1,
+    chunk_size: int = 1 << 20,
+) -> ConditionalVarianceResult:
+    """
+    Variance of each invariant conditional on D lying in each band.
+
+    Parameters:
+        targets: D band centres
+        half_width: Band half-width (shared or one per band)
+        n_samples: Uniform samples from [0, 1]^5
+        seed: Root seed for the per-worker SeedSequence streams
+        n_workers: Worker processes (1 runs in-process)
+        chunk_size: Samples drawn per batch; bounds memory use
+
+    Returns:
+        ConditionalVarianceResult
+    """
+    if n_samples < 1:
+        raise ValueError(f"n_samples must be positive, got {n_samples}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    bands = DensityBands(targets, half_width)
+
+    n_workers = max(1, min(n_workers, n_samples))
+    seeds = np.random.SeedSequence(seed).spawn(n_workers)
+    base, extra = divmod(n_samples, n_workers)
+    shares = [base + (w < extra) for w in range(n_workers)]
+    tasks = [(bands, share, seeds[w], chunk_size) for w, share in enumerate(shares)]
+
+    if n_workers == 1:
+        partials = [_sample_share(tasks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            partials = list(pool.map(_sample_share, tasks))
+
+    # Merge in worker order so results are deterministic
+    overall, banded = partials[0]
+    for other_overall, other_banded in partials[1:]:
+        overall.merge(other_overall)
+        banded.merge(other_banded)
+
+    return ConditionalVarianceResult(bands.targets, bands.half_widths, n_samples,
+                                     overall, banded)
@@ -0,0 +1,197 @@
+"""
+Diameter Module - Conduit Engine v0.3
+
+Exact farthest pair of a large 5D point set (e.g. every point on an
+isocline), without sampling and without an O(n²) scan.
+
+1. Lower bound L: the extreme points along many projections (axes,
+   sign diagonals, seeded random directions), refined by a few
+   farthest-point sweeps. Every candidate is a real pair, so L is attained.
+2. Point pruning: no pair through p can be longer than the distance
+   from p to the farthest corner of the survivors' bounding box. Points
+   whose bound is <= L are dropped, and the box is recomputed and the step
+   repeated until nothing changes.
+3. Branch and bound: survivors are split into kd-tree leaves. The
+   farthest-corner distance between two leaf boxes bounds every pair
+   across them. Leaf pairs are scanned in decreasing bound order in
+   vectorized batches, and the scan stops as soon as a bound falls below L.
+
+With rtol > 0 pairs are only pursued if they could beat L by more than
+that relative margin; the result is then certified to lie within
+(1 + rtol) of the true diameter (DiameterResult.upper_bound).
+"""
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+
+@dataclass
+class DiameterResult:
+    """Farthest pair of a point set."""
+    distance: float
+    i: int                        # row indices of the pair
+    j: int
+    upper_bound: float            # certified bound on the true diameter
+    n_candidates: int             # points left after pruning
+
+
+def _directions(n_random: int, seed: int) -> np.ndarray:
+    """Unit directions: the axes, all sign diagonals (up to sign) and random ones."""
+    signs = np.array(np.meshgrid(*[[1.0, -1.0]] * 4, indexing="ij")).reshape(4, -1).T
+    diagonals = np.hstack([np.ones((len(signs), 1)), signs]) / np.sqrt(5.0)
+    random = np.random.default_rng(seed).normal(size=(n_random, 5))
+    random /= np.linalg.norm(random, axis=1, keepdims=True)
+    return np.vstack([np.eye(5), diagonals, random])
+
+
+def _farthest_from(points: np.ndarray, i: int, chunk_size: int) -> Tuple[int, float]:
+    best_j, best = i, -1.0
+    for start in range(0, len(points), chunk_size):
+        d2 = ((points[start:start + chunk_size] - points[i]) ** 2).sum(axis=1)
+        k = int(d2.argmax())
+        if d2[k] > best:
+            best_j, best = start + k, float(d2[k])
+    return best_j, best
+
+
+def _lower_bound(points: np.ndarray, n_random: int, n_sweeps: int, seed: int,
+                 chunk_size: int) -> Tuple[float, int, int]:
+    """Squared length and endpoints of a long pair."""
+    directions = _directions(n_random, seed)
+    lo = np.full(len(directions), np.inf)
+    hi = np.full(len(directions), -np.inf)
+    arg_lo = np.zeros(len(directions), dtype=np.int64)
+    arg_hi = np.zeros(len(directions), dtype=np.int64)
+    for start in range(0, len(points), chunk_size):
+        proj = directions @ points[start:start + chunk_size].T      # (directions, block)
+        k_lo, k_hi = proj.argmin(axis=1), proj.argmax(axis=1)
+        rows = np.arange(len(directions))
+        v_lo, v_hi = proj[rows, k_lo], proj[rows, k_hi]
+        better = v_lo < lo
+        lo[better], arg_lo[better] = v_lo[better], k_lo[better] + start
+        better = v_hi > hi
+        hi[better], arg_hi[better] = v_hi[better], k_hi[better] + start
+
+    extremes = np.unique(np.concatenate([arg_lo, arg_hi]))
+    e = points[extremes]
+    d2 = ((e[:, None, :] - e[None, :, :]) ** 2).sum(axis=2)
+    a, b = np.unravel_index(int(d2.argmax()), d2.shape)
+    i, j, best = int(extremes[a]), int(extremes[b]), float(d2[a, b])
+
+    # Farthest-point sweeps from the current endpoints
+    for _ in range(n_sweeps):
+        k, d = _farthest_from(points, j, chunk_size)
+        if d <= best:
+            break
+        i, j, best = j, k, d
+    return best, i, j
+
+
+def _corner_bound_sq(points: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Squared distance from each point to the farthest corner of a box."""
+    return (np.maximum(points - lo, hi - points) ** 2).sum(axis=1)
+
+
+def _leaves(points: np.ndarray, idx: np.ndarray, leaf_size: int) -> List[np.ndarray]:
+    """kd-tree leaves (median splits on the widest axis)."""
+    leaves, stack = [], [idx]
+    while stack:
+        node = stack.pop()
+        if len(node) <= leaf_size:
+            leaves.append(node)
+            continue
+        pts = points[node]
+        axis = int(np.argmax(pts.max(axis=0) - pts.min(axis=0)))
+        order = np.argsort(pts[:, axis], kind="stable")
+        half = len(node) // 2
+        stack.append(node[order[:half]])
+        stack.append(node[order[half:]])
+    return leaves
+
+
+def farthest_pair(
+    points: np.ndarray,
+    rtol: float = 0.0,
+    leaf_size: int = 64,
+    n_random: int = 16,
+    n_sweeps: int = 4,
+    batch_pairs: int = 1 << 20,
+    chunk_size: int = 1 << 18,
+    seed: int = 0,
+) -> DiameterResult:
+    """
+    Diameter of an (n, 5) point set and a pair attaining it.
+
+    Parameters:
+        points: (n, 5) array, n >= 2
+        rtol: Relative tolerance; 0 gives the exact diameter
+        leaf_size: Points per kd-tree leaf in the branch-and-bound stage
+        n_random: Random projection directions for the lower bound
+        n_sweeps: Farthest-point refinement sweeps for the lower bound
+        batch_pairs: Point pairs evaluated per vectorized batch
+        chunk_size: Points processed per block in full passes
+        seed: Seed for the random directions (the result does not depend on it)
+
+    Returns:
+        DiameterResult
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 5)
+    if len(points) < 2:
+        raise ValueError(f"Need at least 2 points, got {len(points)}")
+    if rtol < 0:
+        raise ValueError(f"rtol must be non-negative, got {rtol}")
+    scale = (1.0 + rtol) ** 2
+
+    best, best_i, best_j = _lower_bound(points, n_random, n_sweeps, seed, chunk_size)
+
+    # Point pruning against the survivors' bounding box, to a fixed point
+    survivors = np.arange(len(points))
+    while len(survivors) > 1:
+        pts = points[survivors]
+        keep = _corner_bound_sq(pts, pts.min(axis=0), pts.max(axis=0)) > best * scale
+        if keep.all():
+            break
+        survivors = survivors[keep]
+    n_candidates = len(survivors)
+    if n_candidates < 2:
+        return DiameterResult(float(np.sqrt(best)), min(best_i, best_j), max(best_i, best_j),
+                              float(np.sqrt(best * scale)), n_candidates)
+
+    leaves = _leaves(points, survivors, leaf_size)
+    lo = np.array([points[leaf].min(axis=0) for leaf in leaves])
+    hi = np.array([points[leaf].max(axis=0) for leaf in leaves])
+    sizes = np.array([len(leaf) for leaf in leaves])
+
+    # Bounds for every leaf pair (a <= b), kept only if they can beat L
+    pair_a, pair_b, pair_ub = [], [], []
+    for a in range(len(leaves)):
+        b = np.arange(a, len(leaves))
+        ub = (np.maximum(hi[a] - lo[b], hi[b] - lo[a]) ** 2).sum(axis=1)
+        keep = ub > best * scale
+        pair_a.append(np.full(int(keep.sum()), a))
+        pair_b.append(b[keep])
+        pair_ub.append(ub[keep])
+    pair_a, pair_b, pair_ub = (np.concatenate(x) for x in (pair_a, pair_b, pair_ub))
+    order = np.argsort(-pair_ub, kind="stable")
+    pair_a, pair_b, pair_ub = pair_a[order], pair_b[order], pair_ub[order]
+
+    start = 0
+    while start < len(pair_ub) and pair_ub[start] > best * scale:
+        # Next batch: consecutive leaf pairs up to batch_pairs point pairs
+        work = np.cumsum(sizes[pair_a[start:]] * sizes[pair_b[start:]])
+        stop = start + max(1, int(np.searchsorted(work, batch_pairs, side="right")))
+        live = np.arange(start, stop)
+        live = live[pair_ub[live] > best * scale]
+        if live.size:
+            rows = np.concatenate([np.repeat(leaves[pair_a[k]], sizes[pair_b[k]]) for k in live])
+            cols = np.concatenate([np.tile(leaves[pair_b[k]], sizes[pair_a[k]]) for k in live])
+            d2 = ((points[rows] - points[cols]) ** 2).sum(axis=1)
+            k = int(d2.argmax())
+            if d2[k] > best:
+                best, best_i, best_j = float(d2[k]), int(rows[k]), int(cols[k])
+        start = stop
+
+    return DiameterResult(float(np.sqrt(best)), min(best_i, best_j), max(best_i, best_j),
+                          float(np.sqrt(best * scale)), n_candidates)
@@ -25,11 +25,16 @@ if str(CALIBRATION_PATH) not in sys.path:
     sys.path.insert(0, str(CALIBRATION_PATH))
 
 try:
-    from mapping_functions import get_calibrated_states, GroundedState
+    from mapping_functions import GroundedState
     CALIBRATION_AVAILABLE = True
 except ImportError:
     CALIBRATION_AVAILABLE = False
 
+try:
+    from .calibration_registry import calibration_registry, get_grounded_state
+except ImportError:  # loaded as a top-level module with src/ on sys.path
+    from calibration_registry import calibration_registry, get_grounded_state
+
 
 @dataclass
 class StateVector:
@@ -179,22 +184,7 @@ def encode_from_calibration(state_name: str) -> StateVector:
     if not CALIBRATION_AVAILABLE:
         raise ValueError("Calibration library not available")
 
-    states = get_calibrated_states()
-    if state_name not in states:
-        available = list(states.keys())
-        raise ValueError(f"State '{state_name}' not found. Available: {available}")
-
-    state = states[state_name]
-
-    return StateVector(
-        phi=state.phi.value,
-        tau=state.tau.value,
-        rho=state.rho.value,
-        H=state.H.value,
-        kappa=state.kappa.value,
-        name=state.name,
-        confidence=state.overall_confidence().value
-    )
+    return _state_vector(get_grounded_state(state_name))
 
 
 def get_all_calibrated_states() -> Dict[str, StateVector]:
@@ -208,13 +198,24 @@ def get_all_calibrated_states() -> Dict[str, StateVector]:
     if not CALIBRATION_AVAILABLE:
         raise ValueError("Calibration library not available")
 
-    states = get_calibrated_states()
     return {
-        name: encode_from_calibration(name)
-        for name in states.keys()
+        name: _state_vector(state)
+        for name, state in calibration_registry().items()
     }
 
 
+def _state_vector(state: "GroundedState") -> StateVector:
+    return StateVector(
+        phi=state.phi.value,
+        tau=state.tau.value,
+        rho=state.rho.value,
+        H=state.H.value,
+        kappa=state.kappa.value,
+        name=state.name,
+        confidence=state.overall_confidence().value
+    )
+
+
 def compute_density(phi: float, tau: float, rho: float) -> float:
     """
     LEGACY: Compute density as φ × τ × ρ only.
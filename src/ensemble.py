@@ -0,0 +1,202 @@
+"""
+Ensemble Module - Conduit Engine v0.3
+
+Monte Carlo ensembles of noisy operator trajectories.
+
+simulate_trajectory() applies an operator with a deterministic magnitude
+schedule (progress = step / (steps - 1)). Here every ensemble member gets
+its own noisy copy of that schedule, all members are advanced together as
+one (N, 5) batch through the operator's batch kernel, and per-step
+statistics of every invariant and of D are accumulated online.
+
+Nothing proportional to N × steps is ever stored: each worker streams
+chunks of members through RunningMoments / StreamingHistogram, so memory
+is bounded by chunk_size and 10^6-member ensembles are routine.
+
+Each worker draws from its own child of a seeded numpy SeedSequence.
+A chunk draws all its members' noise at once, member by member, so the
+stream does not depend on how members are chunked: results are
+reproducible for a fixed (seed, n_workers) at any chunk_size (moments up
+to floating-point rounding in how chunks are merged).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .encoder import StateVector
+from .batch_operators import INVARIANTS, density_batch, get_batch_operator
+from .online_stats import RunningMoments, StreamingHistogram
+
+
+FIELDS = INVARIANTS + ("D",)
+
+
+@dataclass
+class EnsembleResult:
+    """Per-step summary statistics of a stochastic operator ensemble."""
+    operator: str
+    n_members: int
+    noise: float
+    progress: np.ndarray          # (steps,) deterministic magnitude schedule
+    mean: np.ndarray              # (steps, 6) over FIELDS
+    variance: np.ndarray          # (steps, 6)
+    quantile_levels: Tuple[float, ...]
+    quantiles: np.ndarray         # (n_quantiles, steps, 6)
+
+    @property
+    def steps(self) -> int:
+        return len(self.progress)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+    def field(self, name: str) -> Dict[str, np.ndarray]:
+        """Return mean, std and quantiles of one field ('phi', ..., 'D') per step."""
+        if name not in FIELDS:
+            raise ValueError(f"Unknown field '{name}'. Available: {list(FIELDS)}")
+        j = FIELDS.index(name)
+        out = {"mean": self.mean[:, j], "std": self.std[:, j]}
+        for k, q in enumerate(self.quantile_levels):
+            out[f"q{q:g}"] = self.quantiles[k, :, j]
+        return out
+
+    def to_trajectory(self) -> List[Dict]:
+        """
+        Mean trajectory in the same record format as simulate_trajectory,
+        with a 'density_std' entry per step.
+        """
+        records = []
+        for step in range(self.steps):
+            rec = {"step": step, "progress": float(self.progress[step])}
+            for j, name in enumerate(INVARIANTS):
+                rec[name] = float(self.mean[step, j])
+            rec["density"] = float(self.mean[step, -1])
+            rec["density_std"] = float(self.std[step, -1])
+            rec["name"] = f"Ensemble({self.operator}, n={self.n_members})"
+            records.append(rec)
+        return records
+
+
+def _progress_schedule(steps: int) -> np.ndarray:
+    """The magnitude schedule used by simulate_trajectory."""
+    if steps > 1:
+        return np.arange(steps) / (steps - 1)
+    return np.zeros(steps)
+
+
+def _run_stream(args) -> Tuple[List[RunningMoments], List[StreamingHistogram]]:
+    """Advance one worker's share of the ensemble chunk by chunk."""
+    (op_name, initial, n_members, schedule, noise,
+     seed_seq, chunk_size, n_bins) = args
+    op = get_batch_operator(op_name)
+    lo, hi = op.magnitude_range
+    rng = np.random.default_rng(seed_seq)
+    steps = len(schedule)
+
+    moments = [RunningMoments(len(FIELDS)) for _ in range(steps)]
+    hists = [StreamingHistogram(len(FIELDS), n_bins=n_bins) for _ in range(steps)]
+    values = np.empty((0, len(FIELDS)))
+
+    remaining = n_members
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        remaining -= n
+        states = np.broadcast_to(initial, (n, 5))
+        if values.shape[0] != n:
+            values = np.empty((n, len(FIELDS)))
+        # (member, step) order keeps the draws independent of chunk_size
+        draws = rng.standard_normal((n, steps))
+        for step in range(steps):
+            magnitude = schedule[step] + noise * draws[:, step]
+            if op.takes_magnitude:
+                magnitude = np.clip(magnitude, lo, hi)
+            states = op.kernel(states, magnitude)
+            values[:, :5] = states
+            values[:, 5] = density_batch(states)
+            moments[step].update(values)
+            hists[step].update(values)
+
+    return moments, hists
+
+
+def run_ensemble(
+    initial_state: StateVector,
+    operator,
+    n_members: int = 10_000,
+    steps: int = 10,
+    noise: float = 0.05,
+    seed: int = 0,
+    magnitudes: Optional[Sequence[float]] = None,
+    n_workers: int = 1,
+    chunk_size: int = 100_000,
+    quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95),
+    n_bins: int = 2048,
+) -> EnsembleResult:
+    """
+    Run a Monte Carlo ensemble of noisy trajectories for one operator.
+
+    Member i at step k applies the operator with magnitude
+    schedule[k] + noise × N(0, 1), clipped to the operator's valid range.
+    With noise=0 every member reproduces simulate_trajectory exactly.
+
+    Parameters:
+        initial_state: Starting StateVector shared by all members
+        operator: Operator function (e.g. op_anesthesia_gradient) or registry name
+        n_members: Ensemble size
+        steps: Number of operator applications per member
+        noise: Standard deviation of the Gaussian magnitude noise
+        seed: Root seed for the per-worker SeedSequence streams
+        magnitudes: Base magnitude per step (default: simulate_trajectory progress)
+        n_workers: Worker processes (1 runs in-process)
+        chunk_size: Members advanced per batch; bounds memory use and
+            does not change the draws
+        quantiles: Quantile levels reported per step
+        n_bins: Histogram bins on [0, 1] (quantile resolution 1 / n_bins)
+
+    Returns:
+        EnsembleResult with per-step mean, variance and quantiles of φ, τ, ρ, H, κ and D
+    """
+    op = get_batch_operator(operator)
+    if n_members < 1:
+        raise ValueError(f"n_members must be positive, got {n_members}")
+
+    schedule = (np.asarray(magnitudes, dtype=float) if magnitudes is not None
+                else _progress_schedule(steps))
+    initial = np.asarray(initial_state.to_vector(), dtype=float)
+
+    n_workers = max(1, min(n_workers, n_members))
+    seeds = np.random.SeedSequence(seed).spawn(n_workers)
+    shares = [len(s) for s in np.array_split(np.arange(n_members), n_workers)]
+    tasks = [
+        (op.name, initial, share, schedule, noise, seeds[w], chunk_size, n_bins)
+        for w, share in enumerate(shares)
+    ]
+
+    if n_workers == 1:
+        partials = [_run_stream(tasks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            partials = list(pool.map(_run_stream, tasks))
+
+    # Merge in worker order so results are deterministic
+    moments, hists = partials[0]
+    for other_moments, other_hists in partials[1:]:
+        for step in range(len(schedule)):
+            moments[step].merge(other_moments[step])
+            hists[step].merge(other_hists[step])
+
+    levels = tuple(float(q) for q in quantiles)
+    return EnsembleResult(
+        operator=op.name,
+        n_members=n_members,
+        noise=noise,
+        progress=schedule,
+        mean=np.stack([m.mean for m in moments]),
+        variance=np.stack([m.variance() for m in moments]),
+        quantile_levels=levels,
+        quantiles=np.stack([h.quantile(levels) for h in hists], axis=1),
+    )
@@ -0,0 +1,482 @@
+"""
+Grid Sweep Module - Conduit Engine v0.3
+
+Out-of-core sweeps over the dense regular grid on [0, 1]^5.
+
+A grid with `resolution` points per axis has resolution^5 points: 4.08M
+at 21, 115M at 41, 345M at 51. np.meshgrid would hold five coordinate
+arrays of that size plus D. GridSweep never builds them. It walks the
+flat C-order index range (φ slowest, κ fastest) in fixed-size blocks and
+derives each block's coordinates from its indices. Blocks are whole
+multiples of resolution^t points, so the trailing t axes repeat one
+precomputed template and only the leading axes are unravelled. Memory is
+therefore bounded by the block size, whatever the resolution, and the
+values are bit-identical to the meshgrid ones.
+
+Reductions consume the blocks and keep only summary state:
+- IsoclineCollector: grid indices within a tolerance of several D levels
+- DensityHistogram: counts over fixed D bins
+- DensitySummary: min, max, mean and median of D
+
+run_sweep() feeds one pass over the grid to any number of reductions.
+With n_workers > 1 the block range is split into contiguous shares, each
+worker sweeps its share into fresh copies of the reductions, and the
+partial results are merged in share order, so the output is deterministic.
+
+sweep_isoclines() adds a content-addressed cache under
+CACHE_DIR/grid_sweep/:
+- D over the whole grid, as a memory-mapped .npy keyed by resolution and
+  formula version. A cached grid reads D from it instead of evaluating
+  the formula; coordinates are always re-derived from the indices.
+- Each isocline, as a compressed .npz keyed by resolution, target D,
+  tolerance and formula version.
+Only missing entries are computed, in a single sweep.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch_operators import density_batch
+from .cache import cache_key, cache_path
+from .density_models import FORMULA_VERSION
+from .online_stats import RunningMoments, StreamingHistogram
+
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+CACHE_NAMESPACE = "grid_sweep"
+
+
+@dataclass
+class GridChunk:
+    """One block of consecutive grid points."""
+    start: int
+    D: np.ndarray                 # (n,) v9.2 density
+    resolution: int
+    _points: Optional[np.ndarray] = field(default=None, repr=False)
+
+    @property
+    def cells(self) -> np.ndarray:
+        """Flat grid indices of the block's points."""
+        return np.arange(self.start, self.start + len(self.D))
+
+    @property
+    def points(self) -> np.ndarray:
+        """(n, 5) φ, τ, ρ, H, κ; derived on first use when D came from the cache."""
+        if self._points is None:
+            self._points = grid_coords(self.resolution, self.cells)
+        return self._points
+
+
+def grid_coords(resolution: int, cells: np.ndarray) -> np.ndarray:
+    """Flat indices of the resolution^5 grid → (n, 5) coordinates."""
+    axis = np.linspace(0.0, 1.0, resolution)
+    idx = np.unravel_index(np.asarray(cells, dtype=np.int64), (resolution,) * 5)
+    return np.stack([axis[i] for i in idx], axis=-1)
+
+
+class GridSweep:
+    """
+    resolution^5 grid over [0, 1]^5, read in blocks of `chunk_size` points.
+
+    Axis values are np.linspace(0, 1, resolution); points are indexed in
+    C order over (φ, τ, ρ, H, κ). chunk_size is rounded down to a multiple
+    of the largest power of resolution that fits in it. With density_path
+    (a .npy of D over the whole grid, see DensityStore) D is read from
+    the file instead of evaluated.
+    """
+
+    def __init__(self, resolution: int = 21, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 density_path: Optional[Path] = None):
+        if resolution < 2:
+            raise ValueError(f"resolution must be at least 2, got {resolution}")
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        self.resolution = resolution
+        self.axis = np.linspace(0.0, 1.0, resolution)
+        self.n_points = resolution ** 5
+
+        # Trailing axes covered by one template block of resolution^t points
+        self._tail_axes = max(t for t in range(6) if resolution ** t <= max(chunk_size, 1))
+        self._tail_size = resolution ** self._tail_axes
+        self._tail = self.coords(np.arange(self._tail_size))[:, 5 - self._tail_axes:]
+        self.chunk_size = self._tail_size * max(1, chunk_size // self._tail_size)
+        self.density_path = density_path
+        self._density = None
+
+    def __len__(self) -> int:
+        return self.n_points
+
+    def coords(self, cells: np.ndarray) -> np.ndarray:
+        """Flat grid indices → (n, 5) coordinates."""
+        return grid_coords(self.resolution, cells)
+
+    def blocks(self) -> Iterator[Tuple[int, int]]:
+        """(start, stop) index ranges covering the grid."""
+        for start in range(0, self.n_points, self.chunk_size):
+            yield start, min(self.n_points, start + self.chunk_size)
+
+    def _stored_density(self) -> np.ndarray:
+        if self._density is None:
+            self._density = np.load(self.density_path, mmap_mode="r")
+            if self._density.shape != (self.n_points,):
+                raise ValueError(f"{self.density_path} holds {self._density.shape} values, "
+                                 f"expected ({self.n_points},)")
+        return self._density
+
+    def chunk(self, start: int, stop: int) -> GridChunk:
+        """Coordinates and densities of grid points [start, stop)."""
+        if self.density_path is not None:
+            return GridChunk(start, np.array(self._stored_density()[start:stop]), self.resolution)
+        size, lead = self._tail_size, 5 - self._tail_axes
+        if start % size or (stop - start) % size:
+            points = self.coords(np.arange(start, stop))
+        else:
+            n_blocks = (stop - start) // size
+            points = np.empty((n_blocks, size, 5))
+            points[:, :, lead:] = self._tail
+            if lead:
+                heads = self.coords(np.arange(start, stop, size))[:, :lead]
+                points[:, :, :lead] = heads[:, None, :]
+            points = points.reshape(-1, 5)
+        return GridChunk(start, density_batch(points), self.resolution, points)
+
+    def __iter__(self) -> Iterator[GridChunk]:
+        for start, stop in self.blocks():
+            yield self.chunk(start, stop)
+
+    def density_range(self) -> Tuple[float, float]:
+        """
+        Exact min and max of D over the grid, without sweeping it.
+
+        D = φτρ · g(H, κ) with both factors non-negative and φτρ monotone,
+        so the extremes pair the structure extremes with the gate extremes
+        over the (H, κ) axis grid.
+        """
+        H, kappa = np.meshgrid(self.axis, self.axis, indexing="ij")
+        gate = (1.0 - np.sqrt(H)) + H * kappa
+        low, high = self.axis[0], self.axis[-1]
+        return float(low * low * low * gate.min()), float(high * high * high * gate.max())
+
+
+@dataclass
+class Isocline:
+    """Grid points with |D - target| <= tolerance."""
+    target: float
+    tolerance: float
+    cells: np.ndarray             # flat grid indices
+    D: np.ndarray
+    n_total: int                  # points in the swept grid
+
+    @property
+    def count(self) -> int:
+        return len(self.cells)
+
+    @property
+    def fraction(self) -> float:
+        return self.count / self.n_total if self.n_total else 0.0
+
+
+class IsoclineCollector:
+    """
+    Collects the grid points near several D levels in one pass.
+
+    Parameters:
+        targets: D levels
+        tolerance: Half-width of each level's band
+    """
+
+    def __init__(self, targets: Sequence[float], tolerance: float = 0.005):
+        self.targets = tuple(float(t) for t in targets)
+        self.tolerance = tolerance
+        self.n_total = 0
+        self._cells = {t: [] for t in self.targets}
+        self._D = {t: [] for t in self.targets}
+
+    def update(self, chunk: GridChunk) -> "IsoclineCollector":
+        self.n_total += len(chunk.D)
+        for target in self.targets:
+            hits = np.flatnonzero(np.abs(chunk.D - target) <= self.tolerance)
+            self._cells[target].append(hits + chunk.start)
+            self._D[target].append(chunk.D[hits])
+        return self
+
+    def merge(self, other: "IsoclineCollector") -> "IsoclineCollector":
+        """Append another collector's points (which must follow this one's)."""
+        if other.targets != self.targets or other.tolerance != self.tolerance:
+            raise ValueError("Collectors must share targets and tolerance to merge")
+        self.n_total += other.n_total
+        for target in self.targets:
+            self._cells[target].extend(other._cells[target])
+            self._D[target].extend(other._D[target])
+        return self
+
+    def isoclines(self) -> Dict[float, Isocline]:
+        """Target D → Isocline."""
+        return {
+            t: Isocline(t, self.tolerance,
+                        np.concatenate(self._cells[t]) if self._cells[t] else np.empty(0, np.int64),
+                        np.concatenate(self._D[t]) if self._D[t] else np.empty(0),
+                        self.n_total)
+            for t in self.targets
+        }
+
+
+@dataclass
+class DensityHistogram:
+    """Counts of D over fixed bin edges (np.histogram semantics)."""
+    edges: np.ndarray
+    counts: np.ndarray = field(init=False)
+    total: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        self.edges = np.asarray(self.edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    def update(self, chunk: GridChunk) -> "DensityHistogram":
+        self.counts += np.histogram(chunk.D, bins=self.edges)[0]
+        self.total += len(chunk.D)
+        return self
+
+    def merge(self, other: "DensityHistogram") -> "DensityHistogram":
+        if not np.array_equal(other.edges, self.edges):
+            raise ValueError("Histograms must share bin edges to merge")
+        self.counts += other.counts
+        self.total += other.total
+        return self
+
+
+class DensitySummary:
+    """
+    Streaming min, max, mean and median of D.
+
+    The median comes from a fixed-bin histogram over [0, 1], so it is
+    accurate to 1 / n_bins (about 1e-6 by default).
+    """
+
+    def __init__(self, n_bins: int = 1 << 20):
+        self.min = np.inf
+        self.max = -np.inf
+        self._moments = RunningMoments()
+        self._histogram = StreamingHistogram(n_bins=n_bins)
+
+    def update(self, chunk: GridChunk) -> "DensitySummary":
+        if len(chunk.D):
+            self.min = min(self.min, float(chunk.D.min()))
+            self.max = max(self.max, float(chunk.D.max()))
+            self._moments.update(chunk.D)
+            self._histogram.update(chunk.D)
+        return self
+
+    def merge(self, other: "DensitySummary") -> "DensitySummary":
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._moments.merge(other._moments)
+        self._histogram.merge(other._histogram)
+        return self
+
+    @property
+    def count(self) -> int:
+        return int(self._moments.count)
+
+    @property
+    def mean(self) -> float:
+        return float(self._moments.mean)
+
+    @property
+    def median(self) -> float:
+        return float(self._histogram.quantile(0.5))
+
+
+class DensityStore:
+    """
+    Writes every chunk's D into a .npy file holding D over the whole grid.
+
+    The file is created (zero-filled) up front and written through a
+    memory map. Pickled copies reopen it by path, so workers of a
+    parallel sweep write their shares in place and merge() has nothing
+    to combine.
+    """
+
+    def __init__(self, path: Path, n_points: int):
+        self.path = Path(path)
+        self.n_points = n_points
+        np.lib.format.open_memmap(self.path, mode="w+", dtype=float, shape=(n_points,)).flush()
+        self._array = None
+
+    def update(self, chunk: GridChunk) -> "DensityStore":
+        if self._array is None:
+            self._array = np.load(self.path, mmap_mode="r+")
+        self._array[chunk.start:chunk.start + len(chunk.D)] = chunk.D
+        return self
+
+    def merge(self, other: "DensityStore") -> "DensityStore":
+        return self
+
+    def flush(self) -> None:
+        """Write pending pages and release the map."""
+        if self._array is not None:
+            self._array.flush()
+            self._array = None
+
+    def __getstate__(self):
+        self.flush()
+        return {"path": self.path, "n_points": self.n_points}
+
+    def __setstate__(self, state):
+        self.path, self.n_points, self._array = state["path"], state["n_points"], None
+
+
+def _sweep_share(args):
+    """Sweep a contiguous range of blocks into the given (empty) reductions."""
+    resolution, chunk_size, density_path, blocks, reductions = args
+    grid = GridSweep(resolution, chunk_size, density_path)
+    for start, stop in blocks:
+        chunk = grid.chunk(start, stop)
+        for reduction in reductions:
+            reduction.update(chunk)
+    return reductions
+
+
+def run_sweep(grid: GridSweep, *reductions, n_workers: int = 1):
+    """
+    One pass over the grid, feeding every chunk to each reduction.
+
+    Parameters:
+        grid: Grid to sweep
+        *reductions: Objects with update(chunk) (and merge(other) when
+            n_workers > 1, in which case they must be freshly created)
+        n_workers: Worker processes; each sweeps a contiguous share of
+            the blocks (1 runs in-process)
+
+    Returns:
+        The reductions, updated (a single one is returned bare)
+    """
+    blocks = list(grid.blocks())
+    n_workers = max(1, min(n_workers, len(blocks)))
+    if n_workers == 1:
+        for chunk in grid:
+            for reduction in reductions:
+                reduction.update(chunk)
+    else:
+        shares = [blocks[s[0]:s[-1] + 1] for s in np.array_split(np.arange(len(blocks)), n_workers)]
+        tasks = [(grid.resolution, grid.chunk_size, grid.density_path, share, reductions)
+                 for share in shares]
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            partials = list(pool.map(_sweep_share, tasks))
+        # Merge in share order so results are deterministic
+        for partial in partials:
+            for reduction, part in zip(reductions, partial):
+                reduction.merge(part)
+    return reductions[0] if len(reductions) == 1 else reductions
+
+
+# ---------------------------------------------------------------------------
+# On-disk cache
+# ---------------------------------------------------------------------------
+
+def density_cache_path(resolution: int, cache_root: Optional[Path] = None) -> Path:
+    """Cache entry for D over the resolution^5 grid."""
+    key = cache_key(entry="density", resolution=resolution, formula=FORMULA_VERSION)
+    return cache_path(CACHE_NAMESPACE, key, ".npy", root=cache_root)
+
+
+def isocline_cache_path(resolution: int, target: float, tolerance: float,
+                        cache_root: Optional[Path] = None) -> Path:
+    """Cache entry for one isocline."""
+    key = cache_key(entry="isocline", resolution=resolution, target=float(target),
+                    tolerance=float(tolerance), formula=FORMULA_VERSION)
+    return cache_path(CACHE_NAMESPACE, key, ".npz", root=cache_root)
+
+
+@dataclass
+class SweepReport:
+    """Outcome of sweep_isoclines."""
+    grid: GridSweep
+    summary: DensitySummary
+    isoclines: Dict[float, Isocline]
+    reused: Tuple[str, ...]           # cache entries loaded ("density", "isocline D=...")
+    computed: Tuple[str, ...]         # entries computed (and stored, with use_cache)
+
+
+def sweep_isoclines(
+    resolution: int,
+    targets: Sequence[float],
+    tolerance: float = 0.005,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    n_workers: int = 1,
+    use_cache: bool = True,
+    cache_root: Optional[Path] = None,
+) -> SweepReport:
+    """
+    D summary and isoclines of the resolution^5 grid, reusing cached work.
+
+    A cached D array replaces formula evaluation; cached isoclines are
+    loaded as they are. Everything missing is computed in one sweep and
+    stored. The summary is always recomputed (from cached D if present).
+
+    Parameters:
+        resolution: Grid points per axis
+        targets: D levels
+        tolerance: Half-width of each level's band
+        chunk_size: Grid points per block
+        n_workers: Worker processes for the sweep
+        use_cache: Load and store entries under the cache directory
+        cache_root: Override the cache directory
+
+    Returns:
+        SweepReport
+    """
+    targets = tuple(float(t) for t in targets)
+    reused, computed = [], []
+    reductions = [DensitySummary()]
+
+    grid = GridSweep(resolution, chunk_size)
+    store = None
+    density_path = density_cache_path(resolution, cache_root) if use_cache else None
+    if density_path is not None and density_path.exists():
+        grid = GridSweep(resolution, chunk_size, density_path)
+        reused.append("density")
+    else:
+        computed.append("density")
+        if density_path is not None:
+            store = DensityStore(density_path.with_suffix(".partial.npy"), grid.n_points)
+            reductions.append(store)
+
+    isoclines, pending = {}, []
+    for target in targets:
+        path = isocline_cache_path(resolution, target, tolerance, cache_root) if use_cache else None
+        if path is not None and path.exists():
+            with np.load(path) as cached:
+                isoclines[target] = Isocline(target, tolerance, cached["cells"], cached["D"],
+                                             int(cached["n_total"]))
+            reused.append(f"isocline D={target:g}")
+        else:
+            pending.append(target)
+            computed.append(f"isocline D={target:g}")
+    if pending:
+        reductions.append(IsoclineCollector(pending, tolerance))
+
+    reductions = run_sweep(grid, *reductions, n_workers=n_workers)
+    reductions = reductions if isinstance(reductions, tuple) else (reductions,)
+    summary = reductions[0]
+
+    if store is not None:
+        store.flush()
+        os.replace(store.path, density_path)
+        grid = GridSweep(resolution, chunk_size, density_path)
+    if pending:
+        for target, iso in reductions[-1].isoclines().items():
+            isoclines[target] = iso
+            if use_cache:
+                path = isocline_cache_path(resolution, target, tolerance, cache_root)
+                tmp = path.with_suffix(".partial.npz")
+                np.savez_compressed(tmp, cells=iso.cells, D=iso.D, n_total=iso.n_total)
+                os.replace(tmp, path)
+
+    return SweepReport(grid, summary, {t: isoclines[t] for t in targets},
+                       tuple(reused), tuple(computed))
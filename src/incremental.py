@@ -0,0 +1,231 @@
+"""
+Incremental Module - Conduit Engine v0.3
+
+Dependency tracking between calibrated states and derived artifacts.
+
+Editing one create_grounded_state(...) entry should not trigger a rerun
+of everything downstream. Each derived artifact declares the calibrated
+states it reads:
+- density/<state>: D and overall confidence of one state
+- export/<state>: the state's entry in the grounded-states JSON export
+- validation/<check>: one density_models.VALIDATION_CHECKS benchmark
+
+An artifact's cache key hashes its name, its version and the
+fingerprints (hashes of to_dict()) of exactly those states. Versions
+combine FORMULA_VERSION with the version of the code that builds the
+record (DENSITY_RECORD_VERSION, EXPORT_RECORD_VERSION or the check's
+ValidationCheck.version), so editing that code invalidates its results. After a
+calibration change, only artifacts that read a changed state miss the
+cache; everything else is reused. Results are kept in memory for the
+process and, as JSON, under CACHE_DIR/calibration_artifacts/, so reuse
+also works across runs.
+
+Downstream code can pass extra Artifacts (e.g. per-state seeding
+records) to refresh_calibration to have them tracked the same way.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .cache import cache_key, cache_path
+from .calibration_registry import calibration_registry, mapping_functions
+from .density_models import (
+    FORMULA_VERSION,
+    VALIDATION_CHECKS,
+    run_validation_check,
+    summarize_validation,
+)
+
+
+CACHE_NAMESPACE = "calibration_artifacts"
+
+# Bump when _density_record / _export_record change
+DENSITY_RECORD_VERSION = "1"
+EXPORT_RECORD_VERSION = "1"
+
+
+@dataclass(frozen=True)
+class Artifact:
+    """
+    A derived product of some calibrated states.
+
+    Attributes:
+        name: Unique name, e.g. "density/wakefulness"
+        states: Calibrated states the artifact reads
+        compute: Called with a mapping of just those states; must return a
+            JSON-serializable value (results are returned as JSON types)
+        version: Bump when compute changes, to invalidate cached results
+    """
+    name: str
+    states: Tuple[str, ...]
+    compute: Callable[[Mapping[str, Any]], Any]
+    version: str = "1"
+
+
+@dataclass
+class BuildReport:
+    """Outcome of refresh_calibration."""
+    results: Dict[str, Any]
+    recomputed: Tuple[str, ...]
+    reused: Tuple[str, ...]
+    changed_states: Tuple[str, ...]           # since the previous refresh in this process
+    fingerprints: Dict[str, str] = field(repr=False, default_factory=dict)
+
+    def select(self, prefix: str) -> Dict[str, Any]:
+        """Results under one prefix, keyed by the rest of the name."""
+        start = len(prefix) + 1
+        return {name[start:]: value for name, value in self.results.items()
+                if name.startswith(prefix + "/")}
+
+
+def state_fingerprint(state) -> str:
+    """Hash of everything a GroundedState exports."""
+    return cache_key(state=state.to_dict())
+
+
+def _density_record(states: Mapping[str, Any]) -> Dict:
+    (state,) = states.values()
+    return {"D": state.density(), "confidence": state.overall_confidence().value}
+
+
+def _export_record(states: Mapping[str, Any]) -> Dict:
+    (state,) = states.values()
+    return state.to_dict()
+
+
+def _validation_compute(check: str) -> Callable[[Mapping[str, Any]], Dict]:
+    def compute(states: Mapping[str, Any]) -> Dict:
+        return run_validation_check(check, {name: s.density() for name, s in states.items()})
+    return compute
+
+
+def calibration_artifacts(states: Mapping[str, Any]) -> List[Artifact]:
+    """Densities, export entries and validation checks for a calibration table."""
+    artifacts = []
+    for name in states:
+        artifacts.append(Artifact(f"density/{name}", (name,), _density_record,
+                                  f"{FORMULA_VERSION}/{DENSITY_RECORD_VERSION}"))
+        artifacts.append(Artifact(f"export/{name}", (name,), _export_record,
+                                  f"{FORMULA_VERSION}/{EXPORT_RECORD_VERSION}"))
+    for check_name, check in VALIDATION_CHECKS.items():
+        if all(s in states for s in check.states):
+            artifacts.append(Artifact(f"validation/{check_name}", check.states,
+                                      _validation_compute(check_name),
+                                      f"{FORMULA_VERSION}/{check.version}"))
+    return artifacts
+
+
+def dependents(artifacts: Sequence[Artifact]) -> Dict[str, Tuple[str, ...]]:
+    """Reverse index: state name → names of the artifacts that read it."""
+    index: Dict[str, List[str]] = {}
+    for artifact in artifacts:
+        for state in artifact.states:
+            index.setdefault(state, []).append(artifact.name)
+    return {state: tuple(names) for state, names in index.items()}
+
+
+# Process-wide memory layer over the on-disk store, and the fingerprints
+# seen by the last refresh (for change reporting)
+_MEMORY: Dict[str, Any] = {}
+_LAST_FINGERPRINTS: Dict[str, str] = {}
+
+
+def clear_artifact_cache() -> None:
+    """Drop in-memory artifacts and change history (on-disk entries remain)."""
+    _MEMORY.clear()
+    _LAST_FINGERPRINTS.clear()
+
+
+def refresh_calibration(
+    states: Optional[Mapping[str, Any]] = None,
+    extra_artifacts: Sequence[Artifact] = (),
+    use_cache: bool = True,
+    cache_root: Optional[Path] = None,
+) -> BuildReport:
+    """
+    Bring every calibration-derived artifact up to date.
+
+    Parameters:
+        states: Name → GroundedState (default: the calibration registry,
+            which itself reloads when the calibration files change)
+        extra_artifacts: Additional artifacts to track
+        use_cache: Reuse (and store) results keyed by input fingerprints
+        cache_root: Override the cache directory
+
+    Returns:
+        BuildReport with every artifact's value and what was recomputed
+    """
+    states = calibration_registry() if states is None else states
+    artifacts = calibration_artifacts(states) + list(extra_artifacts)
+    fingerprints = {name: state_fingerprint(state) for name, state in states.items()}
+
+    changed = tuple(name for name, fp in fingerprints.items()
+                    if _LAST_FINGERPRINTS.get(name) != fp)
+    _LAST_FINGERPRINTS.clear()
+    _LAST_FINGERPRINTS.update(fingerprints)
+
+    results: Dict[str, Any] = {}
+    recomputed: List[str] = []
+    reused: List[str] = []
+    for artifact in artifacts:
+        missing = [s for s in artifact.states if s not in states]
+        if missing:
+            raise ValueError(f"Artifact '{artifact.name}' reads unknown states {missing}")
+        key = cache_key(artifact=artifact.name, version=artifact.version,
+                        inputs=[fingerprints[s] for s in artifact.states])
+        if use_cache and key in _MEMORY:
+            results[artifact.name] = _MEMORY[key]
+            reused.append(artifact.name)
+            continue
+        path = cache_path(CACHE_NAMESPACE, key, ".json", cache_root) if use_cache else None
+        if path is not None and path.exists():
+            value = json.loads(path.read_text())
+            reused.append(artifact.name)
+        else:
+            # Normalized through JSON so fresh and stored results look alike
+            blob = json.dumps(artifact.compute({s: states[s] for s in artifact.states}))
+            value = json.loads(blob)
+            recomputed.append(artifact.name)
+            if path is not None:
+                tmp = path.with_suffix(".partial.json")
+                tmp.write_text(blob)
+                os.replace(tmp, path)
+        if use_cache:
+            _MEMORY[key] = value
+        results[artifact.name] = value
+
+    return BuildReport(results, tuple(recomputed), tuple(reused), changed, fingerprints)
+
+
+def validation_report(report: BuildReport) -> Dict[str, Dict]:
+    """run_validation_suite-shaped results from a refresh."""
+    results = report.select("validation")
+    results["_overall"] = summarize_validation(results)
+    return results
+
+
+def export_grounded_states(report: BuildReport, output_path: Optional[str] = None) -> str:
+    """
+    Grounded-states JSON export assembled from cached per-state entries.
+
+    Produces the same document as mapping_functions.export_grounded_states_json.
+    The file is only rewritten when its content changes, so file-watching
+    consumers (the website build) see no spurious updates.
+    """
+    output = {
+        "metadata": mapping_functions.EXPORT_METADATA,
+        "states": report.select("export"),
+    }
+    json_str = json.dumps(output, indent=2)
+
+    if output_path:
+        path = Path(output_path)
+        if not path.exists() or path.read_text() != json_str:
+            tmp = path.with_suffix(".partial.json")
+            tmp.write_text(json_str)
+            os.replace(tmp, path)
+
+    return json_str
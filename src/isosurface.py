@@ -0,0 +1,416 @@
+"""
+Isosurface Module - Conduit Engine v0.3
+
+Points and slice meshes on the level set D = c.
+
+The level set is a 4D hypersurface in [0, 1]^5. D is linear in φ, so the
+surface is the graph φ = c / Q(τ, ρ, H, κ), with Q = τρ · G, wherever
+that value lies in the φ range. trace_isosurface() refines cells of the
+(τ, ρ, H, κ) domain adaptively:
+- cells the surface does not pass over are dropped, using the exact φ
+  range from threshold_regions.phi_cuts;
+- a cell is split while its patch is wider than `spacing`;
+- a cell is also split while the surface at its corners departs from the
+  tangent plane at its centre by more than flatness × spacing. Curved
+  parts and the edges of the surface therefore get more points.
+Each final cell contributes one point on the surface. It is the centre
+of the cell lifted to the graph, or, where the graph leaves the φ range
+over the centre, a root of Q = c / φ found by bisection along the
+segment between the smallest and largest Q in the cell. The cost scales
+with the surface area divided by spacing^4, not with resolution^5.
+
+trace_slice() fixes all but two or three invariants. It extracts the
+level set of that slice as a line mesh (2D) or a triangle mesh (3D) by
+marching simplices over a grid of the free axes. Vertices are roots of
+D - c on grid edges, located by bisection and shared between faces.
+"""
+
+import itertools
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .batch_operators import INVARIANTS, density_batch
+from .density_distribution import Box, box_bounds
+from .threshold_regions import phi_cuts
+
+
+BISECTION_STEPS = 60
+
+# Corner offsets of a (τ, ρ, H, κ) cell
+_CORNERS = np.array(list(itertools.product((0.0, 1.0), repeat=4)))
+
+
+def _gate(s, kappa):
+    return 1.0 - s + s * s * kappa
+
+
+def _structure(x: np.ndarray) -> np.ndarray:
+    """Q = τρ · G for (..., 4) points in (τ, ρ, H, κ)."""
+    return x[..., 0] * x[..., 1] * _gate(np.sqrt(x[..., 2]), x[..., 3])
+
+
+def _surface_phi(level: float, x: np.ndarray) -> np.ndarray:
+    """φ on the surface above (τ, ρ, H, κ) points; inf where Q = 0."""
+    with np.errstate(divide="ignore"):
+        return level / _structure(x)
+
+
+def _phi_slope(phi: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """∂φ/∂(τ, ρ, H, κ) of the graph φ = c / Q at (..., 4) points."""
+    tau, rho, H, kappa = np.moveaxis(x, -1, 0)
+    s = np.maximum(np.sqrt(H), 1e-12)
+    gate = _gate(s, kappa)
+    return -phi[..., None] * np.stack(
+        [1.0 / tau, 1.0 / rho, (kappa - 0.5 / s) / gate, H / gate], axis=-1)
+
+
+def density_gradient(states: np.ndarray) -> np.ndarray:
+    """
+    ∇D for every row of an (N, 5) state array.
+
+    ∂D/∂H = φτρ(κ - 1 / (2√H)) diverges at H = 0; √H is floored at 1e-12
+    there, so the gradient points along -H.
+    """
+    phi, tau, rho, H, kappa = np.moveaxis(np.asarray(states, dtype=float), -1, 0)
+    s = np.maximum(np.sqrt(H), 1e-12)
+    gate = _gate(s, kappa)
+    product = phi * tau * rho
+    return np.stack([tau * rho * gate, phi * rho * gate, phi * tau * gate,
+                     product * (kappa - 0.5 / s), product * H], axis=-1)
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(norm > 0, vectors / norm, 0.0)
+
+
+# ---------------------------------------------------------------------------
+# Point clouds
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SurfacePoints:
+    """Points on the level set D = level, one per refined cell."""
+    level: float
+    points: np.ndarray            # (n, 5) states in INVARIANTS order
+    normals: np.ndarray           # (n, 5) unit ∇D
+    cell_size: np.ndarray         # (n,) largest lifted width of the cell each point stands for
+    complete: bool                # False if max_points stopped refinement early
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the point cloud as .csv (one row per point) or .npz."""
+        path = Path(path)
+        if path.suffix == ".csv":
+            header = ",".join(list(INVARIANTS) + [f"n_{name}" for name in INVARIANTS]
+                              + ["cell_size"])
+            np.savetxt(path, np.column_stack([self.points, self.normals, self.cell_size]),
+                       delimiter=",", header=header, comments="")
+        elif path.suffix == ".npz":
+            np.savez_compressed(path, level=self.level, points=self.points,
+                                normals=self.normals, cell_size=self.cell_size)
+        else:
+            raise ValueError(f"Unsupported point cloud format {path.suffix!r}; use .csv or .npz")
+        return path
+
+
+def _cell_metrics(level: float, cells: np.ndarray, phi: np.ndarray):
+    """
+    Patch size, tangent-plane deviation and per-axis lifted width.
+
+    The lifted width along an axis is the cell width combined with the
+    rise of the surface across it; the patch size is the largest of them,
+    i.e. the distance to the neighbouring point along the coarsest axis.
+    """
+    cut_lo, cut_hi = phi_cuts(level, cells, phi)
+    rise = cut_hi - cut_lo
+    width = cells[..., 1] - cells[..., 0]
+    centre = cells.mean(axis=-1)
+    phi_c = _surface_phi(level, centre)
+    slope = _phi_slope(phi_c, centre)
+
+    corners = cells[:, None, :, 0] + _CORNERS * width[:, None, :]
+    actual = np.clip(_surface_phi(level, corners), phi[0], phi[1])
+    tangent = phi_c[:, None] + ((corners - centre[:, None, :]) * slope[:, None, :]).sum(axis=-1)
+    deviation = np.abs(actual - np.clip(tangent, phi[0], phi[1])).max(axis=1)
+
+    lifted = np.hypot(width, np.minimum(np.abs(slope) * width, rise[:, None]))
+    return lifted.max(axis=1), deviation, lifted
+
+
+def _halve(cells: np.ndarray, axis: np.ndarray) -> np.ndarray:
+    rows = np.arange(len(cells))
+    middle = 0.5 * (cells[rows, axis, 0] + cells[rows, axis, 1])
+    low, high = cells.copy(), cells.copy()
+    low[rows, axis, 1] = middle
+    high[rows, axis, 0] = middle
+    return np.concatenate([low, high])
+
+
+def _structure_extremes(cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Points of smallest and largest Q in each (τ, ρ, H, κ) cell."""
+    s = np.sqrt(cells[:, 2])                                     # (n, 2)
+    k_lo, k_hi = cells[:, 3, 0], cells[:, 3, 1]
+    with np.errstate(divide="ignore"):
+        vertex = np.clip(0.5 / k_lo, s[:, 0], s[:, 1])           # gate is convex in s
+    candidates = np.column_stack([s, vertex])
+    s_min = candidates[np.arange(len(cells)), np.argmin(_gate(candidates, k_lo[:, None]), axis=1)]
+    s_max = np.where(_gate(s[:, 0], k_hi) >= _gate(s[:, 1], k_hi), s[:, 0], s[:, 1])
+
+    # Squaring √H can round outside the cell
+    H_min = np.clip(s_min ** 2, cells[:, 2, 0], cells[:, 2, 1])
+    H_max = np.clip(s_max ** 2, cells[:, 2, 0], cells[:, 2, 1])
+    low = np.column_stack([cells[:, 0, 0], cells[:, 1, 0], H_min, k_lo])
+    high = np.column_stack([cells[:, 0, 1], cells[:, 1, 1], H_max, k_hi])
+    return low, high
+
+
+def _lift(level: float, cells: np.ndarray, phi: np.ndarray) -> np.ndarray:
+    """One point on the surface over each cell, as (n, 5) states."""
+    x = cells.mean(axis=-1)
+    centre_phi = _surface_phi(level, x)
+    target = np.clip(centre_phi, phi[0], phi[1])
+    off = np.flatnonzero(target != centre_phi)
+
+    # The graph leaves the φ range over the centre: bisect for Q = c / φ
+    # between the smallest and largest Q in the cell
+    low, high = _structure_extremes(cells[off])
+    goal = level / target[off]
+    t_lo, t_hi = np.zeros(len(off)), np.ones(len(off))
+    for _ in range(BISECTION_STEPS):
+        mid = 0.5 * (t_lo + t_hi)
+        below = _structure(low + mid[:, None] * (high - low)) < goal
+        t_lo = np.where(below, mid, t_lo)
+        t_hi = np.where(below, t_hi, mid)
+    x[off] = low + t_hi[:, None] * (high - low)
+
+    phi_value = np.clip(_surface_phi(level, x), phi[0], phi[1])
+    return np.column_stack([phi_value, x])
+
+
+def trace_isosurface(
+    level: float,
+    spacing: float = 0.1,
+    box: Box = None,
+    flatness: float = 0.25,
+    max_points: int = 500_000,
+) -> SurfacePoints:
+    """
+    Sample the level set D = level with roughly uniform spacing.
+
+    Parameters:
+        level: D value c of the surface (> 0)
+        spacing: Target distance between neighbouring points
+        box: None for [0, 1]^5, a dict {invariant: (low, high)} for a
+            sub-box (other axes span [0, 1]), or a (5, 2) bounds array
+        flatness: Largest allowed deviation from the tangent plane within
+            a cell, as a fraction of spacing
+        max_points: Cell budget; the largest cells are refined first
+
+    Returns:
+        SurfacePoints
+    """
+    if level <= 0:
+        raise ValueError(f"level must be positive, got {level}")
+    if spacing <= 0 or flatness <= 0:
+        raise ValueError("spacing and flatness must be positive")
+    if max_points < 1:
+        raise ValueError(f"max_points must be positive, got {max_points}")
+    bounds = box_bounds(box)
+    phi = bounds[0]
+
+    cells = bounds[None, 1:].copy()
+    final = []
+    n_final = 0
+    complete = True
+    while len(cells):
+        cut_lo, cut_hi = phi_cuts(level, cells, phi)
+        cells = cells[cut_hi > cut_lo]
+        size, deviation, lifted = _cell_metrics(level, cells, phi)
+        split = (size > spacing) | (deviation > flatness * spacing)
+
+        final.append(cells[~split])
+        n_final += int((~split).sum())
+        cells, size, lifted = cells[split], size[split], lifted[split]
+
+        # Each split adds at most one cell; largest cells first
+        n_split = min(len(cells), max_points - n_final - len(cells))
+        if n_split < len(cells):
+            complete = False
+            order = np.argsort(-size, kind="stable")
+            rest = cells[order[max(n_split, 0):]]
+            final.append(rest)
+            n_final += len(rest)
+            if n_split <= 0:
+                break
+            cells, lifted = cells[order[:n_split]], lifted[order[:n_split]]
+        cells = _halve(cells, np.argmax(lifted, axis=1))
+
+    cells = np.concatenate(final) if final else np.empty((0, 4, 2))
+    points = _lift(level, cells, phi)
+    size, _, _ = _cell_metrics(level, cells, phi)
+    return SurfacePoints(
+        level=float(level),
+        points=points,
+        normals=_unit(density_gradient(points)),
+        cell_size=size,
+        complete=complete,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Slice meshes
+# ---------------------------------------------------------------------------
+
+def _face_table(k: int) -> Dict[int, Tuple[Tuple[Tuple[int, int], ...], ...]]:
+    """
+    Faces of the level set inside a k-simplex for every sign pattern.
+
+    Keys are bit patterns of which vertices have D >= c. Values are faces,
+    each a tuple of k edges (pairs of local vertices) carrying its corners.
+    """
+    table = {}
+    for pattern in range(1, 2 ** (k + 1) - 1):
+        inside = [v for v in range(k + 1) if pattern >> v & 1]
+        outside = [v for v in range(k + 1) if not pattern >> v & 1]
+        if len(inside) == 1 or len(outside) == 1:
+            lone, rest = (inside, outside) if len(inside) == 1 else (outside, inside)
+            table[pattern] = (tuple((lone[0], v) for v in rest),)
+        else:                                                    # k = 3, two and two
+            (a, b), (c, d) = inside, outside
+            table[pattern] = (((a, c), (a, d), (b, d)), ((a, c), (b, d), (b, c)))
+    return table
+
+
+_FACE_TABLES = {2: _face_table(2), 3: _face_table(3)}
+
+
+def _slice_states(free: Tuple[str, ...], fixed: Dict[str, float], coords: np.ndarray) -> np.ndarray:
+    """(n, 5) states from coordinates along the free invariants and fixed values."""
+    states = np.empty((len(coords), len(INVARIANTS)))
+    for name, value in fixed.items():
+        states[:, INVARIANTS.index(name)] = value
+    for j, name in enumerate(free):
+        states[:, INVARIANTS.index(name)] = coords[:, j]
+    return states
+
+
+@dataclass
+class SliceMesh:
+    """Level set D = level within a 2D or 3D slice of the invariant space."""
+    level: float
+    free: Tuple[str, ...]         # invariants spanning the slice
+    fixed: Dict[str, float]       # values of the other invariants
+    vertices: np.ndarray          # (n, k) coordinates along `free`
+    faces: np.ndarray             # (m, k) vertex indices: segments (k=2) or triangles (k=3)
+
+    def states(self) -> np.ndarray:
+        """(n, 5) full states of the vertices, in INVARIANTS order."""
+        return _slice_states(self.free, self.fixed, self.vertices)
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the mesh as Wavefront .obj (lines or triangles) or .npz."""
+        path = Path(path)
+        if path.suffix == ".obj":
+            coords = np.column_stack([self.vertices, np.zeros((len(self.vertices), 3 - len(self.free)))])
+            kind = "l" if len(self.free) == 2 else "f"
+            with open(path, "w") as f:
+                f.write(f"# D = {self.level} over ({', '.join(self.free)}); fixed {self.fixed}\n")
+                f.writelines(f"v {x:.9g} {y:.9g} {z:.9g}\n" for x, y, z in coords)
+                f.writelines(f"{kind} " + " ".join(str(i + 1) for i in face) + "\n"
+                             for face in self.faces)
+        elif path.suffix == ".npz":
+            np.savez_compressed(path, level=self.level, free=np.array(self.free),
+                                vertices=self.vertices, faces=self.faces)
+        else:
+            raise ValueError(f"Unsupported mesh format {path.suffix!r}; use .obj or .npz")
+        return path
+
+
+def trace_slice(
+    level: float,
+    free: Sequence[str] = ("H", "kappa"),
+    fixed: Optional[Dict[str, float]] = None,
+    spacing: float = 0.02,
+    box: Box = None,
+) -> SliceMesh:
+    """
+    Mesh of the level set D = level in a 2D or 3D slice.
+
+    Parameters:
+        level: D value c
+        free: Two or three invariants spanning the slice
+        fixed: Values of every other invariant
+        spacing: Grid spacing along the free axes
+        box: Ranges of the free axes (same forms as threshold_regions;
+            entries for fixed invariants are ignored)
+
+    Returns:
+        SliceMesh
+    """
+    free = tuple(free)
+    fixed = dict(fixed or {})
+    k = len(free)
+    if k not in (2, 3) or len(set(free)) != k:
+        raise ValueError(f"Slices need two or three distinct free invariants, got {free}")
+    unknown = (set(free) | set(fixed)) - set(INVARIANTS)
+    if unknown:
+        raise ValueError(f"Unknown invariants {sorted(unknown)}. Available: {list(INVARIANTS)}")
+    missing = set(INVARIANTS) - set(free) - set(fixed)
+    if missing or set(free) & set(fixed):
+        raise ValueError(f"Give a fixed value for exactly the invariants not in {free}")
+    if spacing <= 0:
+        raise ValueError(f"spacing must be positive, got {spacing}")
+
+    bounds = box_bounds(box)[[INVARIANTS.index(name) for name in free]]
+    axes = [np.linspace(lo, hi, max(2, int(np.ceil((hi - lo) / spacing)) + 1)) for lo, hi in bounds]
+    shape = tuple(len(axis) for axis in axes)
+    nodes = np.stack([g.ravel() for g in np.meshgrid(*axes, indexing="ij")], axis=-1)
+    inside = density_batch(_slice_states(free, fixed, nodes)) >= level
+
+    # Freudenthal split of every grid cube into k! simplices
+    bases = np.stack([g.ravel() for g in np.meshgrid(*[np.arange(n - 1) for n in shape],
+                                                     indexing="ij")], axis=-1)
+    simplices = []
+    for order in itertools.permutations(range(k)):
+        corner = np.zeros(k, np.int64)
+        ids = [np.ravel_multi_index(bases.T, shape)]
+        for axis in order:
+            corner[axis] = 1
+            ids.append(np.ravel_multi_index((bases + corner).T, shape))
+        simplices.append(np.stack(ids, axis=1))
+    simplices = np.concatenate(simplices)
+    pattern = (inside[simplices].astype(np.int64) << np.arange(k + 1)).sum(axis=1)
+
+    # Each face corner is a grid edge, keyed so shared edges share a vertex
+    keys = []
+    for code, faces in _FACE_TABLES[k].items():
+        rows = simplices[pattern == code]
+        for face in faces:
+            a = np.stack([rows[:, u] for u, _ in face], axis=1)
+            b = np.stack([rows[:, v] for _, v in face], axis=1)
+            keys.append(np.minimum(a, b) * len(nodes) + np.maximum(a, b))
+    keys = np.concatenate(keys) if keys else np.empty((0, k), np.int64)
+    edges, faces = np.unique(keys, return_inverse=True)
+    faces = faces.reshape(-1, k)
+
+    # Bisection on D - c along each edge, from the node inside the set
+    start, stop = np.divmod(edges, len(nodes))
+    flip = ~inside[start]
+    start, stop = np.where(flip, stop, start), np.where(flip, start, stop)
+    a, b = nodes[start], nodes[stop]
+    t_in, t_out = np.zeros(len(edges)), np.ones(len(edges))
+    for _ in range(BISECTION_STEPS):
+        mid = 0.5 * (t_in + t_out)
+        above = density_batch(_slice_states(free, fixed, a + mid[:, None] * (b - a))) >= level
+        t_in = np.where(above, mid, t_in)
+        t_out = np.where(above, t_out, mid)
+
+    vertices = a + (0.5 * (t_in + t_out))[:, None] * (b - a)
+    return SliceMesh(float(level), free, fixed, vertices, faces)
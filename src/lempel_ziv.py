@@ -0,0 +1,309 @@
+"""
+Lempel-Ziv Module - Conduit Engine v0.3
+
+LZ76 complexity of binarized multichannel signals, the empirical source
+of H (Schartner et al., 2015, 2017).
+
+Pipeline:
+1. Binarize each channel, either at its median or at the mean of its
+   Hilbert amplitude envelope (Schartner's choice).
+2. Count LZ76 phrases: the exhaustive-history parsing of Lempel & Ziv
+   (1976) as computed by Kaspar & Schuster (1987).
+3. Normalize by the complexity of a shuffled copy (or by n / log2 n).
+4. Map the normalized complexity to H with lzc_to_H, or its change
+   from a baseline recording with lzc_percent_change_to_H.
+
+Phrases are found with an online suffix automaton. That takes O(n) time
+per window, where the usual Kaspar-Schuster scan degrades to O(n²) on
+regular signals.
+
+Long recordings (including np.memmap arrays) are streamed as sliding
+windows. Each window is a view, so only one window is binarized at a
+time. Channels are spread over worker processes.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+try:
+    from .calibration_registry import CALIBRATION_AVAILABLE, mapping_functions
+except ImportError:
+    CALIBRATION_AVAILABLE = False
+
+
+BINARIZATION_METHODS = ("median", "hilbert")
+NORMALIZATIONS = ("shuffle", "log", None)
+
+
+# =============================================================================
+# Binarization
+# =============================================================================
+
+def analytic_amplitude(signal: np.ndarray, axis: int = -1) -> np.ndarray:
+    """
+    Amplitude envelope |x + i·Hilbert(x)| computed with the FFT.
+
+    Parameters:
+        signal: Real-valued signal(s)
+        axis: Time axis
+
+    Returns:
+        Envelope with the same shape as signal
+    """
+    x = np.asarray(signal, dtype=float)
+    n = x.shape[axis]
+    spectrum = np.fft.fft(x, axis=axis)
+    gain = np.zeros(n)
+    gain[0] = 1.0
+    if n % 2 == 0:
+        gain[n // 2] = 1.0
+        gain[1:n // 2] = 2.0
+    else:
+        gain[1:(n + 1) // 2] = 2.0
+    shape = [1] * x.ndim
+    shape[axis] = n
+    return np.abs(np.fft.ifft(spectrum * gain.reshape(shape), axis=axis))
+
+
+def binarize(signal: np.ndarray, method: str = "hilbert", axis: int = -1) -> np.ndarray:
+    """
+    Binarize signal(s) along the time axis.
+
+    Parameters:
+        signal: Real-valued signal(s)
+        method: 'median' (signal above its median) or 'hilbert'
+            (amplitude envelope above its mean)
+        axis: Time axis
+
+    Returns:
+        uint8 array of 0/1 with the same shape as signal
+    """
+    x = np.asarray(signal, dtype=float)
+    if method == "median":
+        reference = x
+        threshold = np.median(x, axis=axis, keepdims=True)
+    elif method == "hilbert":
+        reference = analytic_amplitude(x, axis=axis)
+        threshold = reference.mean(axis=axis, keepdims=True)
+    else:
+        raise ValueError(f"Unknown binarization '{method}'. Available: {list(BINARIZATION_METHODS)}")
+    return (reference > threshold).view(np.uint8)
+
+
+# =============================================================================
+# LZ76 complexity
+# =============================================================================
+
+def _symbols(sequence) -> memoryview:
+    """Byte view of a symbol sequence; uint8 arrays and buffers are not copied."""
+    if isinstance(sequence, (bytes, bytearray, memoryview)):
+        return memoryview(sequence).cast("B")
+    arr = np.asarray(sequence)
+    if arr.ndim != 1:
+        raise ValueError(f"Expected a 1-D symbol sequence, got shape {arr.shape}")
+    if arr.dtype == np.bool_:
+        arr = arr.view(np.uint8)
+    elif arr.dtype != np.uint8:
+        if arr.size and (arr.min() < 0 or arr.max() > 255 or np.any(arr != np.round(arr))):
+            raise ValueError("Symbols must be integers in [0, 255]")
+        arr = arr.astype(np.uint8)
+    return memoryview(np.ascontiguousarray(arr))
+
+
+def lz76_complexity(sequence) -> int:
+    """
+    Number of phrases in the LZ76 parsing of a symbol sequence.
+
+    Each phrase is the shortest substring starting at the current position
+    that does not occur earlier. Earlier occurrences may overlap the phrase,
+    as in Kaspar & Schuster (1987). A final, incomplete phrase also counts.
+
+    Parameters:
+        sequence: 1-D array or buffer of small integer symbols (0/1 for
+            binarized signals)
+
+    Returns:
+        Complexity c(n)
+
+    Example:
+        >>> lz76_complexity([0, 0, 0, 1, 1, 0, 1, 0, 0, 1, 0, 0, 0, 1, 0, 1])
+        6
+    """
+    s = _symbols(sequence)
+    n = len(s)
+
+    # Suffix automaton of s[:built], grown only as far as the match needs
+    length = [0]
+    link = [-1]
+    trans = [{}]
+    last = 0
+    built = 0
+
+    complexity = 0
+    i = 0
+    while i < n:
+        # Longest l with s[i:i+l] occurring in s[:i+l-1]; (v, l) is its state
+        v, l = 0, 0
+        while True:
+            while built < i + l:
+                c = s[built]
+                built += 1
+                cur = len(length)
+                length.append(length[last] + 1)
+                link.append(-1)
+                trans.append({})
+                p = last
+                while p != -1 and c not in trans[p]:
+                    trans[p][c] = cur
+                    p = link[p]
+                if p == -1:
+                    link[cur] = 0
+                else:
+                    q = trans[p][c]
+                    if length[p] + 1 == length[q]:
+                        link[cur] = q
+                    else:
+                        clone = len(length)
+                        length.append(length[p] + 1)
+                        link.append(link[q])
+                        trans.append(dict(trans[q]))
+                        while p != -1 and trans[p].get(c) == q:
+                            trans[p][c] = clone
+                            p = link[p]
+                        link[q] = link[cur] = clone
+                        # The match's shorter strings may move to the clone
+                        if v == q and l <= length[clone]:
+                            v = clone
+                last = cur
+            if i + l == n:
+                break
+            nxt = trans[v].get(s[i + l])
+            if nxt is None:
+                l += 1
+                break
+            v = nxt
+            l += 1
+        complexity += 1
+        i += l
+    return complexity
+
+
+def normalized_lz76(sequence, normalization: Optional[str] = "shuffle",
+                    seed: int = 0) -> float:
+    """
+    Normalized LZ76 complexity of one symbol sequence.
+
+    Parameters:
+        sequence: 1-D symbol sequence
+        normalization: 'shuffle' divides by the complexity of a random
+            permutation of the sequence (Schartner et al.), 'log'
+            by n / log2(n), None returns the raw phrase count
+        seed: Seed for the shuffle
+
+    Returns:
+        Normalized complexity (about 1 for white noise under 'shuffle')
+    """
+    c = lz76_complexity(sequence)
+    n = len(_symbols(sequence))
+    if normalization is None:
+        return float(c)
+    if normalization == "log":
+        return c * math.log2(n) / n if n > 1 else float(c)
+    if normalization == "shuffle":
+        shuffled = np.random.default_rng(seed).permutation(np.asarray(_symbols(sequence)))
+        return c / lz76_complexity(shuffled)
+    raise ValueError(f"Unknown normalization '{normalization}'. Available: {list(NORMALIZATIONS)}")
+
+
+# =============================================================================
+# Multichannel and sliding-window estimation
+# =============================================================================
+
+def _channel_task(args) -> np.ndarray:
+    """Normalized complexity of every window of one channel."""
+    signal, window, step, method, normalization, seed = args
+    windows = np.lib.stride_tricks.sliding_window_view(signal, window)[::step]
+    out = np.empty(len(windows))
+    for k, w in enumerate(windows):
+        out[k] = normalized_lz76(binarize(w, method), normalization, seed + k)
+    return out
+
+
+def lz_complexity(
+    signals: np.ndarray,
+    window: Optional[int] = None,
+    step: Optional[int] = None,
+    method: str = "hilbert",
+    normalization: Optional[str] = "shuffle",
+    n_workers: int = 1,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Normalized LZ76 complexity per channel and window.
+
+    Parameters:
+        signals: (n_samples,) or (n_channels, n_samples) recording; may be
+            an np.memmap, windows are views into it
+        window: Window length in samples (default: the whole recording)
+        step: Hop between windows (default: window, i.e. no overlap)
+        method: Binarization, 'hilbert' or 'median' (applied per window)
+        normalization: 'shuffle', 'log' or None (see normalized_lz76)
+        n_workers: Worker processes; channels are distributed across them
+        seed: Seed for the shuffle surrogates
+
+    Returns:
+        (n_channels, n_windows) array, or (n_windows,) for a single channel
+    """
+    x = np.asarray(signals)
+    single = x.ndim == 1
+    x = np.atleast_2d(x)
+    if x.ndim != 2:
+        raise ValueError(f"Expected (n_channels, n_samples) signals, got shape {x.shape}")
+    n_samples = x.shape[1]
+    window = n_samples if window is None else int(window)
+    step = window if step is None else int(step)
+    if not 1 < window <= n_samples or step < 1:
+        raise ValueError(f"Invalid window/step ({window}, {step}) for {n_samples} samples")
+
+    tasks = [(x[ch], window, step, method, normalization, seed) for ch in range(len(x))]
+    n_workers = max(1, min(n_workers, len(tasks)))
+    if n_workers == 1:
+        result = [_channel_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            result = list(pool.map(_channel_task, tasks))
+    result = np.array(result)
+    return result[0] if single else result
+
+
+def estimate_H(
+    signals: np.ndarray,
+    baseline: Optional[np.ndarray] = None,
+    **kwargs,
+):
+    """
+    Estimate H from a recording via its LZ76 complexity.
+
+    Without a baseline, the mean normalized complexity (clipped to [0, 1])
+    goes through lzc_to_H. With a baseline recording of the same subject,
+    the percent change in mean complexity goes through
+    lzc_percent_change_to_H, which anchors waking at H = 0.50.
+
+    Parameters:
+        signals: Recording, as accepted by lz_complexity
+        baseline: Optional waking-baseline recording
+        **kwargs: Passed to lz_complexity (window, step, method, ...)
+
+    Returns:
+        CalibratedValue for H
+    """
+    if not CALIBRATION_AVAILABLE:
+        raise ValueError("Calibration library not available")
+    lzc = float(np.mean(lz_complexity(signals, **kwargs)))
+    if baseline is None:
+        return mapping_functions.lzc_to_H(min(max(lzc, 0.0), 1.0))
+    reference = float(np.mean(lz_complexity(baseline, **kwargs)))
+    return mapping_functions.lzc_percent_change_to_H(100.0 * (lzc / reference - 1.0))
@@ -0,0 +1,305 @@
+"""
+Markov Module - Conduit Engine v0.3
+
+Long-run behaviour of states under random operator perturbations.
+
+Each step of the random process picks an operator (uniformly, or with
+given weights) and draws its magnitude at random: U(-scale, scale) for
+the single-invariant operators in operators.py, U(0, scale) for the
+advanced operators. Applying this to every cell of the quantized grid
+(see reachability.StateGrid) and snapping the results gives a sparse
+row-stochastic transition matrix, stored in CSR format.
+
+From the matrix, sparse linear algebra (scipy.sparse) gives:
+- stationary (long-run) distributions
+- absorption probabilities into the "below threshold" region D < c
+- expected hitting times of that region
+
+Building the matrix is by far the most expensive step, so matrices are
+cached to disk keyed by grid resolution, operator set, magnitude scale,
+sample count, seed, chunk size (it fixes the order of the random draws)
+and formula version.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+try:
+    import scipy.sparse as sp
+    import scipy.sparse.csgraph as csgraph
+    import scipy.sparse.linalg as spla
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+from .encoder import StateVector
+from .batch_operators import BATCH_OPERATORS, density_batch, get_batch_operator
+from .cache import cache_key, cache_path
+from .density_models import FORMULA_VERSION
+from .reachability import StateGrid
+
+
+DEFAULT_OPERATORS = (
+    "perturb_binding",
+    "fracture_integration",
+    "stretch_temporal_depth",
+    "inject_entropy",
+    "modulate_coherence",
+)
+
+
+def _require_scipy():
+    if not SCIPY_AVAILABLE:
+        raise ImportError("scipy is required for sparse Markov models (pip install scipy)")
+
+
+def _solve(A, b: np.ndarray, tol: float = 1e-10) -> np.ndarray:
+    """
+    Solve the sparse system A x = b.
+
+    Small systems use a direct factorization. On larger 5D grids the LU
+    factors fill in badly, so BiCGSTAB is used instead; I - Q is an
+    M-matrix here, so it converges quickly.
+    """
+    if A.shape[0] <= 2000:
+        return spla.spsolve(A.tocsc(), b)
+    try:
+        x, info = spla.bicgstab(A.tocsr(), b, rtol=tol, atol=0.0, maxiter=10_000)
+    except TypeError:  # scipy < 1.12 names the tolerance `tol`
+        x, info = spla.bicgstab(A.tocsr(), b, tol=tol, atol=0.0, maxiter=10_000)
+    if info != 0:
+        raise RuntimeError(f"Sparse solve did not converge (info={info})")
+    return x
+
+
+@dataclass
+class MarkovModel:
+    """Sparse transition model over a quantized state grid."""
+    grid: StateGrid
+    matrix: "sp.csr_matrix"        # (n_cells, n_cells), rows sum to 1
+    operators: Dict[str, float]    # operator name → selection weight
+    magnitude_scale: float
+    n_samples: int
+
+    @property
+    def cell_density(self) -> np.ndarray:
+        return density_batch(self.grid.coords(np.arange(self.grid.n_cells)))
+
+    def below_threshold(self, threshold: float = 0.05) -> np.ndarray:
+        """Boolean mask of cells with D < threshold."""
+        return self.cell_density < threshold
+
+    def _cells_reaching(self, targets: np.ndarray,
+                        absorbing: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Cells with a positive-probability path into `targets` (including
+        targets), where paths stop at `absorbing` cells.
+        """
+        reach = targets.copy()
+        free = ~absorbing if absorbing is not None else np.ones_like(targets)
+        while True:
+            hit = (self.matrix @ reach.astype(float)) > 0
+            new = reach | (hit & free)
+            if new.sum() == reach.sum():
+                return new
+            reach = new
+
+    def _closed_classes(self):
+        """Strongly connected component labels and the labels of closed classes."""
+        n_comp, labels = csgraph.connected_components(self.matrix, directed=True,
+                                                      connection="strong")
+        coo = self.matrix.tocoo()
+        leaves = np.zeros(n_comp, dtype=bool)
+        crossing = labels[coo.row] != labels[coo.col]
+        leaves[labels[coo.row[crossing]]] = True
+        return labels, np.flatnonzero(~leaves)
+
+    def _class_stationary(self, members: np.ndarray, tol: float, max_iter: int) -> np.ndarray:
+        """Stationary distribution of the chain restricted to one closed class."""
+        idx = np.flatnonzero(members)
+        if len(idx) == 1:
+            return np.ones(1)
+        # Lazy chain (I + P) / 2 has the same stationary distribution and
+        # converges even when P is periodic.
+        pt = self.matrix[idx][:, idx].T.tocsr()
+        pi = np.full(len(idx), 1.0 / len(idx))
+        for _ in range(max_iter):
+            nxt = 0.5 * (pi + pt @ pi)
+            if np.abs(nxt - pi).sum() < tol:
+                return nxt
+            pi = nxt
+        return pi
+
+    def stationary_distribution(
+        self,
+        initial: Optional[Union[StateVector, np.ndarray]] = None,
+        tol: float = 1e-10,
+        max_iter: int = 10_000,
+    ) -> np.ndarray:
+        """
+        Long-run distribution over cells, starting from `initial`.
+
+        The chain is split into closed communicating classes. Each class
+        receives the mass already in it plus the mass absorbed into it from
+        transient cells (a sparse solve), spread by the class's own
+        stationary distribution (power iteration on the lazy chain).
+
+        Parameters:
+            initial: Starting state or distribution (default uniform). The
+                     chain need not be irreducible, so the limit can depend on it.
+            tol: L1 convergence tolerance for the within-class iteration
+            max_iter: Iteration cap for the within-class iteration
+
+        Returns:
+            Probability vector of length n_cells
+        """
+        _require_scipy()
+        n = self.grid.n_cells
+        if initial is None:
+            pi0 = np.full(n, 1.0 / n)
+        elif isinstance(initial, StateVector):
+            pi0 = np.zeros(n)
+            pi0[self.grid.cell_of(initial)] = 1.0
+        else:
+            pi0 = np.asarray(initial, dtype=float) / np.sum(initial)
+
+        labels, closed = self._closed_classes()
+        transient = ~np.isin(labels, closed)
+        t_idx = np.flatnonzero(transient)
+        if t_idx.size:
+            A = sp.identity(len(t_idx), format="csr") - self.matrix[t_idx][:, t_idx]
+            to_class = self.matrix[t_idx]
+
+        pi = np.zeros(n)
+        for c in closed:
+            members = labels == c
+            weight = pi0[members].sum()
+            if t_idx.size and pi0[t_idx].any():
+                r = np.asarray(to_class[:, np.flatnonzero(members)].sum(axis=1)).ravel()
+                if r.any():
+                    weight += pi0[t_idx] @ _solve(A, r)
+            if weight > 0:
+                pi[members] = weight * self._class_stationary(members, tol, max_iter)
+        return pi / pi.sum()
+
+    def absorption_probabilities(self, threshold: float = 0.05) -> np.ndarray:
+        """
+        Probability of ever entering D < threshold, from every cell.
+
+        Solves (I - Q) x = R·1 on the cells that can reach the region,
+        where Q is the transient block and R the transitions into it.
+        """
+        _require_scipy()
+        target = self.below_threshold(threshold)
+        x = target.astype(float)
+        solvable = self._cells_reaching(target) & ~target
+        idx = np.flatnonzero(solvable)
+        if idx.size:
+            Q = self.matrix[idx][:, idx]
+            r = np.asarray(self.matrix[idx][:, np.flatnonzero(target)].sum(axis=1)).ravel()
+            A = sp.identity(len(idx), format="csr") - Q
+            x[idx] = _solve(A, r)
+        return np.clip(x, 0.0, 1.0)
+
+    def expected_hitting_times(self, threshold: float = 0.05) -> np.ndarray:
+        """
+        Expected number of steps to first reach D < threshold, from every cell.
+
+        Cells that can avoid the region forever with positive probability
+        get an infinite hitting time. Elsewhere solves (I - Q) t = 1.
+        """
+        _require_scipy()
+        target = self.below_threshold(threshold)
+        reaching = self._cells_reaching(target)
+        escaping = self._cells_reaching(~reaching, absorbing=target)
+        certain = ~escaping & ~target
+
+        t = np.full(self.grid.n_cells, np.inf)
+        t[target] = 0.0
+        idx = np.flatnonzero(certain)
+        if idx.size:
+            Q = self.matrix[idx][:, idx]
+            A = sp.identity(len(idx), format="csr") - Q
+            t[idx] = _solve(A, np.ones(len(idx)))
+        return t
+
+    def at(self, values: np.ndarray, state: StateVector) -> float:
+        """Read a per-cell result (e.g. absorption probability) at a state."""
+        return float(values[self.grid.cell_of(state)])
+
+
+def build_markov_model(
+    resolution: int = 9,
+    operators: Union[Sequence[str], Dict[str, float]] = DEFAULT_OPERATORS,
+    magnitude_scale: float = 0.2,
+    n_samples: int = 16,
+    seed: int = 0,
+    chunk_size: int = 50_000,
+    use_cache: bool = True,
+    cache_root=None,
+) -> MarkovModel:
+    """
+    Build (or load from the disk cache) a sparse Markov transition model.
+
+    Parameters:
+        resolution: Grid points per axis (resolution^5 cells)
+        operators: Operator names, or name → selection weight
+        magnitude_scale: Width of the random magnitude distribution
+        n_samples: Monte Carlo draws per (cell, operator)
+        seed: Random seed for the magnitude draws
+        chunk_size: Cells processed per batch
+        use_cache: Load/save the matrix under the cache directory
+        cache_root: Override the cache directory
+
+    Returns:
+        MarkovModel with a CSR transition matrix
+    """
+    _require_scipy()
+    if not isinstance(operators, dict):
+        operators = {name: 1.0 for name in operators}
+    ops = {get_batch_operator(name).name: float(w) for name, w in operators.items()}
+    total = sum(ops.values())
+    if total <= 0:
+        raise ValueError("Operator weights must sum to a positive value")
+    ops = {name: w / total for name, w in sorted(ops.items())}
+
+    grid = StateGrid(resolution)
+    key = cache_key(resolution=resolution, operators=ops, magnitude_scale=magnitude_scale,
+                    n_samples=n_samples, seed=seed, chunk_size=chunk_size,
+                    formula=FORMULA_VERSION)
+    path = cache_path("markov", key, ".npz", root=cache_root)
+    if use_cache and path.exists():
+        return MarkovModel(grid, sp.load_npz(path).tocsr(), ops, magnitude_scale, n_samples)
+
+    rng = np.random.default_rng(seed)
+    n = grid.n_cells
+    blocks = []
+    for start in range(0, n, chunk_size):
+        cells = np.arange(start, min(n, start + chunk_size))
+        states = grid.coords(cells)
+        rows, cols, vals = [], [], []
+        for name, weight in ops.items():
+            op = BATCH_OPERATORS[name]
+            lo = -magnitude_scale if op.magnitude_range[0] < 0 else 0.0
+            for _ in range(n_samples):
+                mags = rng.uniform(lo, magnitude_scale, len(cells))
+                succ = grid.snap(op.kernel(states, mags))
+                rows.append(cells - start)
+                cols.append(succ)
+                vals.append(np.full(len(cells), weight / n_samples))
+        block = sp.coo_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(len(cells), n),
+        ).tocsr()
+        block.sum_duplicates()
+        blocks.append(block)
+
+    matrix = sp.vstack(blocks, format="csr")
+    if use_cache:
+        tmp = path.with_suffix(".partial.npz")
+        sp.save_npz(tmp, matrix)
+        os.replace(tmp, path)
+    return MarkovModel(grid, matrix, ops, magnitude_scale, n_samples)
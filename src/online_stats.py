@@ -0,0 +1,187 @@
+"""
+Online Statistics Module - Conduit Engine v0.3
+
+Streaming, mergeable accumulators for large Monte Carlo runs.
+
+Ensembles and sweeps over the five invariants (φ, τ, ρ, H, κ) and D can
+be far larger than memory. These accumulators consume data in chunks and
+can be merged across workers, so only summary state is ever held:
+
+- RunningMoments: count, mean and variance (Welford / Chan et al. merge),
+  optionally per group (e.g. per D band) via update_grouped
+- StreamingHistogram: fixed-bin counts on a bounded range, for quantiles
+
+All invariants and D live in [0, 1], so a fixed-range histogram gives
+quantiles to within one bin width at constant memory.
+"""
+
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+
+class RunningMoments:
+    """
+    Mergeable running mean and variance over a batch axis.
+
+    Tracks one accumulator per element of `shape`; each update consumes
+    an array of shape (n, *shape).
+
+    Parameters:
+        shape: Shape of a single observation (default scalar)
+    """
+
+    def __init__(self, shape: Union[int, Tuple[int, ...]] = ()):
+        self.shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        self.count = np.zeros(self.shape, dtype=np.int64)
+        self.mean = np.zeros(self.shape, dtype=float)
+        self.m2 = np.zeros(self.shape, dtype=float)
+
+    def update(self, batch: np.ndarray) -> "RunningMoments":
+        """Fold a batch of observations (first axis = samples) into the moments."""
+        batch = np.asarray(batch, dtype=float)
+        n = batch.shape[0]
+        if n == 0:
+            return self
+        batch_mean = batch.mean(axis=0)
+        batch_m2 = ((batch - batch_mean) ** 2).sum(axis=0)
+        self._combine(np.full(self.shape, n, dtype=np.int64), batch_mean, batch_m2)
+        return self
+
+    def update_grouped(self, batch: np.ndarray, groups: np.ndarray) -> "RunningMoments":
+        """
+        Fold each observation into the accumulator row of its group.
+
+        The accumulator shape is (n_groups, *obs_shape); batch has shape
+        (n, *obs_shape) and groups holds one row index per observation
+        (negative = skip). All groups are updated in one pass with
+        np.bincount, so this is O(n) whatever the number of groups.
+        """
+        batch = np.asarray(batch, dtype=float)
+        groups = np.asarray(groups, dtype=np.int64)
+        keep = groups >= 0
+        if not keep.all():
+            batch, groups = batch[keep], groups[keep]
+        if groups.size == 0:
+            return self
+        n_groups = self.shape[0]
+        if groups.max() >= n_groups:
+            raise ValueError(f"Group index {groups.max()} out of range for {n_groups} groups")
+
+        flat = batch.reshape(len(groups), -1)
+        counts = np.bincount(groups, minlength=n_groups)
+        sums = np.stack([np.bincount(groups, weights=flat[:, j], minlength=n_groups)
+                         for j in range(flat.shape[1])], axis=1)
+        means = sums / np.maximum(counts, 1)[:, None]
+        dev = (flat - means[groups]) ** 2
+        m2 = np.stack([np.bincount(groups, weights=dev[:, j], minlength=n_groups)
+                       for j in range(flat.shape[1])], axis=1)
+        counts = np.broadcast_to(counts.reshape((n_groups,) + (1,) * (len(self.shape) - 1)),
+                                 self.shape)
+        self._combine(counts, means.reshape(self.shape), m2.reshape(self.shape))
+        return self
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        """Merge another accumulator of the same shape into this one."""
+        if other.shape != self.shape:
+            raise ValueError(f"Shape mismatch: {self.shape} vs {other.shape}")
+        self._combine(other.count, other.mean, other.m2)
+        return self
+
+    def _combine(self, n_b: np.ndarray, mean_b: np.ndarray, m2_b: np.ndarray):
+        """Chan et al. pairwise combination of two moment sets."""
+        n_a = self.count
+        n = n_a + n_b
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean_b - self.mean
+            frac = np.where(n > 0, n_b / np.maximum(n, 1), 0.0)
+            self.mean = self.mean + delta * frac
+            self.m2 = self.m2 + m2_b + delta ** 2 * n_a * frac
+        self.count = n
+
+    def variance(self, ddof: int = 0) -> np.ndarray:
+        """Variance of everything seen so far (population by default)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+
+    def std(self, ddof: int = 0) -> np.ndarray:
+        """Standard deviation of everything seen so far."""
+        return np.sqrt(self.variance(ddof))
+
+
+class StreamingHistogram:
+    """
+    Fixed-bin histogram over [low, high] for streaming quantiles.
+
+    Holds one histogram per element of `shape`. Values outside the range
+    are clamped into the edge bins.
+
+    Parameters:
+        shape: Shape of a single observation (default scalar)
+        n_bins: Number of bins (quantile resolution is (high - low) / n_bins)
+        low: Lower edge of the range
+        high: Upper edge of the range
+    """
+
+    def __init__(
+        self,
+        shape: Union[int, Tuple[int, ...]] = (),
+        n_bins: int = 1024,
+        low: float = 0.0,
+        high: float = 1.0,
+    ):
+        self.shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        self.n_bins = n_bins
+        self.low = low
+        self.high = high
+        self.counts = np.zeros(self.shape + (n_bins,), dtype=np.int64)
+
+    @property
+    def edges(self) -> np.ndarray:
+        return np.linspace(self.low, self.high, self.n_bins + 1)
+
+    def update(self, batch: np.ndarray) -> "StreamingHistogram":
+        """Bin a batch of observations (first axis = samples)."""
+        batch = np.asarray(batch, dtype=float)
+        if batch.shape[0] == 0:
+            return self
+        scale = self.n_bins / (self.high - self.low)
+        bins = np.clip(((batch - self.low) * scale).astype(np.int64), 0, self.n_bins - 1)
+        n_slots = int(np.prod(self.shape, dtype=np.int64))
+        slot = np.arange(n_slots).reshape(self.shape)
+        flat = (slot * self.n_bins + bins).ravel()
+        self.counts += np.bincount(flat, minlength=n_slots * self.n_bins).reshape(
+            self.counts.shape)
+        return self
+
+    def merge(self, other: "StreamingHistogram") -> "StreamingHistogram":
+        """Merge another histogram with identical binning."""
+        if (other.counts.shape != self.counts.shape
+                or other.low != self.low or other.high != self.high):
+            raise ValueError("Histograms must share shape and binning to merge")
+        self.counts += other.counts
+        return self
+
+    def quantile(self, q: Union[float, Sequence[float]]) -> np.ndarray:
+        """
+        Approximate quantiles by linear interpolation within bins.
+
+        Returns an array of shape (len(q), *shape), or `shape` for scalar q.
+        """
+        qs = np.atleast_1d(np.asarray(q, dtype=float))
+        cdf = np.cumsum(self.counts, axis=-1)
+        total = cdf[..., -1:]
+        edges = self.edges
+        out = np.empty((len(qs),) + self.shape, dtype=float)
+        for k, qk in enumerate(qs):
+            target = qk * total
+            idx = (cdf < target).sum(axis=-1, keepdims=True)
+            idx = np.minimum(idx, self.n_bins - 1)
+            below = np.take_along_axis(cdf, idx, axis=-1) - np.take_along_axis(
+                self.counts, idx, axis=-1)
+            in_bin = np.take_along_axis(self.counts, idx, axis=-1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                frac = np.where(in_bin > 0, (target - below) / in_bin, 0.0)
+            value = edges[idx] + np.clip(frac, 0.0, 1.0) * (edges[1] - edges[0])
+            out[k] = np.where(total > 0, value, np.nan)[..., 0]
+        return out if np.ndim(q) else out[0]
@@ -0,0 +1,218 @@
+"""
+Perturbational Complexity Module - Conduit Engine v0.3
+
+PCI-style index from evoked responses (Casali et al., 2013), the
+empirical anchor of ρ (re-entrant binding).
+
+Input: an evoked-response array of shape (channels, time, trials). The
+first `baseline` samples precede the perturbation.
+
+1. Baseline-correct every trial and average across trials.
+2. Bootstrap significance: shuffle each trial's pre-stimulus samples
+   independently in time and average across trials. The maximum
+   absolute value of that average over channels and time gives one
+   draw; T is the (1 - α) quantile of these draws.
+3. Binarize the post-stimulus sources: |response| > T.
+4. Sort channels by total activity, then read the matrix column by
+   column (time-major) and count its LZ76 phrases c(L).
+5. Normalize by the source entropy:
+       PCI = c(L) · log2(L) / (L · H(p₁))
+
+Bootstrap draws are vectorized in chunks: one row-gather per chunk from
+a (samples·trials, channels) layout. Chunks run on a process pool. Each
+chunk has its own child SeedSequence, so the threshold depends only on
+the seed, not on the worker count.
+
+estimate_rho() feeds the index straight into pci_to_rho.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .lempel_ziv import lz76_complexity
+
+try:
+    from .calibration_registry import CALIBRATION_AVAILABLE, mapping_functions
+except ImportError:
+    CALIBRATION_AVAILABLE = False
+
+
+@dataclass
+class PCIResult:
+    """Perturbational complexity of one evoked-response recording."""
+    pci: float
+    threshold: float              # bootstrap significance threshold T
+    significant: np.ndarray       # (channels, response samples) binary source matrix
+    lz_complexity: int            # LZ76 phrases of the sorted, flattened matrix
+    source_entropy: float         # H(p₁) in bits
+
+    @property
+    def n_significant(self) -> int:
+        return int(self.significant.sum())
+
+
+def _baseline_corrected(data: np.ndarray, baseline: int) -> np.ndarray:
+    """float32 copy with each channel's per-trial pre-stimulus mean removed."""
+    x = np.asarray(data, dtype=np.float32)
+    if x.ndim != 3:
+        raise ValueError(f"Expected (channels, time, trials) data, got shape {x.shape}")
+    if not 1 < baseline < x.shape[1]:
+        raise ValueError(f"Baseline of {baseline} samples invalid for {x.shape[1]} time points")
+    return x - x[:, :baseline].mean(axis=1, keepdims=True)
+
+
+def evoked_response(data: np.ndarray, baseline: int) -> np.ndarray:
+    """
+    Baseline-corrected trial average.
+
+    Parameters:
+        data: (channels, time, trials) responses
+        baseline: Number of pre-stimulus samples
+
+    Returns:
+        (channels, time) evoked response
+    """
+    return _baseline_corrected(data, baseline).mean(axis=2)
+
+
+def _bootstrap_chunk(args) -> np.ndarray:
+    """Max |shuffled baseline average| for one chunk of bootstrap draws."""
+    rows, n_time, n_trials, n_draws, seed_seq = args
+    rng = np.random.default_rng(seed_seq)
+    # Row (t·trials + k) of `rows` holds sample t of trial k for every channel
+    shuffled = rng.permuted(np.tile(np.arange(n_time), (n_draws, n_trials, 1)), axis=2)
+    index = shuffled * n_trials + np.arange(n_trials)[:, None]
+    averages = rows[index].sum(axis=1)        # (n_draws, n_time, channels)
+    averages /= n_trials
+    return np.abs(averages).max(axis=(1, 2))
+
+
+def bootstrap_threshold(
+    data: np.ndarray,
+    baseline: int,
+    n_bootstrap: int = 500,
+    alpha: float = 0.01,
+    seed: int = 0,
+    n_workers: int = 1,
+    max_elements: int = 8_000_000,
+    corrected: bool = False,
+) -> float:
+    """
+    Significance threshold for evoked-response amplitudes.
+
+    Parameters:
+        data: (channels, time, trials) responses
+        baseline: Number of pre-stimulus samples
+        n_bootstrap: Bootstrap draws
+        alpha: Significance level; T is the (1 - alpha) quantile of the
+            bootstrap maxima
+        seed: Root seed; chunk k draws from child k of SeedSequence(seed)
+        n_workers: Worker processes for the bootstrap chunks
+        max_elements: Bound on gathered values per chunk (memory)
+        corrected: data is already baseline-corrected float32
+
+    Returns:
+        Threshold T
+    """
+    if not 0 < alpha < 1:
+        raise ValueError(f"alpha must be in (0, 1), got {alpha}")
+    x = data if corrected else _baseline_corrected(data, baseline)
+    n_channels, _, n_trials = x.shape
+    rows = np.ascontiguousarray(x[:, :baseline].transpose(1, 2, 0)).reshape(-1, n_channels)
+
+    per_chunk = max(1, max_elements // (baseline * n_trials * n_channels))
+    sizes = [min(per_chunk, n_bootstrap - start) for start in range(0, n_bootstrap, per_chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(rows, baseline, n_trials, size, seeds[k]) for k, size in enumerate(sizes)]
+
+    n_workers = max(1, min(n_workers, len(tasks)))
+    if n_workers == 1:
+        maxima = [_bootstrap_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            maxima = list(pool.map(_bootstrap_chunk, tasks))
+    return float(np.quantile(np.concatenate(maxima), 1 - alpha))
+
+
+def source_entropy(p: float) -> float:
+    """Binary entropy H(p) in bits."""
+    if p <= 0 or p >= 1:
+        return 0.0
+    return float(-p * np.log2(p) - (1 - p) * np.log2(1 - p))
+
+
+def pci_from_matrix(significant: np.ndarray) -> Tuple[float, int, float]:
+    """
+    Normalized LZ complexity of a binary (channels, time) source matrix.
+
+    Returns:
+        (PCI, LZ76 phrase count, source entropy); PCI is 0 for an all-zero
+        or all-one matrix
+    """
+    ss = np.asarray(significant, dtype=bool)
+    order = np.argsort(ss.sum(axis=1), kind="stable")
+    sequence = np.ascontiguousarray(ss[order].T).reshape(-1).view(np.uint8)
+    L = sequence.size
+    entropy = source_entropy(float(sequence.mean())) if L else 0.0
+    c = lz76_complexity(sequence)
+    if entropy == 0.0:
+        return 0.0, c, entropy
+    return float(c * np.log2(L) / (L * entropy)), c, entropy
+
+
+def perturbational_complexity(
+    data: np.ndarray,
+    baseline: int,
+    response_window: Optional[Tuple[int, int]] = None,
+    n_bootstrap: int = 500,
+    alpha: float = 0.01,
+    seed: int = 0,
+    n_workers: int = 1,
+) -> PCIResult:
+    """
+    PCI of an evoked-response recording.
+
+    Parameters:
+        data: (channels, time, trials) responses
+        baseline: Number of pre-stimulus samples
+        response_window: (start, stop) samples scored for complexity
+            (default: everything after the baseline)
+        n_bootstrap: Bootstrap draws for the significance threshold
+        alpha: Significance level
+        seed: Root seed for the bootstrap
+        n_workers: Worker processes for the bootstrap
+
+    Returns:
+        PCIResult
+    """
+    x = _baseline_corrected(data, baseline)
+    start, stop = (baseline, x.shape[1]) if response_window is None else response_window
+    if not baseline <= start < stop <= x.shape[1]:
+        raise ValueError(f"Response window {(start, stop)} must lie after the baseline")
+
+    threshold = bootstrap_threshold(x, baseline, n_bootstrap, alpha, seed, n_workers,
+                                    corrected=True)
+    significant = np.abs(x[:, start:stop].mean(axis=2)) > threshold
+    pci, c, entropy = pci_from_matrix(significant)
+    return PCIResult(pci, threshold, significant, c, entropy)
+
+
+def estimate_rho(data: np.ndarray, baseline: int, **kwargs):
+    """
+    Estimate ρ from an evoked-response recording via pci_to_rho.
+
+    Parameters:
+        data: (channels, time, trials) responses
+        baseline: Number of pre-stimulus samples
+        **kwargs: Passed to perturbational_complexity
+
+    Returns:
+        CalibratedValue for ρ
+    """
+    if not CALIBRATION_AVAILABLE:
+        raise ValueError("Calibration library not available")
+    result = perturbational_complexity(data, baseline, **kwargs)
+    return mapping_functions.pci_to_rho(min(result.pci, 1.0))
@@ -0,0 +1,275 @@
+"""
+Planner Module - Conduit Engine v0.3
+
+Cheapest operator sequence from a start state into a target region.
+
+Given a start state (e.g. calibrated wakefulness) and a target region
+such as "D ≥ 0.3 with H ≤ 0.4", plan_intervention() runs A* over
+sequences of operator applications with discretized magnitudes drawn
+from operators.py and advanced_operators.py.
+
+The heuristic is admissible and comes straight from the density formula.
+With S = φτρ and g = (1 - √H) + Hκ both in [0, 1],
+
+    |ΔD| ≤ |ΔS| + |Δg| ≤ δφ + δτ + δρ + √δH + δH + δκ
+
+where δx is the largest change one edge can make to invariant x. So
+reaching a D gap of G needs at least ceil(G / max ΔD) applications, and
+each invariant bound needs ceil(gap_x / max δx). The larger of these
+counts times the cheapest edge cost never overestimates the true cost.
+
+Visited states are deduplicated on a quantized grid, so near-identical
+states reached by different orders are expanded only once.
+"""
+
+import heapq
+import itertools
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .encoder import StateVector
+from .batch_operators import (
+    BATCH_OPERATORS,
+    INVARIANTS,
+    array_to_state,
+    density_batch,
+    get_batch_operator,
+)
+
+
+PLANNER_MAGNITUDES: Dict[str, Tuple[float, ...]] = {
+    "perturb_binding": (-0.2, -0.1, -0.05, 0.05, 0.1, 0.2),
+    "fracture_integration": (-0.2, -0.1, -0.05, 0.05, 0.1, 0.2),
+    "stretch_temporal_depth": (-0.2, -0.1, -0.05, 0.05, 0.1, 0.2),
+    "inject_entropy": (-0.2, -0.1, -0.05, 0.05, 0.1, 0.2),
+    "modulate_coherence": (-0.2, -0.1, -0.05, 0.05, 0.1, 0.2),
+    "dementia_progression": (0.1, 0.25, 0.5, 1.0),
+    "split_brain": (0.0,),
+    "anesthesia_gradient": (0.1, 0.25, 0.5, 1.0),
+    "flow_state_induction": (0.1, 0.25, 0.5, 1.0),
+    "panic_induction": (0.1, 0.25, 0.5, 1.0),
+    "psychedelic_onset": (0.1, 0.25, 0.5, 1.0),
+}
+
+
+def default_step_cost(operator: str, magnitude: float) -> float:
+    """One unit per application plus the size of the intervention."""
+    return 1.0 + abs(magnitude)
+
+
+@dataclass
+class TargetRegion:
+    """
+    Axis-aligned target region in (invariants, D) space.
+
+    Bounds are inclusive; None means unbounded.
+
+    Example:
+        TargetRegion(D_min=0.3, bounds={"H": (None, 0.4)})
+    """
+    D_min: Optional[float] = None
+    D_max: Optional[float] = None
+    bounds: Dict[str, Tuple[Optional[float], Optional[float]]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        unknown = set(self.bounds) - set(INVARIANTS)
+        if unknown:
+            raise ValueError(f"Unknown invariants in bounds: {sorted(unknown)}")
+
+    def __call__(self, states: np.ndarray, D: np.ndarray) -> np.ndarray:
+        """Boolean mask of rows of (N, 5) `states` with densities `D` inside the region."""
+        mask = np.ones(len(states), dtype=bool)
+        if self.D_min is not None:
+            mask &= D >= self.D_min
+        if self.D_max is not None:
+            mask &= D <= self.D_max
+        for name, (lo, hi) in self.bounds.items():
+            col = states[:, INVARIANTS.index(name)]
+            if lo is not None:
+                mask &= col >= lo
+            if hi is not None:
+                mask &= col <= hi
+        return mask
+
+    def contains(self, state: StateVector) -> bool:
+        vec = np.asarray(state.to_vector(), dtype=float).reshape(1, 5)
+        return bool(self(vec, density_batch(vec))[0])
+
+    def gaps(self, state: np.ndarray, D: float) -> Tuple[float, np.ndarray]:
+        """Distance outside the D bounds and outside each invariant bound."""
+        d_gap = 0.0
+        if self.D_min is not None:
+            d_gap = max(d_gap, self.D_min - D)
+        if self.D_max is not None:
+            d_gap = max(d_gap, D - self.D_max)
+        inv_gap = np.zeros(5)
+        for name, (lo, hi) in self.bounds.items():
+            j = INVARIANTS.index(name)
+            if lo is not None:
+                inv_gap[j] = max(inv_gap[j], lo - state[j])
+            if hi is not None:
+                inv_gap[j] = max(inv_gap[j], state[j] - hi)
+        return d_gap, inv_gap
+
+
+@dataclass
+class PlanStep:
+    """One operator application in a plan and the state it produces."""
+    operator: str
+    magnitude: float
+    state: StateVector
+
+
+@dataclass
+class Plan:
+    """Result of an A* intervention search."""
+    found: bool
+    start: StateVector
+    steps: List[PlanStep]
+    cost: float
+    expansions: int
+
+    @property
+    def operations(self) -> List[Tuple[str, float]]:
+        return [(s.operator, s.magnitude) for s in self.steps]
+
+    @property
+    def final_state(self) -> StateVector:
+        return self.steps[-1].state if self.steps else self.start
+
+
+def _edge_bounds(edges: List[Tuple[str, float]]) -> np.ndarray:
+    """
+    Largest change each edge can make to each invariant.
+
+    Every kernel updates each invariant from that invariant alone, linearly
+    up to clamping, so the largest change is attained at 0 or 1; the 32
+    corners of the unit cube cover every case.
+    """
+    corners = np.array(list(itertools.product((0.0, 1.0), repeat=5)))
+    bounds = np.empty((len(edges), 5))
+    for e, (name, magnitude) in enumerate(edges):
+        out = BATCH_OPERATORS[name].kernel(corners, np.full(len(corners), magnitude))
+        bounds[e] = np.abs(out - corners).max(axis=0)
+    return bounds
+
+
+def plan_intervention(
+    start: StateVector,
+    target: TargetRegion,
+    magnitudes: Optional[Dict[str, Sequence[float]]] = None,
+    step_cost: Callable[[str, float], float] = default_step_cost,
+    resolution: int = 101,
+    max_expansions: int = 100_000,
+) -> Plan:
+    """
+    Find the cheapest operator sequence taking `start` into `target`.
+
+    Parameters:
+        start: Starting StateVector (e.g. encode_from_calibration('wakefulness'))
+        target: TargetRegion to reach
+        magnitudes: Operator name → allowed magnitudes (default PLANNER_MAGNITUDES)
+        step_cost: Cost of one application, step_cost(operator_name, magnitude) > 0
+        resolution: Grid points per axis used to deduplicate visited states
+        max_expansions: Search budget; the best-effort result reports found=False
+
+    Returns:
+        Plan with the operator sequence, intermediate states and total cost
+    """
+    magnitudes = PLANNER_MAGNITUDES if magnitudes is None else magnitudes
+    edges: List[Tuple[str, float]] = []
+    for name, mags in magnitudes.items():
+        op = get_batch_operator(name)
+        for m in (mags if op.takes_magnitude else (0.0,)):
+            edges.append((op.name, float(m)))
+    if not edges:
+        raise ValueError("No operator edges to search over")
+
+    costs = np.array([step_cost(name, m) for name, m in edges], dtype=float)
+    if np.any(costs <= 0):
+        raise ValueError("step_cost must be positive for every edge")
+    min_cost = float(costs.min())
+
+    deltas = _edge_bounds(edges)
+    max_delta = deltas.max(axis=0)
+    step_dD = float((deltas[:, :3].sum(axis=1) + np.sqrt(deltas[:, 3])
+                     + deltas[:, 3] + deltas[:, 4]).max())
+
+    def heuristic(state: np.ndarray, D: float) -> float:
+        d_gap, inv_gap = target.gaps(state, D)
+        steps = 0
+        if d_gap > 0:
+            steps = math.ceil(d_gap / step_dD) if step_dD > 0 else math.inf
+        for j in np.flatnonzero(inv_gap > 0):
+            steps = max(steps, math.ceil(inv_gap[j] / max_delta[j])
+                        if max_delta[j] > 0 else math.inf)
+        return steps * min_cost
+
+    # Group edge columns by operator so each expansion is one kernel call per operator
+    groups = {}
+    for e, (name, m) in enumerate(edges):
+        groups.setdefault(name, []).append(e)
+    groups = [(BATCH_OPERATORS[name].kernel, np.array(cols), np.array([edges[c][1] for c in cols]))
+              for name, cols in groups.items()]
+
+    def key_of(state: np.ndarray) -> Tuple[int, ...]:
+        return tuple(np.rint(state * (resolution - 1)).astype(int))
+
+    start_vec = np.asarray(start.to_vector(), dtype=float)
+    states = [start_vec]
+    parents = [-1]
+    via = [-1]
+    g_cost = [0.0]
+    best_g = {key_of(start_vec): 0.0}
+    counter = itertools.count()
+    start_D = float(density_batch(start_vec.reshape(1, 5))[0])
+    heap = [(heuristic(start_vec, start_D), next(counter), 0)]
+
+    expansions = 0
+    goal = None
+    while heap and expansions < max_expansions:
+        _, _, node = heapq.heappop(heap)
+        vec = states[node]
+        if g_cost[node] > best_g.get(key_of(vec), math.inf):
+            continue
+        if target(vec.reshape(1, 5), density_batch(vec.reshape(1, 5)))[0]:
+            goal = node
+            break
+        expansions += 1
+
+        children = np.empty((len(edges), 5))
+        for kernel, cols, mags in groups:
+            children[cols] = kernel(np.broadcast_to(vec, (len(cols), 5)), mags)
+        child_D = density_batch(children)
+
+        for e in range(len(edges)):
+            child = children[e]
+            g = g_cost[node] + costs[e]
+            k = key_of(child)
+            if g >= best_g.get(k, math.inf):
+                continue
+            best_g[k] = g
+            states.append(child)
+            parents.append(node)
+            via.append(e)
+            g_cost.append(g)
+            f = g + heuristic(child, float(child_D[e]))
+            if f < math.inf:
+                heapq.heappush(heap, (f, next(counter), len(states) - 1))
+
+    if goal is None:
+        return Plan(found=False, start=start, steps=[], cost=math.inf,
+                    expansions=expansions)
+
+    path = []
+    node = goal
+    while parents[node] != -1:
+        name, m = edges[via[node]]
+        path.append(PlanStep(name, m, array_to_state(states[node], name=f"after {name}({m:g})")))
+        node = parents[node]
+    path.reverse()
+    return Plan(found=True, start=start, steps=path, cost=g_cost[goal],
+                expansions=expansions)
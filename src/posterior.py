@@ -0,0 +1,376 @@
+"""
+Posterior Module - Conduit Engine v0.3
+
+Bayesian fitting of the five invariants of every calibrated state.
+
+The point estimates in the calibration library combine empirical anchors
+(PCI, LZc, connectivity) with hand-picked overrides where data is missing
+(e.g. ρ for psychedelics, flow and panic). This module infers posterior
+distributions instead:
+
+- Prior: one Beta per (state, invariant), centred on the calibrated value
+  with a spread set by its empirical range or confidence level (see
+  uncertainty.invariant_distributions).
+- Likelihood: soft ordering constraints on D, such as those checked by
+  density_models.run_validation_suite (Panic > K-hole, Flow > Wakefulness,
+  ketamine/propofol ratio > 10, wakefulness baseline range).
+
+Sampling is Metropolis-within-Gibbs over states: each state's five
+logit-transformed invariants get a joint random-walk proposal. Many
+chains are advanced as one vectorized batch. States that share no
+constraint are conditionally independent, so they are updated together.
+Proposal scales are adapted during burn-in and then frozen.
+
+Convergence is reported per parameter as split-R̂ and effective sample
+size (ESS).
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch_operators import INVARIANTS
+from .uncertainty import CONFIDENCE_SD, invariant_distributions
+
+
+# =============================================================================
+# Soft Constraints on D
+# =============================================================================
+
+def _log_sigmoid(x: np.ndarray) -> np.ndarray:
+    return -np.logaddexp(0.0, -x)
+
+
+@dataclass(frozen=True)
+class OrderingConstraint:
+    """D(greater) - D(lesser) > margin, softened by a logistic of width `scale`."""
+    greater: str
+    lesser: str
+    margin: float = 0.0
+    scale: float = 0.005
+
+    @property
+    def states(self) -> Tuple[str, ...]:
+        return (self.greater, self.lesser)
+
+    def log_likelihood(self, D: np.ndarray, index: Mapping[str, int]) -> np.ndarray:
+        gap = D[..., index[self.greater]] - D[..., index[self.lesser]] - self.margin
+        return _log_sigmoid(gap / self.scale)
+
+
+@dataclass(frozen=True)
+class RatioConstraint:
+    """D(numerator) / D(denominator) > min_ratio, softened on the log scale."""
+    numerator: str
+    denominator: str
+    min_ratio: float
+    scale: float = 0.1
+
+    @property
+    def states(self) -> Tuple[str, ...]:
+        return (self.numerator, self.denominator)
+
+    def log_likelihood(self, D: np.ndarray, index: Mapping[str, int]) -> np.ndarray:
+        with np.errstate(divide="ignore"):
+            log_ratio = (np.log(D[..., index[self.numerator]])
+                         - np.log(D[..., index[self.denominator]]))
+        return _log_sigmoid((log_ratio - math.log(self.min_ratio)) / self.scale)
+
+
+@dataclass(frozen=True)
+class RangeConstraint:
+    """low ≤ D(state) ≤ high, with logistic edges of width `scale`."""
+    state: str
+    low: float
+    high: float
+    scale: float = 0.005
+
+    @property
+    def states(self) -> Tuple[str, ...]:
+        return (self.state,)
+
+    def log_likelihood(self, D: np.ndarray, index: Mapping[str, int]) -> np.ndarray:
+        d = D[..., index[self.state]]
+        return (_log_sigmoid((d - self.low) / self.scale)
+                + _log_sigmoid((self.high - d) / self.scale))
+
+
+# The benchmarks checked by density_models.run_validation_suite
+VALIDATION_CONSTRAINTS = (
+    RatioConstraint("ketamine_anesthesia", "propofol_anesthesia", 10.0),
+    RangeConstraint("wakefulness", 0.10, 0.15),
+    OrderingConstraint("panic_attack", "ketamine_anesthesia"),
+    OrderingConstraint("flow_state", "wakefulness"),
+)
+
+
+# =============================================================================
+# Convergence Diagnostics
+# =============================================================================
+
+def split_r_hat(draws: np.ndarray) -> np.ndarray:
+    """
+    Split-R̂ for draws of shape (n_draws, n_chains, *params).
+
+    Each chain is split in half so within-chain drift also shows up as
+    between-chain disagreement. Values near 1 indicate convergence.
+    """
+    n = draws.shape[0] // 2
+    halves = np.concatenate([draws[:n], draws[n:2 * n]], axis=1)
+    chain_mean = halves.mean(axis=0)
+    W = halves.var(axis=0, ddof=1).mean(axis=0)
+    B = n * chain_mean.var(axis=0, ddof=1)
+    var_plus = (n - 1) / n * W + B / n
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.sqrt(var_plus / W)
+
+
+def effective_sample_size(draws: np.ndarray) -> np.ndarray:
+    """
+    Multi-chain ESS for draws of shape (n_draws, n_chains, *params).
+
+    Autocorrelations are computed per chain with an FFT, combined across
+    chains, and summed over Geyer's initial monotone positive sequence.
+    """
+    n, m = draws.shape[:2]
+    centred = draws - draws.mean(axis=0)
+    size = 1 << (2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(centred, n=size, axis=0)
+    autocov = np.fft.irfft(spectrum * np.conj(spectrum), n=size, axis=0)[:n] / n
+
+    chain_var = autocov[0] * n / (n - 1)
+    W = chain_var.mean(axis=0)
+    var_plus = W * (n - 1) / n
+    if m > 1:
+        var_plus = var_plus + draws.mean(axis=0).var(axis=0, ddof=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rho = 1.0 - (W - autocov.mean(axis=1)) / var_plus
+    rho[0] = 1.0
+
+    n_pairs = n // 2
+    pairs = rho[:2 * n_pairs:2] + rho[1:2 * n_pairs:2]
+    positive = np.cumprod(pairs > 0, axis=0).astype(bool)
+    pairs = np.minimum.accumulate(np.where(positive, pairs, np.inf), axis=0)
+    tau = -1.0 + 2.0 * np.where(positive, pairs, 0.0).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return m * n / np.maximum(tau, 1.0 / math.log10(max(m * n, 10)))
+
+
+# =============================================================================
+# Sampler
+# =============================================================================
+
+@dataclass
+class PosteriorFit:
+    """Posterior draws of (φ, τ, ρ, H, κ) for every state, with diagnostics."""
+    names: Tuple[str, ...]
+    draws: np.ndarray              # (n_draws, n_chains, N, 5)
+    prior_mean: np.ndarray         # (N, 5) calibrated point estimates
+    constraints: Tuple
+    acceptance: np.ndarray         # (N,) post-burn-in acceptance rate
+    r_hat: np.ndarray              # (N, 5)
+    ess: np.ndarray                # (N, 5)
+
+    @property
+    def density_draws(self) -> np.ndarray:
+        """(n_draws, n_chains, N) posterior draws of D."""
+        d = self.draws
+        return (d[..., 0] * d[..., 1] * d[..., 2]
+                * ((1 - np.sqrt(d[..., 3])) + d[..., 3] * d[..., 4]))
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.draws.mean(axis=(0, 1))
+
+    @property
+    def sd(self) -> np.ndarray:
+        return self.draws.std(axis=(0, 1))
+
+    def converged(self, max_r_hat: float = 1.05, min_ess: float = 400) -> bool:
+        """True when every parameter has R̂ < max_r_hat and ESS > min_ess."""
+        return bool(np.all(self.r_hat < max_r_hat) and np.all(self.ess > min_ess))
+
+    def interval(self, level: float = 0.9) -> Tuple[np.ndarray, np.ndarray]:
+        """Central credible interval bounds, each of shape (N, 5)."""
+        tail = (1 - level) / 2
+        flat = self.draws.reshape(-1, *self.draws.shape[2:])
+        return np.quantile(flat, tail, axis=0), np.quantile(flat, 1 - tail, axis=0)
+
+    def constraint_probabilities(self) -> Dict[str, float]:
+        """Posterior probability that each constraint holds exactly (hard version)."""
+        D = self.density_draws
+        index = {name: i for i, name in enumerate(self.names)}
+        out = {}
+        for c in self.constraints:
+            if isinstance(c, OrderingConstraint):
+                hold = D[..., index[c.greater]] - D[..., index[c.lesser]] > c.margin
+            elif isinstance(c, RatioConstraint):
+                hold = D[..., index[c.numerator]] > c.min_ratio * D[..., index[c.denominator]]
+            else:
+                d = D[..., index[c.state]]
+                hold = (d >= c.low) & (d <= c.high)
+            out[repr(c)] = float(hold.mean())
+        return out
+
+    def summary(self, state_name: str) -> Dict[str, Dict[str, float]]:
+        """Prior point estimate vs posterior mean, sd and diagnostics for one state."""
+        i = self.names.index(state_name)
+        lo, hi = self.interval()
+        D = self.density_draws[..., i]
+        out = {
+            var: {
+                "calibrated": float(self.prior_mean[i, j]),
+                "posterior_mean": float(self.mean[i, j]),
+                "posterior_sd": float(self.sd[i, j]),
+                "ci_low": float(lo[i, j]),
+                "ci_high": float(hi[i, j]),
+                "r_hat": float(self.r_hat[i, j]),
+                "ess": float(self.ess[i, j]),
+            }
+            for j, var in enumerate(INVARIANTS)
+        }
+        out["D"] = {"posterior_mean": float(D.mean()), "posterior_sd": float(D.std())}
+        return out
+
+
+def _color_states(n: int, constraints: Sequence, index: Mapping[str, int]) -> List[np.ndarray]:
+    """Greedy colouring so no two states in a block share a constraint."""
+    neighbours = [set() for _ in range(n)]
+    for c in constraints:
+        members = [index[s] for s in c.states]
+        for a in members:
+            neighbours[a].update(b for b in members if b != a)
+    color = np.full(n, -1)
+    for i in range(n):
+        used = {color[j] for j in neighbours[i]}
+        color[i] = next(k for k in range(n) if k not in used)
+    return [np.flatnonzero(color == k) for k in range(color.max() + 1)]
+
+
+def fit_posterior(
+    states: Optional[Mapping[str, object]] = None,
+    constraints: Sequence = VALIDATION_CONSTRAINTS,
+    n_chains: int = 32,
+    n_draws: int = 1000,
+    n_burn: int = 1000,
+    thin: int = 1,
+    seed: int = 0,
+    confidence_sd: Mapping[str, float] = CONFIDENCE_SD,
+) -> PosteriorFit:
+    """
+    Sample the joint posterior of all states' invariants.
+
+    Parameters:
+        states: Name → GroundedState (default: the whole calibration registry)
+        constraints: Soft constraints on D (default VALIDATION_CONSTRAINTS)
+        n_chains: Chains advanced together as one batch
+        n_draws: Kept sweeps per chain (after thinning)
+        n_burn: Adaptation sweeps discarded before sampling
+        thin: Keep every `thin`-th sweep
+        seed: Random seed
+        confidence_sd: Prior spread per confidence level
+
+    Returns:
+        PosteriorFit with draws, acceptance rates, R̂ and ESS
+    """
+    prior = invariant_distributions(states, confidence_sd=confidence_sd)
+    names = prior.names
+    n = len(names)
+    index = {name: i for i, name in enumerate(names)}
+    constraints = tuple(constraints)
+    for c in constraints:
+        missing = [s for s in c.states if s not in index]
+        if missing:
+            raise ValueError(f"Constraint {c!r} refers to unknown states: {missing}")
+
+    incidence = np.zeros((len(constraints), n))
+    for k, c in enumerate(constraints):
+        for s in c.states:
+            incidence[k, index[s]] = 1.0
+    blocks = _color_states(n, constraints, index)
+    alpha, beta = prior.alpha, prior.beta
+
+    def log_prior(x: np.ndarray, a: np.ndarray = alpha, b: np.ndarray = beta) -> np.ndarray:
+        # Beta log density plus the logit Jacobian x(1 - x)
+        return a * np.log(x) + b * np.log1p(-x)
+
+    def density(x: np.ndarray) -> np.ndarray:
+        return (x[..., 0] * x[..., 1] * x[..., 2]
+                * ((1 - np.sqrt(x[..., 3])) + x[..., 3] * x[..., 4]))
+
+    def constraint_terms(D: np.ndarray) -> np.ndarray:
+        if not constraints:
+            return np.zeros(D.shape[:-1] + (0,))
+        return np.stack([c.log_likelihood(D, index) for c in constraints], axis=-1)
+
+    rng = np.random.default_rng(seed)
+    # Overdispersed starts: independent prior draws per chain
+    x = np.clip(rng.beta(alpha, beta, size=(n_chains, n, 5)), 1e-9, 1 - 1e-9)
+    z = np.log(x) - np.log1p(-x)
+    D = density(x)
+    lp = log_prior(x).sum(axis=-1)
+    terms = constraint_terms(D)
+
+    # Proposal sd per (state, invariant) = per-state scale × logit-space spread.
+    # The spread is re-estimated from the chains during burn-in.
+    spread = np.maximum(z.std(axis=0), 0.1)
+    scale = np.full(n, 2.38 / math.sqrt(5))
+    accepted = np.zeros(n)
+    window = 0
+    history = []
+    draws = np.empty((n_draws, n_chains, n, 5))
+    total = n_burn + n_draws * thin
+
+    for sweep in range(total):
+        step = scale[:, None] * spread
+        for block in blocks:
+            z_new = z[:, block] + step[block] * rng.standard_normal((n_chains, len(block), 5))
+            x_new = np.clip(0.5 + 0.5 * np.tanh(0.5 * z_new), 1e-12, 1 - 1e-12)
+            D_new = D.copy()
+            D_new[:, block] = density(x_new)
+            lp_new = log_prior(x_new, alpha[block], beta[block]).sum(axis=-1)
+            terms_new = constraint_terms(D_new)
+
+            # Each constraint touches at most one state of the block
+            delta = (terms_new - terms) @ incidence[:, block]
+            log_ratio = lp_new - lp[:, block] + delta
+            accept = np.log(rng.random((n_chains, len(block)))) < log_ratio
+
+            keep = accept[..., None]
+            z[:, block] = np.where(keep, z_new, z[:, block])
+            x[:, block] = np.where(keep, x_new, x[:, block])
+            lp[:, block] = np.where(accept, lp_new, lp[:, block])
+            D[:, block] = np.where(accept, D_new[:, block], D[:, block])
+            touched = (accept.astype(float) @ incidence[:, block].T) > 0
+            terms = np.where(touched, terms_new, terms)
+            accepted[block] += accept.mean(axis=0)
+        window += 1
+
+        if sweep < n_burn:
+            history.append(z.copy())
+            if window == 50:
+                # Nudge each state's scale toward the 5-D optimum (~23% acceptance)
+                # and refresh the spread from the latest window.
+                scale *= np.exp(accepted / window - 0.234)
+                recent = np.stack(history)
+                spread = np.maximum((recent - recent.mean(axis=0)).std(axis=(0, 1)), 1e-3)
+                history = []
+                accepted[:] = 0.0
+                window = 0
+            if sweep == n_burn - 1:
+                accepted[:] = 0.0
+                window = 0
+        elif (sweep - n_burn) % thin == thin - 1:
+            draws[(sweep - n_burn) // thin] = x
+
+    return PosteriorFit(
+        names=names,
+        draws=draws,
+        prior_mean=prior.mean,
+        constraints=constraints,
+        acceptance=accepted / max(window, 1),
+        r_hat=split_r_hat(draws),
+        ess=effective_sample_size(draws),
+    )
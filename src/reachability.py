@@ -0,0 +1,223 @@
+"""
+Reachability Module - Conduit Engine v0.3
+
+Which states can be reached from which, using only a chosen set of operators?
+
+The invariant space [0, 1]^5 is quantized into a regular grid of
+resolution^5 cells. Every operator application (operator × discretized
+magnitude) is an edge: its batch kernel is applied once to every cell
+center and the result is snapped to the nearest grid point. The
+resulting successor table is the whole transition structure; queries
+never re-simulate operators.
+
+Forward-reachable sets are found by breadth-first search and memoized as
+packed bitsets (one bit per cell). A later search that meets a cell whose
+reachable set is already cached ORs it in instead of expanding it, so
+queries share work.
+
+Note: steps smaller than half a grid spacing snap back onto the same
+cell. Choose magnitudes of at least one grid spacing for basic operators.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .encoder import StateVector
+from .batch_operators import BATCH_OPERATORS, density_batch, get_batch_operator
+
+
+# Default magnitudes per operator: one step up/down for the single-invariant
+# operators, a light/moderate/full application for the advanced ones.
+DEFAULT_MAGNITUDES: Dict[str, Tuple[float, ...]] = {
+    "perturb_binding": (-0.1, 0.1),
+    "fracture_integration": (-0.1, 0.1),
+    "stretch_temporal_depth": (-0.1, 0.1),
+    "inject_entropy": (-0.1, 0.1),
+    "modulate_coherence": (-0.1, 0.1),
+    "dementia_progression": (0.25, 0.5, 1.0),
+    "split_brain": (0.0,),
+    "anesthesia_gradient": (0.25, 0.5, 1.0),
+    "flow_state_induction": (0.25, 0.5, 1.0),
+    "panic_induction": (0.25, 0.5, 1.0),
+    "psychedelic_onset": (0.25, 0.5, 1.0),
+}
+
+Region = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+class StateGrid:
+    """
+    Regular quantization of [0, 1]^5 with `resolution` points per axis.
+
+    Cells are indexed in C order over (φ, τ, ρ, H, κ).
+    """
+
+    def __init__(self, resolution: int = 11):
+        if resolution < 2:
+            raise ValueError(f"resolution must be at least 2, got {resolution}")
+        self.resolution = resolution
+        self.n_cells = resolution ** 5
+        self.spacing = 1.0 / (resolution - 1)
+
+    def coords(self, cells: np.ndarray) -> np.ndarray:
+        """Cell indices → (N, 5) grid-point coordinates."""
+        idx = np.stack(np.unravel_index(np.asarray(cells), (self.resolution,) * 5), axis=-1)
+        return idx * self.spacing
+
+    def snap(self, states: np.ndarray) -> np.ndarray:
+        """(N, 5) coordinates → index of the nearest grid cell."""
+        idx = np.rint(np.clip(states, 0.0, 1.0) * (self.resolution - 1)).astype(np.int64)
+        return np.ravel_multi_index(tuple(idx.T), (self.resolution,) * 5)
+
+    def cell_of(self, state: Union[StateVector, Sequence[float]]) -> int:
+        """Index of the cell containing a single state."""
+        vec = state.to_vector() if isinstance(state, StateVector) else state
+        return int(self.snap(np.asarray(vec, dtype=float).reshape(1, 5))[0])
+
+
+class ReachabilityMap:
+    """
+    Operator-induced transition graph over a quantized state grid.
+
+    Parameters:
+        resolution: Grid points per axis (resolution^5 cells)
+        magnitudes: Operator name → magnitudes to use as edges
+                    (default DEFAULT_MAGNITUDES; locked_in_syndrome is an
+                    identity and is never an edge)
+        chunk_size: Cells processed per kernel call when building the table
+        cache_size: Maximum number of reachable sets kept in memory
+    """
+
+    def __init__(
+        self,
+        resolution: int = 11,
+        magnitudes: Optional[Dict[str, Sequence[float]]] = None,
+        chunk_size: int = 200_000,
+        cache_size: int = 256,
+    ):
+        self.grid = StateGrid(resolution)
+        magnitudes = DEFAULT_MAGNITUDES if magnitudes is None else magnitudes
+
+        self.edges: List[Tuple[str, float]] = []
+        for name, mags in magnitudes.items():
+            op = get_batch_operator(name)
+            for m in (mags if op.takes_magnitude else (0.0,)):
+                self.edges.append((op.name, float(m)))
+        self.operators = tuple(dict.fromkeys(name for name, _ in self.edges))
+
+        self.successors = self._build_successors(chunk_size)
+        self.cell_density = density_batch(
+            self.grid.coords(np.arange(self.grid.n_cells)))
+        self._cache: "OrderedDict[Tuple[int, FrozenSet[str]], np.ndarray]" = OrderedDict()
+        self._cache_size = cache_size
+
+    def _build_successors(self, chunk_size: int) -> np.ndarray:
+        """Apply every edge to every cell center once; snap results to the grid."""
+        n = self.grid.n_cells
+        table = np.empty((n, len(self.edges)), dtype=np.int32)
+        for start in range(0, n, chunk_size):
+            cells = np.arange(start, min(n, start + chunk_size))
+            states = self.grid.coords(cells)
+            for e, (name, magnitude) in enumerate(self.edges):
+                out = BATCH_OPERATORS[name].kernel(states, np.full(len(cells), magnitude))
+                table[cells, e] = self.grid.snap(out)
+        return table
+
+    def _edge_columns(self, operators: Optional[Sequence]) -> Tuple[FrozenSet[str], np.ndarray]:
+        if operators is None:
+            names = frozenset(self.operators)
+        else:
+            names = frozenset(get_batch_operator(op).name for op in operators)
+            unknown = names - set(self.operators)
+            if unknown:
+                raise ValueError(f"Operators not in this map: {sorted(unknown)}")
+        cols = np.array([e for e, (name, _) in enumerate(self.edges) if name in names],
+                        dtype=np.int64)
+        return names, cols
+
+    def _resolve(self, state) -> int:
+        if isinstance(state, (int, np.integer)):
+            return int(state)
+        return self.grid.cell_of(state)
+
+    # ------------------------------------------------------------------
+    # Reachable sets
+    # ------------------------------------------------------------------
+
+    def reachable_bitset(self, start, operators: Optional[Sequence] = None) -> np.ndarray:
+        """
+        Packed bitset (np.packbits, one bit per cell) of every cell
+        reachable from `start` in zero or more operator applications.
+        """
+        cell = self._resolve(start)
+        names, cols = self._edge_columns(operators)
+        key = (cell, names)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        known = np.array([c for (c, n) in self._cache if n == names], dtype=np.int64)
+        visited = np.zeros(self.grid.n_cells, dtype=bool)
+        visited[cell] = True
+        frontier = np.array([cell], dtype=np.int64)
+        while frontier.size:
+            hits = np.isin(frontier, known)
+            for c in frontier[hits]:
+                cached = np.unpackbits(self._cache[(int(c), names)], count=self.grid.n_cells)
+                visited |= cached.astype(bool)
+            expand = frontier[~hits]
+            if not expand.size:
+                break
+            nxt = np.unique(self.successors[expand][:, cols])
+            nxt = nxt[~visited[nxt]]
+            visited[nxt] = True
+            frontier = nxt
+
+        bits = np.packbits(visited)
+        self._cache[key] = bits
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return bits
+
+    def reachable_cells(self, start, operators: Optional[Sequence] = None) -> np.ndarray:
+        """Indices of all cells reachable from `start`."""
+        bits = self.reachable_bitset(start, operators)
+        return np.flatnonzero(np.unpackbits(bits, count=self.grid.n_cells))
+
+    def reachable_states(self, start, operators: Optional[Sequence] = None) -> np.ndarray:
+        """(M, 5) grid coordinates of all cells reachable from `start`."""
+        return self.grid.coords(self.reachable_cells(start, operators))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def can_reach(self, start, target, operators: Optional[Sequence] = None) -> bool:
+        """Can `target` (state or cell index) be reached from `start`?"""
+        t = self._resolve(target)
+        bits = self.reachable_bitset(start, operators)
+        return bool((bits[t >> 3] >> (7 - (t & 7))) & 1)
+
+    def region_mask(self, region: Region) -> np.ndarray:
+        """Evaluate a region predicate region(states, D) on every cell."""
+        states = self.grid.coords(np.arange(self.grid.n_cells))
+        return np.asarray(region(states, self.cell_density), dtype=bool)
+
+    def can_reach_region(self, start, region: Region,
+                         operators: Optional[Sequence] = None) -> bool:
+        """Can any cell satisfying region(states, D) be reached from `start`?"""
+        return self.reachable_in_region(start, region, operators).size > 0
+
+    def reachable_in_region(self, start, region: Region,
+                            operators: Optional[Sequence] = None) -> np.ndarray:
+        """Reachable cell indices that satisfy region(states, D)."""
+        cells = self.reachable_cells(start, operators)
+        states = self.grid.coords(cells)
+        mask = np.asarray(region(states, self.cell_density[cells]), dtype=bool)
+        return cells[mask]
+
+    def max_reachable_density(self, start, operators: Optional[Sequence] = None) -> float:
+        """Highest density among reachable cells."""
+        return float(self.cell_density[self.reachable_cells(start, operators)].max())
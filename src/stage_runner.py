@@ -0,0 +1,173 @@
+"""
+Stage Runner Module - Conduit Engine v0.3
+
+Run independent analysis stages on a process pool.
+
+Long analysis scripts (isocline_analysis, research runners) chain many
+stages that do not depend on one another. run_tasks() submits them all to
+one pool and returns results keyed by task name, in submission order, so
+output does not depend on which worker finished first. Every task is
+timed inside the process that ran it.
+
+Large read-only inputs (grid indices, isocline points) go through
+SharedArray: the array is copied into a named shared-memory block once
+and pickles as a small handle, so workers attach to it instead of
+receiving a copy per task.
+
+A task with a cache key (built with cache.cache_key from everything its
+result depends on, including a version to bump when the stage changes)
+is stored as a pickle under CACHE_DIR/stage_results/ and loaded instead
+of rerun next time.
+"""
+
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cache import cache_path
+
+
+CACHE_NAMESPACE = "stage_results"
+
+
+@dataclass(frozen=True)
+class Task:
+    """One stage: func(*args, **kwargs), reported under `name`."""
+    name: str
+    func: Callable
+    args: Tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    key: Optional[str] = None             # cache key; None = never cached
+
+
+@dataclass
+class RunReport:
+    """Results and timings of run_tasks."""
+    results: Dict[str, Any]           # task name → return value, in task order
+    timings: Dict[str, float]         # task name → seconds inside its worker (run tasks only)
+    wall_time: float                  # seconds for the whole run
+    reused: Tuple[str, ...] = ()      # tasks loaded from the cache
+
+    def timing_table(self) -> str:
+        """Per-task timings as aligned text, slowest first."""
+        width = max([len("wall time")] + [len(name) for name in self.timings])
+        lines = [f"{name:{width}s}  {seconds:8.3f}s"
+                 for name, seconds in sorted(self.timings.items(), key=lambda kv: -kv[1])]
+        lines.append(f"{'wall time':{width}s}  {self.wall_time:8.3f}s")
+        return "\n".join(lines)
+
+
+def _run_timed(task: Task) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = task.func(*task.args, **task.kwargs)
+    return result, time.perf_counter() - start
+
+
+def run_tasks(
+    tasks: Sequence[Task],
+    n_workers: int = 1,
+    use_cache: bool = True,
+    cache_root: Optional[Path] = None,
+) -> RunReport:
+    """
+    Run independent tasks, in-process or on a process pool.
+
+    Parameters:
+        tasks: Tasks with unique names; functions and arguments must be
+            picklable when n_workers > 1
+        n_workers: Worker processes (1 runs in-process, in order)
+        use_cache: Load and store results of tasks that have a key
+        cache_root: Override the cache directory
+
+    Returns:
+        RunReport
+    """
+    names = [task.name for task in tasks]
+    if len(set(names)) != len(names):
+        raise ValueError("Task names must be unique")
+
+    start = time.perf_counter()
+    results, paths, pending = {}, {}, []
+    for task in tasks:
+        if use_cache and task.key is not None:
+            paths[task.name] = cache_path(CACHE_NAMESPACE, task.key, ".pkl", root=cache_root)
+            if paths[task.name].exists():
+                with open(paths[task.name], "rb") as f:
+                    results[task.name] = pickle.load(f)
+                continue
+        pending.append(task)
+
+    n_workers = max(1, min(n_workers, len(pending)))
+    if n_workers == 1:
+        outcomes = [_run_timed(task) for task in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            # Submit everything at once; collect in submission order
+            futures = [pool.submit(_run_timed, task) for task in pending]
+            outcomes = [future.result() for future in futures]
+
+    timings = {}
+    for task, (result, seconds) in zip(pending, outcomes):
+        results[task.name], timings[task.name] = result, seconds
+        if task.name in paths:
+            tmp = paths[task.name].with_suffix(".partial.pkl")
+            with open(tmp, "wb") as f:
+                pickle.dump(result, f)
+            os.replace(tmp, paths[task.name])
+    wall_time = time.perf_counter() - start
+
+    return RunReport(
+        results={name: results[name] for name in names},
+        timings=timings,
+        wall_time=wall_time,
+        reused=tuple(name for name in names if name not in timings),
+    )
+
+
+class SharedArray:
+    """
+    A NumPy array in a named shared-memory block.
+
+    The creating process owns the block and must call close() (or use it
+    as a context manager) to free it. Pickled copies attach to the same
+    block without copying the data.
+    """
+
+    def __init__(self, array: np.ndarray):
+        array = np.ascontiguousarray(array)
+        self.shape, self.dtype = array.shape, array.dtype
+        self._owner = True
+        self._shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.array[...] = array
+
+    @property
+    def array(self) -> np.ndarray:
+        """View of the shared data."""
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+
+    def __getstate__(self):
+        return {"name": self._shm.name, "shape": self.shape, "dtype": self.dtype.str}
+
+    def __setstate__(self, state):
+        self.shape, self.dtype = state["shape"], np.dtype(state["dtype"])
+        self._owner = False
+        self._shm = shared_memory.SharedMemory(name=state["name"])
+
+    def close(self) -> None:
+        """Detach; the owner also frees the block."""
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,255 @@
+"""
+State Lookup Module - Conduit Engine v0.3
+
+Nearest-calibrated-state classification for large point sets.
+
+Labelling sweep points with their closest calibrated state is a scan over
+every anchor per point. The lookup replaces it with a precomputed
+quantized Voronoi map of [0, 1]^5:
+
+- The cube is split into resolution^5 cells. Each cell stores the anchor
+  whose Voronoi region contains the whole cell, or -1 when a region
+  boundary may cross it.
+- A cell lies inside anchor i's region exactly when it is on i's side of
+  every bisector hyperplane. For a box with half-width h around c, this is
+      |c - a_j|² - |c - a_i|² > 2h·|a_i - a_j|₁    for all j ≠ i
+- Lookup quantizes each point and gathers its cell label. Only points in
+  boundary cells (or outside the cube) are refined by an exact distance
+  scan, so labels always equal the brute-force argmin, including
+  lowest-index tie-breaking.
+
+Tables are cached in memory and as compressed .npz under
+CACHE_DIR/state_lookup/, written through a temporary file.
+The cache key hashes the anchor names and vectors (i.e. the calibration
+version), the resolution and the formula version, so recalibrating simply
+misses the cache.
+"""
+
+import os
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .cache import cache_key, cache_path
+from .density_models import FORMULA_VERSION
+from .encoder import StateVector
+
+try:
+    from .calibration_registry import CALIBRATION_AVAILABLE, calibration_arrays, calibration_index
+except ImportError:
+    CALIBRATION_AVAILABLE = False
+
+
+CACHE_NAMESPACE = "state_lookup"
+AMBIGUOUS = -1
+
+# Bisector margins below this are treated as touching the cell
+_MARGIN_TOLERANCE = 1e-9
+
+
+def _label_dtype(n_anchors: int) -> np.dtype:
+    return np.dtype(np.int8 if n_anchors < 128 else np.int32)
+
+
+def _squared_distance_offsets(anchors: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """(N, M) array of |a|² - 2a·x, i.e. squared distances up to |x|²."""
+    sq = np.einsum("ij,ij->i", anchors, anchors)[:, None]
+    return sq - 2.0 * (anchors @ points.T)
+
+
+def brute_force_labels(anchors: np.ndarray, points: np.ndarray,
+                       chunk_size: int = 1 << 18) -> np.ndarray:
+    """
+    Index of the nearest anchor for every point, by scanning all anchors.
+
+    Parameters:
+        anchors: (N, 5) anchor vectors
+        points: (M, 5) query points
+        chunk_size: Points processed per block
+
+    Returns:
+        (M,) anchor indices (ties go to the lowest index)
+    """
+    anchors = np.asarray(anchors, dtype=float)
+    points = np.asarray(points, dtype=float).reshape(-1, 5)
+    labels = np.empty(len(points), dtype=_label_dtype(len(anchors)))
+    for start in range(0, len(points), chunk_size):
+        block = points[start:start + chunk_size]
+        labels[start:start + len(block)] = _squared_distance_offsets(anchors, block).argmin(axis=0)
+    return labels
+
+
+def build_label_table(anchors: np.ndarray, resolution: int) -> np.ndarray:
+    """
+    Cell → anchor table for a resolution^5 quantization of [0, 1]^5.
+
+    Cells are indexed in C order over (φ, τ, ρ, H, κ). A cell gets the
+    index of the anchor whose Voronoi region contains all of it, or
+    AMBIGUOUS when a bisector passes within the cell.
+    """
+    anchors = np.asarray(anchors, dtype=float)
+    n_anchors = len(anchors)
+    centers = (np.arange(resolution) + 0.5) / resolution
+    half = 0.5 / resolution
+    slack = 2.0 * half * np.abs(anchors[:, None, :] - anchors[None, :, :]).sum(axis=2)
+
+    # Split each cell's offset |a|² - 2a·c into a part from the first two
+    # axes and a precomputed part from the last three
+    tail = np.stack(np.meshgrid(centers, centers, centers, indexing="ij"), axis=-1).reshape(-1, 3)
+    tail_offsets = (np.einsum("ij,ij->i", anchors, anchors)[None, :]
+                    - 2.0 * (tail @ anchors[:, 2:].T))
+    rows = np.arange(len(tail))
+
+    table = np.empty(resolution ** 5, dtype=_label_dtype(n_anchors))
+    block = len(tail)
+    for head in range(resolution ** 2):
+        c0, c1 = centers[head // resolution], centers[head % resolution]
+        d2 = tail_offsets - 2.0 * (c0 * anchors[:, 0] + c1 * anchors[:, 1])
+        nearest = d2.argmin(axis=1)
+        margin = d2 - d2[rows, nearest][:, None] - slack[nearest]
+        # Only the nearest anchor itself may have a non-positive margin
+        safe = (margin <= _MARGIN_TOLERANCE).sum(axis=1) == 1
+        table[head * block:(head + 1) * block] = np.where(safe, nearest, AMBIGUOUS)
+    return table
+
+
+class StateLookup:
+    """
+    Quantized Voronoi lookup of the nearest calibrated state.
+
+    Parameters:
+        names: Anchor (state) names
+        anchors: (N, 5) anchor vectors
+        resolution: Cells per axis (resolution^5 cells)
+        table: Precomputed label table (built when omitted)
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        anchors: np.ndarray,
+        resolution: int = 32,
+        table: Optional[np.ndarray] = None,
+    ):
+        if resolution < 1:
+            raise ValueError(f"resolution must be at least 1, got {resolution}")
+        self.names = tuple(names)
+        self.anchors = np.asarray(anchors, dtype=float).reshape(-1, 5)
+        if len(self.anchors) != len(self.names) or not self.names:
+            raise ValueError("Need one 5-vector per anchor name and at least one anchor")
+        self.resolution = resolution
+        self.table = build_label_table(self.anchors, resolution) if table is None else table
+        self._strides = (resolution ** np.arange(4, -1, -1)).astype(np.int32)
+        self._sq = np.einsum("ij,ij->i", self.anchors, self.anchors)[:, None]
+
+    @property
+    def ambiguous_fraction(self) -> float:
+        """Share of cells that need exact refinement."""
+        return float(np.mean(self.table == AMBIGUOUS))
+
+    def _classify_block(self, points: np.ndarray) -> np.ndarray:
+        lo, hi = points.min(initial=0.0), points.max(initial=0.0)
+        inside = lo >= 0.0 and hi <= 1.0       # False for NaN as well
+        cells = (points * self.resolution).astype(np.int32)
+        np.clip(cells, 0, self.resolution - 1, out=cells)
+        labels = self.table[cells @ self._strides]
+        if inside:
+            refine = np.flatnonzero(labels == AMBIGUOUS)
+        else:
+            outside = ~((points >= 0.0) & (points <= 1.0)).all(axis=1)
+            refine = np.flatnonzero((labels == AMBIGUOUS) | outside)
+        if refine.size:
+            offsets = self._sq - 2.0 * (self.anchors @ points[refine].T)
+            labels[refine] = offsets.argmin(axis=0)
+        return labels
+
+    def classify(self, points: np.ndarray, chunk_size: int = 1 << 18) -> np.ndarray:
+        """
+        Index of the nearest anchor for every point.
+
+        Parameters:
+            points: (M, 5) array of φ, τ, ρ, H, κ (points outside [0, 1]^5
+                are handled by the exact scan)
+            chunk_size: Points processed per block
+
+        Returns:
+            (M,) indices into self.names, identical to brute_force_labels
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 5)
+        labels = np.empty(len(points), dtype=self.table.dtype)
+        for start in range(0, len(points), chunk_size):
+            block = points[start:start + chunk_size]
+            labels[start:start + len(block)] = self._classify_block(block)
+        return labels
+
+    def distances(self, points: np.ndarray, labels: Optional[np.ndarray] = None) -> np.ndarray:
+        """Euclidean distance from each point to its (nearest) anchor."""
+        points = np.asarray(points, dtype=float).reshape(-1, 5)
+        labels = self.classify(points) if labels is None else labels
+        return np.linalg.norm(points - self.anchors[labels], axis=1)
+
+    def nearest(self, state: Union[StateVector, Sequence[float]]) -> Tuple[str, float]:
+        """Name of and distance to the calibrated state closest to one point."""
+        vec = state.to_vector() if isinstance(state, StateVector) else state
+        point = np.asarray(vec, dtype=float).reshape(1, 5)
+        label = self.classify(point)
+        return self.names[int(label[0])], float(self.distances(point, label)[0])
+
+
+# Process-wide memo of loaded tables, by cache key
+_TABLES: Dict[str, StateLookup] = {}
+
+
+def clear_lookup_cache() -> None:
+    """Drop in-memory lookup tables (on-disk entries remain)."""
+    _TABLES.clear()
+
+
+def nearest_state_lookup(
+    resolution: int = 32,
+    category: Optional[str] = None,
+    use_cache: bool = True,
+    cache_root=None,
+) -> StateLookup:
+    """
+    Build (or load from the cache) the lookup over the calibrated states.
+
+    Parameters:
+        resolution: Cells per axis; 32 labels 10^7 points in about a second
+        category: Restrict anchors to one CalibrationIndex category
+            (e.g. "anesthesia")
+        use_cache: Load/save the table in memory and under the cache directory
+        cache_root: Override the cache directory
+
+    Returns:
+        StateLookup whose names are registry keys
+
+    Raises:
+        ValueError if the calibration library is not available or the
+        category is unknown
+    """
+    if not CALIBRATION_AVAILABLE:
+        raise ValueError("Calibration library not available")
+    arrays = calibration_arrays()
+    names = arrays.names
+    if category is not None:
+        names = calibration_index().members(category)
+    anchors = arrays.invariants[[arrays.index(name) for name in names]]
+
+    key = cache_key(names=names, anchors=anchors.tolist(), resolution=resolution,
+                    formula=FORMULA_VERSION)
+    if use_cache and key in _TABLES:
+        return _TABLES[key]
+    path = cache_path(CACHE_NAMESPACE, key, ".npz", root=cache_root)
+    if use_cache and path.exists():
+        with np.load(path) as cached:
+            lookup = StateLookup(names, anchors, resolution, table=cached["table"])
+    else:
+        lookup = StateLookup(names, anchors, resolution)
+        if use_cache:
+            tmp = path.with_suffix(".partial.npz")
+            np.savez_compressed(tmp, table=lookup.table)
+            os.replace(tmp, path)
+    if use_cache:
+        _TABLES[key] = lookup
+    return lookup
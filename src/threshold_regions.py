@@ -0,0 +1,279 @@
+"""
+Threshold Regions Module - Conduit Engine v0.3
+
+Certified regions of a box where D is above or below a threshold c.
+
+Write D = φ · Q with Q = τρ · G and gate G = 1 - s + s²κ (s = √H).
+Over a box, τρ ranges over [τ_lo ρ_lo, τ_hi ρ_hi]. The gate increases
+with κ and is convex in s, so its range comes from the corners plus the
+vertex s = 1 / (2κ_lo). density_bounds() uses this to give the exact
+range of D over any batch of boxes.
+
+D is linear in φ, so φ is never split. Take a box in (τ, ρ, H, κ) with Q
+in [Q_lo, Q_hi]. Every point with φ >= c / Q_lo has D >= c, and every
+point with φ <= c / Q_hi has D <= c. Only the φ slab in between is
+undecided. The branch-and-bound splits the boxes with the largest
+undecided volume first. Each split halves the axis that contributes
+most to the spread of ln Q. It stops when the undecided volume is below
+atol or the box budget is used up; `converged` records which one. The
+result is three sets of 5D boxes: certified above, certified below, and
+boundary.
+
+The undecided volume only shrinks about as N^(-1/4) in the number of
+boxes, so the volume bounds stay a few percent wide at any practical
+budget. For volumes use DensityDistribution(box).cdf(c), which is
+exact; the boxes are for geometry, e.g. extent().
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from .density_distribution import Box, box_bounds
+
+
+# Bounds are widened by a few ulps so rounding in density_batch cannot
+# cross a certified bound
+_PAD = 8 * np.finfo(float).eps
+
+
+def _gate(s, kappa):
+    return 1.0 - s + s * s * kappa
+
+
+def gate_range(H: np.ndarray, kappa: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact range of the gate (1 - √H) + Hκ over boxes.
+
+    Parameters:
+        H: (..., 2) [low, high] bounds on H
+        kappa: (..., 2) [low, high] bounds on κ
+
+    Returns:
+        (g_min, g_max), each of shape (...)
+    """
+    s = np.sqrt(np.asarray(H, dtype=float))
+    kappa = np.asarray(kappa, dtype=float)
+    s_lo, s_hi = s[..., 0], s[..., 1]
+    k_lo, k_hi = kappa[..., 0], kappa[..., 1]
+
+    g_max = np.maximum(_gate(s_lo, k_hi), _gate(s_hi, k_hi))
+    g_min = np.minimum(_gate(s_lo, k_lo), _gate(s_hi, k_lo))
+    with np.errstate(divide="ignore"):
+        vertex = 0.5 / k_lo                                    # inf for κ_lo = 0
+    inside = (vertex > s_lo) & (vertex < s_hi)
+    g_vertex = 1.0 - 0.25 / np.where(inside, k_lo, 1.0)
+    return np.where(inside, np.minimum(g_min, g_vertex), g_min), g_max
+
+
+def density_bounds(boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact range of D over each box.
+
+    Parameters:
+        boxes: (..., 5, 2) [low, high] bounds in INVARIANTS order
+
+    Returns:
+        (D_min, D_max), each of shape (...)
+    """
+    boxes = np.asarray(boxes, dtype=float)
+    g_min, g_max = gate_range(boxes[..., 3, :], boxes[..., 4, :])
+    return (np.prod(boxes[..., :3, 0], axis=-1) * g_min,
+            np.prod(boxes[..., :3, 1], axis=-1) * g_max)
+
+
+def box_volumes(boxes: np.ndarray) -> np.ndarray:
+    """Volume of each (..., k, 2) box."""
+    boxes = np.asarray(boxes, dtype=float)
+    return np.prod(boxes[..., 1] - boxes[..., 0], axis=-1)
+
+
+@dataclass
+class ThresholdRegions:
+    """Certified boxes on each side of a threshold; all boxes are (n, 5, 2)."""
+    threshold: float
+    bounds: np.ndarray            # (5, 2) box that was searched
+    above: np.ndarray             # D >= threshold everywhere
+    below: np.ndarray             # D <= threshold everywhere
+    boundary: np.ndarray          # undecided; contains the surface D = threshold
+    n_evaluated: int              # boxes whose bounds were computed
+    converged: bool               # undecided <= atol (False: budget ran out first)
+
+    def _fraction(self, boxes: np.ndarray) -> float:
+        return float(box_volumes(boxes).sum() / box_volumes(self.bounds))
+
+    @property
+    def undecided(self) -> float:
+        """Fraction of the box not certified either way."""
+        return self._fraction(self.boundary)
+
+    @property
+    def fraction_above(self) -> Tuple[float, float]:
+        """Certified (lower, upper) bounds on the fraction of the box with D >= threshold."""
+        low = self._fraction(self.above)
+        return low, low + self.undecided
+
+    @property
+    def fraction_below(self) -> Tuple[float, float]:
+        """Certified (lower, upper) bounds on the fraction of the box with D <= threshold."""
+        low = self._fraction(self.below)
+        return low, low + self.undecided
+
+    def extent(self, side: str = "below") -> np.ndarray:
+        """
+        (5, 2) bounding box of every point that may lie on `side`.
+
+        It covers the certified boxes of that side and the boundary, so
+        every point outside it is certified to lie on the other side.
+        """
+        if side not in ("above", "below"):
+            raise ValueError(f"side must be 'above' or 'below', got {side!r}")
+        boxes = np.concatenate([getattr(self, side), self.boundary])
+        if not len(boxes):
+            return np.full((5, 2), np.nan)
+        return np.stack([boxes[:, :, 0].min(axis=0), boxes[:, :, 1].max(axis=0)], axis=-1)
+
+    def to_dict(self) -> dict:
+        return {
+            "threshold": self.threshold,
+            "fraction_above": list(self.fraction_above),
+            "fraction_below": list(self.fraction_below),
+            "undecided": self.undecided,
+            "n_boundary_boxes": len(self.boundary),
+            "n_evaluated": self.n_evaluated,
+            "converged": self.converged,
+        }
+
+
+def phi_cuts(threshold: float, boxes: np.ndarray, phi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    φ values bounding the undecided slab of each (τ, ρ, H, κ) box.
+
+    Parameters:
+        threshold: D threshold c
+        boxes: (n, 4, 2) bounds on (τ, ρ, H, κ)
+        phi: [low, high] range of φ
+
+    Returns:
+        (cut_lo, cut_hi), clipped to the φ range: below cut_lo D <= c,
+        above cut_hi D >= c. The surface D = c passes over a box only
+        where cut_lo < cut_hi.
+    """
+    if threshold <= 0:
+        cut = np.full(len(boxes), phi[0])
+        return cut, cut
+    g_min, g_max = gate_range(boxes[:, 2], boxes[:, 3])
+    q_lo = boxes[:, 0, 0] * boxes[:, 1, 0] * g_min * (1.0 - _PAD)
+    q_hi = boxes[:, 0, 1] * boxes[:, 1, 1] * g_max * (1.0 + _PAD)
+    with np.errstate(divide="ignore"):
+        cut_lo = threshold / q_hi
+        cut_hi = threshold / q_lo
+    return np.clip(cut_lo, phi[0], phi[1]), np.clip(cut_hi, phi[0], phi[1])
+
+
+def _split(boxes: np.ndarray) -> np.ndarray:
+    """
+    Halve each (τ, ρ, H, κ) box along the axis that contributes most to
+    the spread of ln Q, estimated as |∂ln Q/∂x| × width at the centre.
+    """
+    width = boxes[..., 1] - boxes[..., 0]
+    tau, rho, H, kappa = boxes.mean(axis=-1).T
+    s = np.sqrt(H)
+    gate = np.maximum(_gate(s, kappa), 1e-300)
+    score = width * np.stack([
+        1.0 / tau,
+        1.0 / rho,
+        np.abs(kappa - 0.5 / s) / gate,
+        H / gate,
+    ], axis=1)
+    axis = np.argmax(score, axis=1)
+    rows = np.arange(len(boxes))
+    middle = 0.5 * (boxes[rows, axis, 0] + boxes[rows, axis, 1])
+
+    low, high = boxes.copy(), boxes.copy()
+    low[rows, axis, 1] = middle
+    high[rows, axis, 0] = middle
+    return np.concatenate([low, high])
+
+
+def _slabs(boxes: np.ndarray, start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+    """5D boxes [start, stop] × box for the boxes where the slab is non-empty."""
+    keep = stop > start
+    phi = np.stack([start[keep], stop[keep]], axis=-1)[:, None, :]
+    return np.concatenate([phi, boxes[keep]], axis=1)
+
+
+def threshold_regions(
+    threshold: float,
+    box: Box = None,
+    atol: float = 0.1,
+    max_boxes: int = 1 << 18,
+) -> ThresholdRegions:
+    """
+    Branch-and-bound for the regions of a box where D >= or <= threshold.
+
+    Parameters:
+        threshold: D threshold c
+        box: None for [0, 1]^5, a dict {invariant: (low, high)} for a
+            sub-box (other axes span [0, 1]), or a (5, 2) bounds array
+        atol: Stop once the undecided fraction of the box is at most atol
+            (the default is reached within the default budget)
+        max_boxes: Budget of (τ, ρ, H, κ) boxes to evaluate
+
+    Returns:
+        ThresholdRegions; converged is False when max_boxes ran out
+        before the undecided fraction reached atol
+    """
+    if not atol >= 0:
+        raise ValueError(f"atol must be non-negative, got {atol}")
+    if max_boxes < 1:
+        raise ValueError(f"max_boxes must be positive, got {max_boxes}")
+    bounds = box_bounds(box)
+    phi = bounds[0]
+    target = atol * box_volumes(bounds)
+
+    boxes = bounds[None, 1:].copy()
+    cut_lo, cut_hi = phi_cuts(threshold, boxes, phi)
+    n_evaluated = 1
+    above, below, boundary = [], [], []
+
+    while True:
+        undecided = box_volumes(boxes) * (cut_hi - cut_lo)
+
+        # Fully certified boxes are final
+        done = undecided <= 0
+        below.append(_slabs(boxes[done], np.full(done.sum(), phi[0]), cut_lo[done]))
+        above.append(_slabs(boxes[done], cut_hi[done], np.full(done.sum(), phi[1])))
+        boxes, cut_lo, cut_hi = boxes[~done], cut_lo[~done], cut_hi[~done]
+        undecided = undecided[~done]
+
+        n_split = min(len(boxes), (max_boxes - n_evaluated) // 2)
+        if n_split == 0 or undecided.sum() <= target:
+            break
+
+        # Largest undecided volume first
+        order = np.argsort(-undecided, kind="stable")
+        split, kept = order[:n_split], order[n_split:]
+        children = _split(boxes[split])
+        child_lo, child_hi = phi_cuts(threshold, children, phi)
+        n_evaluated += len(children)
+        boxes = np.concatenate([boxes[kept], children])
+        cut_lo = np.concatenate([cut_lo[kept], child_lo])
+        cut_hi = np.concatenate([cut_hi[kept], child_hi])
+
+    n = len(boxes)
+    below.append(_slabs(boxes, np.full(n, phi[0]), cut_lo))
+    boundary.append(_slabs(boxes, cut_lo, cut_hi))
+    above.append(_slabs(boxes, cut_hi, np.full(n, phi[1])))
+    boundary = np.concatenate(boundary)
+
+    return ThresholdRegions(
+        threshold=float(threshold),
+        bounds=bounds,
+        above=np.concatenate(above),
+        below=np.concatenate(below),
+        boundary=boundary,
+        n_evaluated=n_evaluated,
+        converged=bool(box_volumes(boundary).sum() <= target),
+    )
@@ -9,9 +9,16 @@ for the v9.2 density formula:
 """
 
 import pytest
+import src.cache
 from src.encoder import StateVector
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Keep disk-memoized results out of the repository's .cache/."""
+    monkeypatch.setattr(src.cache, "CACHE_DIR", tmp_path / "cache")
+
+
 # ---------------------------------------------------------------------------
 # CANON reference states (from CANON.md)
 # ---------------------------------------------------------------------------
@@ -21,6 +28,8 @@ from src.encoder import StateVector
 # applied to the CANON parameter vectors.  The published CANON.md table
 # may show rounded or independently-calibrated D values; the tests use
 # the formula-derived values so they validate the code, not the table.
+# The vectors are copied by hand so they check the calibration library's
+# shared CANON table (test_calibration_registry) rather than come from it.
 CANON_STATES = {
     "Wakefulness":  {"phi": 0.80, "tau": 0.75, "rho": 0.65, "H": 0.50, "kappa": 0.65, "D": 0.240978},
     "Propofol":     {"phi": 0.25, "tau": 0.10, "rho": 0.24, "H": 0.35, "kappa": 0.20, "D": 0.002870},
@@ -0,0 +1,124 @@
+"""
+Tests for the analysis module's degeneracy search.
+
+Validates:
+- The sorted-by-D sweep returns exactly what the all-pairs scan returns
+- Top-k by topology distance matches brute force with τ and κ varied
+- The response cube matches the scalar formulas and round-trips the disk cache
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from src.analysis import (
+    analyze_asymptotic_behavior,
+    find_fixed_points,
+    gradient_comparison,
+    perspectival_density,
+    perspectival_density_additive,
+    response_cube,
+)
+
+
+def _brute_force(resolution, H_values, tau_values, kappa_values,
+                 d_tolerance=0.001, min_topology_diff=0.5):
+    """All qualifying pairs, in grid enumeration order."""
+    states = []
+    for phi in np.linspace(0.1, 0.9, resolution):
+        for rho in np.linspace(0.1, 0.9, resolution):
+            for H in H_values:
+                for tau in tau_values:
+                    for kappa in kappa_values:
+                        states.append((phi, tau, rho, H, kappa,
+                                       perspectival_density(phi, tau, rho, H, kappa)))
+    pairs = []
+    for (i, s1), (j, s2) in itertools.combinations(enumerate(states), 2):
+        topo = sum(abs(a - b) for a, b in zip(s1[:5], s2[:5]))
+        if abs(s1[5] - s2[5]) < d_tolerance and topo > min_topology_diff:
+            pairs.append((s1, s2, topo))
+    return pairs
+
+
+def _as_tuple(s):
+    return (s['phi'], s['tau'], s['rho'], s['H'], s['kappa'])
+
+
+class TestFindFixedPoints:
+    """Degenerate (equal-D, different-topology) pair search."""
+
+    def test_matches_all_pairs_scan(self):
+        """Default call returns the first 20 pairs of the original double loop."""
+        expected = _brute_force(20, (0.3, 0.5, 0.7), (0.5,), (0.5,))[:20]
+        result = find_fixed_points()
+        assert len(result) == 20
+        for pair, (s1, s2, topo) in zip(result, expected):
+            assert _as_tuple(pair['state1']) == pytest.approx(s1[:5])
+            assert _as_tuple(pair['state2']) == pytest.approx(s2[:5])
+            assert pair['topology_diff'] == pytest.approx(topo)
+            assert pair['density_diff'] < 0.001
+
+    def test_top_k_by_topology(self):
+        """Ranked mode returns the largest topology distances."""
+        kwargs = dict(H_values=(0.2, 0.8), tau_values=(0.3, 0.9),
+                      kappa_values=(0.1, 0.9))
+        pairs = _brute_force(8, **kwargs)
+        expected = sorted((p[2] for p in pairs), reverse=True)[:10]
+        result = find_fixed_points(8, top_k=10, rank_by_topology=True, **kwargs)
+        assert [p['topology_diff'] for p in result] == pytest.approx(expected)
+
+    def test_no_pairs(self):
+        """An impossible topology threshold yields no pairs."""
+        assert find_fixed_points(10, min_topology_diff=5.0) == []
+
+
+class TestResponseCube:
+    """Vectorized response along every axis."""
+
+    def test_matches_scalar_formulas(self, tmp_path):
+        cube = response_cube(H_values=(0.2, 0.7), kappa_values=(0.1, 0.9),
+                             resolution=11, cache_root=tmp_path)
+        assert cube['densities'].shape == (2, 5, 2, 2, 11)
+        v = cube['variables'].index('H')
+        for k, kappa in enumerate(cube['kappa_values']):
+            for r, val in enumerate(cube['range']):
+                assert cube['densities'][0, v, 0, k, r] == pytest.approx(
+                    perspectival_density(0.9, 0.9, 0.9, val, kappa))
+                assert cube['densities'][1, v, 0, k, r] == pytest.approx(
+                    perspectival_density_additive(0.9, 0.9, 0.9, val, kappa))
+
+    def test_disk_memo_round_trip(self, tmp_path):
+        first = response_cube(resolution=7, cache_root=tmp_path)
+        assert len(list(tmp_path.rglob("*.npz"))) == 1
+        second = response_cube(resolution=7, cache_root=tmp_path)
+        assert np.array_equal(first['densities'], second['densities'])
+        response_cube(resolution=8, cache_root=tmp_path)
+        assert len(list(tmp_path.rglob("*.npz"))) == 2
+
+    def test_gradient_comparison_slices_cube(self):
+        data = gradient_comparison('tau', H=0.4, kappa=0.6)
+        expected = [perspectival_density(0.9, t, 0.9, 0.4, 0.6) for t in data['range']]
+        assert data['densities'] == pytest.approx(expected)
+        with pytest.raises(ValueError):
+            gradient_comparison('psi')
+
+    @pytest.mark.parametrize("kwargs", [
+        dict(H_values=(-0.5,)), dict(kappa_values=(1.5,)), dict(H_values=(3.0,)),
+        dict(low=-0.1), dict(high=1.2), dict(base={'rho': 2.0}),
+    ])
+    def test_out_of_range_rejected(self, kwargs, tmp_path):
+        with pytest.raises(ValueError):
+            response_cube(resolution=5, cache_root=tmp_path, **kwargs)
+        assert not list(tmp_path.rglob("*.npz"))
+
+    def test_gradient_comparison_validates(self):
+        with pytest.raises(ValueError):
+            gradient_comparison('phi', H=-0.5)
+        with pytest.raises(ValueError):
+            gradient_comparison('phi', kappa=3.0)
+
+    def test_slices_not_memoized(self, tmp_path):
+        gradient_comparison('rho')
+        analyze_asymptotic_behavior(resolution=10)
+        assert not list(tmp_path.rglob("*.npz"))
@@ -0,0 +1,110 @@
+"""
+Tests for the columnar empirical-to-invariant mappers.
+
+Validates:
+- Each array mapper agrees with its scalar counterpart element by element
+- Out-of-range inputs are rejected like the scalar mappers
+- Bulk create_grounded_states matches create_grounded_state row by row
+- Missing measurements (NaN) fall back to overrides, then to defaults
+"""
+
+import numpy as np
+import pytest
+
+import src.encoder  # noqa: F401  (puts calibration/ on sys.path)
+import mapping_functions as mf
+
+
+SCALAR_VS_ARRAY = [
+    (mf.pci_to_rho, mf.pci_to_rho_array, [0.0, 0.12, 0.44, 0.67, 1.0]),
+    (mf.lzc_to_H, mf.lzc_to_H_array, [0.0, 0.35, 0.5, 0.6, 1.0]),
+    (mf.lzc_percent_change_to_H, mf.lzc_percent_change_to_H_array, [-100, -45, -30, 0, 15, 31, 150]),
+    (mf.temporal_window_to_tau, mf.temporal_window_to_tau_array, [0, 500, 1000, 2500, 4000, 5000, 9000]),
+    (mf.effective_connectivity_to_phi, mf.effective_connectivity_to_phi_array, [0.0, 0.25, 1.0, 1.5]),
+    (mf.connectivity_reduction_to_phi, mf.connectivity_reduction_to_phi_array, [0, 25, 75, 100]),
+]
+
+
+class TestArrayMappers:
+    """Array-in/array-out mappers."""
+
+    @pytest.mark.parametrize("scalar, vectorized, inputs", SCALAR_VS_ARRAY,
+                             ids=[s.__name__ for s, _, _ in SCALAR_VS_ARRAY])
+    def test_matches_scalar(self, scalar, vectorized, inputs):
+        column = vectorized(np.array(inputs, dtype=float))
+        assert len(column) == len(inputs)
+        for i, x in enumerate(inputs):
+            expected = scalar(x)
+            got = column.value_at(i)
+            assert got.value == pytest.approx(expected.value)
+            assert got.confidence == expected.confidence
+            assert got.source == expected.source
+            assert got.empirical_measure == pytest.approx(expected.empirical_measure)
+
+    def test_provenance_stored_once(self):
+        column = mf.pci_to_rho_array(np.linspace(0, 1, 10_000))
+        assert column.sources == ("PCI direct mapping",)
+        assert column.confidence.dtype == np.int8
+
+    def test_out_of_range_rejected(self):
+        with pytest.raises(ValueError):
+            mf.pci_to_rho_array([0.2, 1.3])
+        with pytest.raises(ValueError):
+            mf.lzc_to_H_array([-0.1])
+
+    def test_nan_propagates(self):
+        column = mf.connectivity_reduction_to_phi_array([np.nan, 50])
+        assert np.isnan(column.values[0])
+        assert column.values[1] == pytest.approx(0.4)
+
+
+class TestCreateGroundedStates:
+    """Bulk construction from a measurement table."""
+
+    def test_matches_scalar_constructor(self):
+        table = {
+            "pci_min": [0.44, 0.12, 0.30],
+            "pci_max": [0.67, 0.31, 0.50],
+            "lzc_change": [0, -30, 20],
+            "connectivity_reduction": [0, 75, 40],
+            "tau": [0.5, 0.1, 0.7],
+            "kappa": [0.5, 0.2, 0.8],
+        }
+        result = mf.create_grounded_states(table, names=["a", "b", "c"])
+        assert len(result) == 3
+        for i, name in enumerate(result.names):
+            expected = mf.create_grounded_state(
+                name=name,
+                pci=(table["pci_min"][i], table["pci_max"][i]),
+                lzc_change=table["lzc_change"][i],
+                connectivity_reduction=table["connectivity_reduction"][i],
+                tau_override=table["tau"][i],
+                kappa_override=table["kappa"][i],
+            )
+            state = result.state(i)
+            assert result.density()[i] == pytest.approx(expected.density())
+            assert state.overall_confidence() == expected.overall_confidence()
+            assert mf.CONFIDENCE_ORDER[result.overall_confidence()[i]] == expected.overall_confidence()
+            for var in ("phi", "tau", "rho", "H", "kappa"):
+                assert getattr(state, var).value == pytest.approx(getattr(expected, var).value)
+                assert getattr(state, var).source == getattr(expected, var).source
+
+    def test_missing_values_fall_back(self):
+        result = mf.create_grounded_states({
+            "pci": [0.5, np.nan, np.nan],
+            "rho": [np.nan, 0.3, np.nan],
+        })
+        assert result.rho.values == pytest.approx([0.5, 0.3, 0.5])
+        assert [result.rho.value_at(i).source for i in range(3)] == [
+            "PCI direct mapping", "manual override", "no data"]
+        assert result.rho.confidence_levels() == [
+            mf.Confidence.HIGH, mf.Confidence.LOW, mf.Confidence.THEORETICAL]
+        assert result.phi.values == pytest.approx([0.8, 0.8, 0.8])
+
+    def test_column_validation(self):
+        with pytest.raises(ValueError, match="Unknown"):
+            mf.create_grounded_states({"psi": [1.0]})
+        with pytest.raises(ValueError, match="lengths"):
+            mf.create_grounded_states({"pci": [0.5], "lzc_change": [0, 1]})
+        with pytest.raises(ValueError, match="together"):
+            mf.create_grounded_states({"pci_min": [0.1]})
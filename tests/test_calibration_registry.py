@@ -0,0 +1,148 @@
+"""
+Tests for the memoized calibration registry.
+
+Validates:
+- The registry is built once and shared across calls
+- The mapping and the states in it are read-only
+- The array view matches the per-state values
+- Changing a watched file invalidates the registry
+- Loading all states costs a single calibration build
+- Aliases, categories and the CANON table resolve from one compiled index
+"""
+
+import dataclasses
+import os
+
+import pytest
+
+import src.calibration_registry as registry
+from src.encoder import encode_from_calibration, get_all_calibrated_states
+from src.density_models import compare_states, density_from_state
+
+
+@pytest.fixture
+def fresh_registry():
+    registry.clear_calibration_cache()
+    yield registry
+    registry.clear_calibration_cache()
+
+
+class TestCalibrationRegistry:
+    """Process-wide calibration cache."""
+
+    def test_built_once(self, fresh_registry):
+        assert fresh_registry.calibration_registry() is fresh_registry.calibration_registry()
+
+    def test_read_only(self, fresh_registry):
+        states = fresh_registry.calibration_registry()
+        with pytest.raises(TypeError):
+            states['new_state'] = states['wakefulness']
+        arrays = fresh_registry.calibration_arrays()
+        with pytest.raises(ValueError):
+            arrays.invariants[0, 0] = 0.0
+
+    def test_states_frozen(self, fresh_registry):
+        before, _ = density_from_state('wakefulness')
+        state = fresh_registry.calibration_registry()['wakefulness']
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            state.phi.value = 0.0
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            fresh_registry.get_grounded_state('wakefulness').kappa = state.phi
+        with pytest.raises(AttributeError):
+            state.citations.append("x")
+        assert density_from_state('wakefulness')[0] == before
+
+    def test_array_view(self, fresh_registry):
+        arrays = fresh_registry.calibration_arrays()
+        assert arrays.invariants.shape == (len(arrays.names), 5)
+        row = arrays.index('wakefulness')
+        state = encode_from_calibration('wakefulness')
+        assert arrays.invariants[row] == pytest.approx(state.to_vector())
+        assert arrays.densities[row] == pytest.approx(state.density())
+
+    def test_file_change_invalidates(self, fresh_registry, tmp_path, monkeypatch):
+        watched = tmp_path / "grounded_states.json"
+        watched.write_text("{}")
+        monkeypatch.setattr(fresh_registry, "WATCHED_FILES", (watched,))
+        first = fresh_registry.calibration_registry()
+        assert fresh_registry.calibration_registry() is first
+
+        stat = watched.stat()
+        os.utime(watched, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second = fresh_registry.calibration_registry()
+        assert second is not first
+        assert list(second) == list(first)
+
+    def test_all_states_single_build(self, fresh_registry, monkeypatch):
+        calls = []
+        original = fresh_registry.mapping_functions.get_calibrated_states
+
+        def counting():
+            calls.append(1)
+            return original()
+
+        monkeypatch.setattr(fresh_registry.mapping_functions, "get_calibrated_states", counting)
+        states = get_all_calibrated_states()
+        compare_states(*list(states)[:3])
+        density_from_state('wakefulness')
+        assert len(calls) == 1
+
+    def test_unknown_state(self, fresh_registry):
+        with pytest.raises(ValueError, match="not found"):
+            fresh_registry.get_grounded_state('not_a_state')
+
+
+class TestCalibrationIndex:
+    """Compiled alias, category and CANON tables."""
+
+    def test_every_key_and_display_name_resolves(self, fresh_registry):
+        index = fresh_registry.calibration_index()
+        for key, state in fresh_registry.calibration_registry().items():
+            assert index.resolve(key) == key
+            assert index.resolve(state.name) == key
+
+    @pytest.mark.parametrize("spelling, key", [
+        ("Wakefulness", "wakefulness"),
+        ("REM Sleep", "REM_sleep"),
+        ("rem-sleep", "REM_sleep"),
+        ("NREM N3", "NREM_sleep_N3"),
+        ("Vegetative (UWS)", "vegetative_state"),
+        ("MCS", "minimally_conscious"),
+        ("Psilocybin", "psilocybin"),
+        ("K-hole", "ketamine_anesthesia"),
+    ])
+    def test_aliases(self, fresh_registry, spelling, key):
+        assert fresh_registry.resolve_state_name(spelling) == key
+
+    def test_ambiguous_spelling_left_out(self, fresh_registry):
+        # "Psilocybin (Peak)" and "LSD (Peak)" share the parenthetical
+        assert "peak" not in fresh_registry.calibration_index().aliases
+        with pytest.raises(ValueError, match="not found"):
+            fresh_registry.resolve_state_name("Peak")
+
+    def test_lookups_accept_aliases(self, fresh_registry):
+        assert encode_from_calibration("REM Sleep").to_vector() == \
+            encode_from_calibration("REM_sleep").to_vector()
+        assert density_from_state("Ketamine")[0] == density_from_state("ketamine_anesthesia")[0]
+
+    def test_categories_cover_registry(self, fresh_registry):
+        index = fresh_registry.calibration_index()
+        members = [key for keys in index.categories.values() for key in keys]
+        assert sorted(members) == sorted(fresh_registry.calibration_registry())
+        assert "propofol_anesthesia" in index.members("anesthesia")
+        assert index.category_of["LSD"] == "psychedelic"
+        with pytest.raises(ValueError):
+            index.members("hibernation")
+
+    def test_canon_table_matches_hand_copied_vectors(self, fresh_registry, canon_states):
+        """The library's CANON table agrees with the literal vectors in conftest."""
+        canon = fresh_registry.canon_states()
+        for name, params in canon_states.items():
+            assert {k: v for k, v in params.items() if k != "D"} == dict(canon[name])
+
+    def test_canon_table_shared(self, fresh_registry):
+        canon = fresh_registry.canon_states()
+        for name in canon:
+            fresh_registry.resolve_state_name(name)
+        with pytest.raises(TypeError):
+            canon["Wakefulness"]["phi"] = 0.0
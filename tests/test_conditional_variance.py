@@ -0,0 +1,102 @@
+"""
+Tests for streaming conditional variance.
+
+Validates:
+- RunningMoments.update_grouped matches per-group numpy moments
+- Band assignment matches the |D - target| <= half_width test, overlaps included
+- conditional_variance matches a direct computation on the same samples
+- Results do not depend on chunking, and worker splits are reproducible
+"""
+
+import numpy as np
+import pytest
+
+from src.batch_operators import density_batch
+from src.conditional_variance import DensityBands, conditional_variance
+from src.online_stats import RunningMoments
+
+
+class TestGroupedMoments:
+    """One-pass per-group accumulation."""
+
+    def test_matches_numpy(self):
+        rng = np.random.default_rng(0)
+        x = rng.normal(size=(5000, 3))
+        groups = rng.integers(-1, 4, size=5000)
+        moments = RunningMoments((4, 3))
+        for start in range(0, 5000, 700):
+            moments.update_grouped(x[start:start + 700], groups[start:start + 700])
+        for g in range(4):
+            np.testing.assert_array_equal(moments.count[g], (groups == g).sum())
+            np.testing.assert_allclose(moments.mean[g], x[groups == g].mean(axis=0))
+            np.testing.assert_allclose(moments.variance()[g], x[groups == g].var(axis=0))
+
+    def test_scalar_observations_and_empty_groups(self):
+        moments = RunningMoments(3).update_grouped([1.0, 2.0, 5.0], [0, 0, 2])
+        np.testing.assert_array_equal(moments.count, [2, 0, 1])
+        np.testing.assert_allclose(moments.variance(), [0.25, np.nan, 0.0])
+
+    def test_out_of_range(self):
+        with pytest.raises(ValueError):
+            RunningMoments((2, 5)).update_grouped(np.zeros((1, 5)), [2])
+
+
+class TestDensityBands:
+    """Band membership."""
+
+    @pytest.mark.parametrize("targets, half_width", [
+        ([0.05, 0.10, 0.15, 0.40], 0.005),
+        ([0.2, 0.1, 0.22, 0.15, 0.2], [0.05, 0.01, 0.03, 0.2, 0.0]),
+    ])
+    def test_matches_direct_test(self, targets, half_width):
+        D = np.concatenate([np.random.default_rng(1).random(20_000),
+                            np.array(targets) + half_width, np.array(targets) - half_width])
+        rows, bands = DensityBands(targets, half_width).assign(D)
+        widths = np.broadcast_to(half_width, len(targets))
+        expected = {(int(i), k) for k, (t, w) in enumerate(zip(targets, widths))
+                    for i in np.flatnonzero(np.abs(D - t) <= w)}
+        assert set(zip(rows.tolist(), bands.tolist())) == expected
+        assert len(rows) == len(expected)
+
+    def test_no_bands(self):
+        rows, bands = DensityBands([], 0.01).assign(np.linspace(0, 1, 5))
+        assert rows.size == bands.size == 0
+
+
+class TestConditionalVariance:
+    """Streaming estimator against a direct computation."""
+
+    TARGETS = [0.05, 0.1, 0.2]
+
+    def test_matches_direct(self):
+        result = conditional_variance(self.TARGETS, 0.01, n_samples=100_000, seed=3,
+                                      chunk_size=7_000)
+        rng = np.random.default_rng(np.random.SeedSequence(3).spawn(1)[0])
+        states = rng.random((100_000, 5))
+        D = density_batch(states)
+        np.testing.assert_allclose(result.overall_variance, states.var(axis=0))
+        for k, target in enumerate(self.TARGETS):
+            inside = states[np.abs(D - target) <= 0.01]
+            assert result.counts[k] == len(inside)
+            np.testing.assert_allclose(result.conditional_variance[k], inside.var(axis=0))
+            np.testing.assert_allclose(result.retained[k],
+                                       inside.var(axis=0) / states.var(axis=0))
+        assert set(result.band(0)) == {"n_points", "conditional_variance",
+                                       "variance_retained_fraction"}
+
+    def test_chunking_and_workers(self):
+        a = conditional_variance(self.TARGETS, 0.01, n_samples=30_000, chunk_size=30_000)
+        b = conditional_variance(self.TARGETS, 0.01, n_samples=30_000, chunk_size=4_096)
+        np.testing.assert_array_equal(a.counts, b.counts)
+        np.testing.assert_allclose(a.conditional_variance, b.conditional_variance)
+
+        c = conditional_variance(self.TARGETS, 0.01, n_samples=30_001, n_workers=2)
+        d = conditional_variance(self.TARGETS, 0.01, n_samples=30_001, n_workers=2)
+        assert c.overall.count[0] == 30_001
+        np.testing.assert_array_equal(c.conditional_variance, d.conditional_variance)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            conditional_variance(self.TARGETS, n_samples=0)
+        with pytest.raises(ValueError):
+            conditional_variance(self.TARGETS, -0.1)
@@ -0,0 +1,119 @@
+"""
+Tests for the exact distribution of D under uniform priors.
+
+Validates:
+- With the gate pinned at 1 the CDF is the closed-form CDF of φτρ
+- ∫ (1 - F) dd reproduces the analytic mean, on the cube and on sub-boxes
+- PDF agrees with the derivative of the CDF
+- Agreement with Monte Carlo samples of density_batch
+- Quantiles invert the CDF
+"""
+
+import numpy as np
+import pytest
+
+from src.batch_operators import density_batch
+from src.density_distribution import DensityDistribution
+
+# np.trapz was renamed np.trapezoid in NumPy 2.0 (requirements allow 1.24+)
+trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+SUB_BOX = {"phi": (0.2, 0.7), "rho": (0.5, 1.0), "H": (0.3, 1.0), "kappa": (0.0, 0.4)}
+
+
+def _mean_from_cdf(dist):
+    """E[D] = ∫ (1 - F(d)) dd on a grid refined towards 0."""
+    low, high = dist.support
+    d = np.unique(np.concatenate([np.geomspace(1e-12, 1e-2, 4001), np.linspace(1e-2, high, 8001)]))
+    d = d[d > low]
+    tail = 1.0 - dist.cdf(d)
+    return float(low + d[0] * (1.0 - dist.cdf(d[0] / 2)) + trapezoid(tail, d))
+
+
+def _uniform_samples(bounds, n, seed=0):
+    u = np.random.default_rng(seed).random((n, 5))
+    return density_batch(bounds[:, 0] + (bounds[:, 1] - bounds[:, 0]) * u)
+
+
+@pytest.fixture(scope="module")
+def cube():
+    return DensityDistribution()
+
+
+@pytest.fixture(scope="module")
+def sub_box():
+    return DensityDistribution(SUB_BOX)
+
+
+class TestUnitCube:
+    """[0, 1]^5."""
+
+    def test_gate_fixed_at_one(self):
+        # H = 0 makes the gate 1, so D = φτρ with the closed-form CDF
+        dist = DensityDistribution({"H": (0.0, 1e-20)})
+        q = np.array([1e-4, 0.01, 0.2, 0.7])
+        expected = q * (1.0 - np.log(q) + np.log(q) ** 2 / 2.0)
+        np.testing.assert_allclose(dist.cdf(q), expected, atol=1e-9)
+
+    def test_support_and_limits(self, cube):
+        assert cube.support == (0.0, 1.0)
+        assert cube.cdf(0.0) == 0.0
+        assert cube.cdf(1.0) == 1.0
+        assert cube.cdf(2.0) == 1.0 and cube.pdf(2.0) == 0.0
+        assert np.all(np.diff(cube.cdf(np.linspace(0, 1, 201))) >= 0)
+
+    def test_mean(self, cube):
+        assert cube.mean == pytest.approx(7.0 / 96.0)
+        assert _mean_from_cdf(cube) == pytest.approx(cube.mean, abs=1e-7)
+
+    def test_pdf_is_derivative(self, cube):
+        d = np.linspace(0.01, 0.95, 50)
+        h = 1e-6
+        numeric = (cube.cdf(d + h) - cube.cdf(d - h)) / (2 * h)
+        np.testing.assert_allclose(cube.pdf(d), numeric, rtol=1e-5, atol=1e-6)
+
+    def test_matches_monte_carlo(self, cube):
+        D = np.sort(_uniform_samples(np.tile([0.0, 1.0], (5, 1)), 400_000))
+        d = np.linspace(0.001, 0.9, 60)
+        empirical = np.searchsorted(D, d) / len(D)
+        assert np.abs(empirical - cube.cdf(d)).max() < 3e-3
+
+    def test_quantile(self, cube):
+        q = np.array([0.01, 0.25, 0.5, 0.9])
+        np.testing.assert_allclose(cube.cdf(cube.quantile(q)), q, atol=1e-12)
+        assert isinstance(cube.quantile(0.5), float)
+        with pytest.raises(ValueError):
+            cube.quantile(1.5)
+
+    def test_converged(self, cube):
+        d = np.geomspace(1e-8, 0.99, 40)
+        np.testing.assert_allclose(cube.cdf(d), DensityDistribution(n_nodes=48).cdf(d),
+                                   rtol=0, atol=1e-12)
+
+
+class TestSubBox:
+    """Restricted priors."""
+
+    def test_mean(self, sub_box):
+        assert _mean_from_cdf(sub_box) == pytest.approx(sub_box.mean, abs=1e-7)
+
+    def test_matches_monte_carlo(self, sub_box):
+        D = _uniform_samples(sub_box.bounds, 400_000, seed=1)
+        low, high = sub_box.support
+        assert low <= D.min() and D.max() <= high
+        assert D.mean() == pytest.approx(sub_box.mean, rel=5e-3)
+        d = np.linspace(low, high, 60)
+        empirical = np.searchsorted(np.sort(D), d) / len(D)
+        assert np.abs(empirical - sub_box.cdf(d)).max() < 3e-3
+
+    def test_mass(self, sub_box):
+        edges = np.linspace(*sub_box.support, 11)
+        assert sub_box.mass(edges[:-1], edges[1:]).sum() == pytest.approx(1.0)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            DensityDistribution({"phi": (0.5, 0.5)})
+        with pytest.raises(ValueError):
+            DensityDistribution({"D": (0.0, 1.0)})
+        with pytest.raises(ValueError):
+            DensityDistribution(np.tile([0.0, 1.5], (5, 1)))
@@ -0,0 +1,65 @@
+"""
+Tests for the exact farthest-pair search.
+
+Validates:
+- Agreement with the O(n²) scan on varied point clouds
+- The returned pair attains the reported distance
+- rtol gives a certified bound
+- Degenerate inputs (duplicates, two points)
+"""
+
+import numpy as np
+import pytest
+
+from src.diameter import farthest_pair
+
+
+def _brute_force(points):
+    d2 = ((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=2)
+    return float(np.sqrt(d2.max()))
+
+
+CLOUDS = {
+    "uniform": lambda rng: rng.random((1500, 5)),
+    "gaussian": lambda rng: rng.normal(size=(1500, 5)),
+    "skewed": lambda rng: rng.random((1500, 5)) ** 4,
+    "shell": lambda rng: (lambda x: x / np.linalg.norm(x, axis=1, keepdims=True))(
+        rng.normal(size=(1500, 5))),
+}
+
+
+class TestFarthestPair:
+    """Exactness and certificates."""
+
+    @pytest.mark.parametrize("cloud", sorted(CLOUDS))
+    def test_matches_brute_force(self, cloud):
+        points = CLOUDS[cloud](np.random.default_rng(0))
+        result = farthest_pair(points, leaf_size=16, batch_pairs=4096)
+        assert result.distance == pytest.approx(_brute_force(points), rel=1e-12)
+        assert np.linalg.norm(points[result.i] - points[result.j]) == pytest.approx(
+            result.distance, rel=1e-12)
+        assert result.upper_bound == result.distance
+        assert result.i < result.j
+
+    def test_rtol_certificate(self):
+        points = CLOUDS["shell"](np.random.default_rng(1))
+        exact = _brute_force(points)
+        result = farthest_pair(points, rtol=0.05)
+        assert result.distance <= exact <= result.upper_bound
+        assert result.upper_bound == pytest.approx(result.distance * 1.05)
+
+    def test_grid_corners(self):
+        axis = np.linspace(0.0, 1.0, 4)
+        points = np.stack([g.ravel() for g in np.meshgrid(*[axis] * 5, indexing="ij")], axis=-1)
+        result = farthest_pair(points)
+        assert result.distance == pytest.approx(np.sqrt(5))
+        assert result.n_candidates == 0
+
+    def test_degenerate_inputs(self):
+        assert farthest_pair(np.zeros((10, 5))).distance == 0.0
+        two = np.array([[0.0] * 5, [0.3] * 5])
+        assert farthest_pair(two).distance == pytest.approx(0.3 * np.sqrt(5))
+        with pytest.raises(ValueError):
+            farthest_pair(np.zeros((1, 5)))
+        with pytest.raises(ValueError):
+            farthest_pair(np.zeros((3, 5)), rtol=-0.1)
@@ -0,0 +1,140 @@
+"""
+Tests for batch operators, online statistics and stochastic ensembles.
+
+Validates:
+- Every batch kernel reproduces its scalar operator exactly
+- RunningMoments / StreamingHistogram agree with numpy and merge correctly
+- A zero-noise ensemble reproduces simulate_trajectory
+- Ensembles are reproducible for a fixed seed and split across workers
+"""
+
+import numpy as np
+import pytest
+
+from src.advanced_operators import simulate_trajectory, op_anesthesia_gradient
+from src.batch_operators import (
+    BATCH_OPERATORS,
+    density_batch,
+    get_batch_operator,
+    states_to_array,
+)
+from src.ensemble import FIELDS, run_ensemble
+from src.online_stats import RunningMoments, StreamingHistogram
+
+
+# =========================================================================
+# 1. Batch kernels match scalar operators
+# =========================================================================
+
+class TestBatchKernels:
+    """Batch kernels must agree with the scalar reference operators."""
+
+    @pytest.mark.parametrize("name", list(BATCH_OPERATORS))
+    def test_kernel_matches_scalar(self, name, canon_states):
+        """Each kernel reproduces the scalar operator on every CANON state."""
+        from src.encoder import StateVector
+        op = BATCH_OPERATORS[name]
+        states = [StateVector(**{k: v for k, v in p.items() if k != "D"})
+                  for p in canon_states.values()]
+        batch = states_to_array(*states)
+        for magnitude in [0.0, 0.3, 1.0]:
+            out = op.kernel(batch, np.full(len(batch), magnitude))
+            for row, state in zip(out, states):
+                expected = op.scalar(state, magnitude) if op.takes_magnitude \
+                    else op.scalar(state)
+                if isinstance(expected, tuple):
+                    expected = expected[0]
+                assert row == pytest.approx(expected.to_vector())
+
+    def test_density_batch_matches_statevector(self, wakefulness_state):
+        """density_batch agrees with StateVector.density()."""
+        batch = states_to_array(wakefulness_state)
+        assert density_batch(batch)[0] == pytest.approx(wakefulness_state.density())
+
+    def test_lookup_by_function_and_name(self):
+        """Operators can be looked up by scalar function or by name."""
+        assert get_batch_operator(op_anesthesia_gradient).name == "anesthesia_gradient"
+        assert get_batch_operator("op_anesthesia_gradient").name == "anesthesia_gradient"
+        with pytest.raises(ValueError):
+            get_batch_operator("op_unknown")
+
+
+# =========================================================================
+# 2. Online statistics
+# =========================================================================
+
+class TestOnlineStats:
+    """Streaming accumulators must match their batch equivalents."""
+
+    def test_running_moments_match_numpy(self):
+        """Chunked updates give the same mean and variance as numpy."""
+        rng = np.random.default_rng(1)
+        data = rng.random((1000, 3))
+        acc = RunningMoments(3)
+        for chunk in np.array_split(data, 7):
+            acc.update(chunk)
+        assert acc.mean == pytest.approx(data.mean(axis=0))
+        assert acc.variance() == pytest.approx(data.var(axis=0))
+
+    def test_running_moments_merge(self):
+        """Merging two accumulators equals accumulating all data in one."""
+        rng = np.random.default_rng(2)
+        a, b = rng.random((300, 2)), rng.random((500, 2)) + 1.0
+        merged = RunningMoments(2).update(a).merge(RunningMoments(2).update(b))
+        full = np.vstack([a, b])
+        assert merged.variance() == pytest.approx(full.var(axis=0))
+
+    def test_histogram_quantiles(self):
+        """Histogram quantiles agree with numpy within one bin width."""
+        rng = np.random.default_rng(3)
+        data = rng.beta(2, 5, size=(20000, 1))
+        hist = StreamingHistogram(1, n_bins=1000).update(data)
+        for q in [0.05, 0.5, 0.95]:
+            assert hist.quantile(q)[0] == pytest.approx(np.quantile(data, q), abs=2e-3)
+
+
+# =========================================================================
+# 3. Ensembles
+# =========================================================================
+
+class TestEnsemble:
+    """Stochastic ensembles around simulate_trajectory."""
+
+    def test_zero_noise_reproduces_trajectory(self, wakefulness_state):
+        """With noise=0 the ensemble mean is the deterministic trajectory."""
+        result = run_ensemble(wakefulness_state, op_anesthesia_gradient,
+                              n_members=50, steps=6, noise=0.0)
+        traj = simulate_trajectory(wakefulness_state, op_anesthesia_gradient, steps=6)
+        for rec, expected in zip(result.to_trajectory(), traj):
+            assert rec["density"] == pytest.approx(expected["density"])
+            assert rec["rho"] == pytest.approx(expected["rho"])
+        assert np.allclose(result.variance, 0.0)
+
+    def test_noise_spreads_density(self, wakefulness_state):
+        """Magnitude noise produces non-zero spread in D."""
+        result = run_ensemble(wakefulness_state, "inject_entropy",
+                              n_members=2000, steps=5, noise=0.1, seed=7)
+        d = result.field("D")
+        assert d["std"][-1] > 0.0
+        assert np.all(d["q0.05"] <= d["q0.95"])
+        assert result.mean.shape == (5, len(FIELDS))
+
+    def test_reproducible_and_chunk_independent(self, wakefulness_state):
+        """Same seed gives the same results regardless of chunk size."""
+        a = run_ensemble(wakefulness_state, "panic_induction", n_members=1000,
+                         steps=4, seed=11, chunk_size=1000)
+        b = run_ensemble(wakefulness_state, "panic_induction", n_members=1000,
+                         steps=4, seed=11, chunk_size=1000)
+        assert np.array_equal(a.mean, b.mean)
+        c = run_ensemble(wakefulness_state, "panic_induction", n_members=1000,
+                         steps=4, seed=11, chunk_size=300)
+        assert np.array_equal(a.quantiles, c.quantiles)
+        assert np.allclose(a.mean, c.mean, rtol=1e-12, atol=0.0)
+        assert np.allclose(a.variance, c.variance, rtol=1e-9, atol=1e-15)
+
+    def test_multiple_workers(self, wakefulness_state):
+        """Worker partitions merge into a complete ensemble."""
+        result = run_ensemble(wakefulness_state, "flow_state_induction",
+                              n_members=400, steps=3, n_workers=2, seed=5)
+        assert result.n_members == 400
+        assert np.all(np.isfinite(result.mean))
@@ -0,0 +1,149 @@
+"""
+Tests for chunked grid sweeps.
+
+Validates:
+- Chunked coordinates equal the flattened meshgrid for any chunk size
+- Isoclines, histograms and summaries equal their in-memory counterparts
+- Exact D range without a sweep
+- Parallel sweeps merge to the serial result
+- Cached D and isoclines are reused and equal freshly computed ones
+"""
+
+import numpy as np
+import pytest
+
+from src.batch_operators import density_batch
+from src.grid_sweep import (
+    DensityHistogram,
+    DensitySummary,
+    GridSweep,
+    IsoclineCollector,
+    density_cache_path,
+    run_sweep,
+    sweep_isoclines,
+)
+
+RESOLUTION = 7
+
+
+@pytest.fixture(scope="module")
+def dense():
+    axis = np.linspace(0.0, 1.0, RESOLUTION)
+    points = np.stack([g.ravel() for g in np.meshgrid(*[axis] * 5, indexing="ij")], axis=-1)
+    return points, density_batch(points)
+
+
+class TestGridSweep:
+    """Chunk generation."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 50, 343, 1000, 100_000])
+    def test_chunks_match_meshgrid(self, dense, chunk_size):
+        grid = GridSweep(RESOLUTION, chunk_size)
+        chunks = list(grid)
+        assert all(len(c.D) <= max(chunk_size, 1) for c in chunks[:-1])
+        np.testing.assert_array_equal(np.concatenate([c.points for c in chunks]), dense[0])
+        np.testing.assert_array_equal(np.concatenate([c.D for c in chunks]), dense[1])
+        np.testing.assert_array_equal(np.concatenate([c.cells for c in chunks]),
+                                      np.arange(RESOLUTION ** 5))
+
+    def test_unaligned_chunk(self, dense):
+        chunk = GridSweep(RESOLUTION, 343).chunk(100, 900)
+        np.testing.assert_array_equal(chunk.points, dense[0][100:900])
+
+    def test_coords(self, dense):
+        grid = GridSweep(RESOLUTION)
+        cells = np.array([0, 17, 4000, RESOLUTION ** 5 - 1])
+        np.testing.assert_array_equal(grid.coords(cells), dense[0][cells])
+
+    def test_density_range(self, dense):
+        assert GridSweep(RESOLUTION).density_range() == (dense[1].min(), dense[1].max())
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            GridSweep(1)
+        with pytest.raises(ValueError):
+            GridSweep(5, chunk_size=0)
+
+
+class TestReductions:
+    """Streaming reductions against the materialized grid."""
+
+    def test_isoclines(self, dense):
+        points, D = dense
+        targets = (0.05, 0.2, 0.9)
+        grid = GridSweep(RESOLUTION, 2000)
+        isoclines = run_sweep(grid, IsoclineCollector(targets, 0.01)).isoclines()
+        for target in targets:
+            expected = np.flatnonzero(np.abs(D - target) <= 0.01)
+            iso = isoclines[target]
+            np.testing.assert_array_equal(iso.cells, expected)
+            np.testing.assert_array_equal(iso.D, D[expected])
+            np.testing.assert_array_equal(grid.coords(iso.cells), points[expected])
+            assert iso.fraction == pytest.approx(len(expected) / len(D))
+
+    def test_histogram_and_summary(self, dense):
+        D = dense[1]
+        edges = np.linspace(0.0, 1.0, 21)
+        summary, histogram = run_sweep(GridSweep(RESOLUTION, 3000),
+                                       DensitySummary(), DensityHistogram(edges))
+        np.testing.assert_array_equal(histogram.counts, np.histogram(D, bins=edges)[0])
+        assert histogram.total == summary.count == len(D)
+        assert (summary.min, summary.max) == (D.min(), D.max())
+        assert summary.mean == pytest.approx(D.mean())
+        assert summary.median == pytest.approx(np.median(D), abs=1e-5)
+
+    def test_parallel_sweep_matches_serial(self):
+        def reductions():
+            return (IsoclineCollector((0.05, 0.2), 0.01),
+                    DensityHistogram(np.linspace(0.0, 1.0, 11)), DensitySummary())
+
+        grid = GridSweep(RESOLUTION, 2000)
+        serial = run_sweep(grid, *reductions())
+        parallel = run_sweep(grid, *reductions(), n_workers=3)
+        for target in (0.05, 0.2):
+            np.testing.assert_array_equal(parallel[0].isoclines()[target].cells,
+                                          serial[0].isoclines()[target].cells)
+        np.testing.assert_array_equal(parallel[1].counts, serial[1].counts)
+        assert parallel[2].count == serial[2].count
+        assert parallel[2].mean == pytest.approx(serial[2].mean)
+        assert parallel[2].median == serial[2].median
+
+
+class TestCache:
+    """sweep_isoclines and grids backed by stored D."""
+
+    def test_reuse(self, dense, tmp_path):
+        first = sweep_isoclines(RESOLUTION, (0.05, 0.2), 0.01, chunk_size=2000,
+                                n_workers=2, cache_root=tmp_path)
+        assert first.computed == ("density", "isocline D=0.05", "isocline D=0.2")
+        assert first.reused == ()
+        np.testing.assert_array_equal(np.load(density_cache_path(RESOLUTION, tmp_path)), dense[1])
+
+        second = sweep_isoclines(RESOLUTION, (0.05, 0.2, 0.3), 0.01, chunk_size=2000,
+                                 cache_root=tmp_path)
+        assert second.reused == ("density", "isocline D=0.05", "isocline D=0.2")
+        assert second.computed == ("isocline D=0.3",)
+        assert second.grid.density_path is not None
+        for target in (0.05, 0.2, 0.3):
+            expected = np.flatnonzero(np.abs(dense[1] - target) <= 0.01)
+            np.testing.assert_array_equal(second.isoclines[target].cells, expected)
+            np.testing.assert_array_equal(second.isoclines[target].D, dense[1][expected])
+        assert second.summary.mean == pytest.approx(dense[1].mean())
+
+    def test_tolerance_misses(self, tmp_path):
+        sweep_isoclines(RESOLUTION, (0.1,), 0.01, cache_root=tmp_path)
+        report = sweep_isoclines(RESOLUTION, (0.1,), 0.02, cache_root=tmp_path)
+        assert report.computed == ("isocline D=0.1",)
+
+    def test_no_cache(self, tmp_path):
+        report = sweep_isoclines(RESOLUTION, (0.1,), 0.01, use_cache=False, cache_root=tmp_path)
+        assert report.reused == () and not any(tmp_path.rglob("*.np*"))
+
+    def test_stored_grid_chunks(self, dense, tmp_path):
+        sweep_isoclines(RESOLUTION, (), cache_root=tmp_path)
+        grid = GridSweep(RESOLUTION, 1000, density_cache_path(RESOLUTION, tmp_path))
+        chunk = grid.chunk(343, 1029)
+        np.testing.assert_array_equal(chunk.D, dense[1][343:1029])
+        np.testing.assert_array_equal(chunk.points, dense[0][343:1029])
+        with pytest.raises(ValueError):
+            GridSweep(RESOLUTION + 1, density_path=density_cache_path(RESOLUTION, tmp_path)).chunk(0, 1)
@@ -0,0 +1,127 @@
+"""
+Tests for incremental recomputation of calibration artifacts.
+
+Validates:
+- A second refresh reuses everything
+- Changing one state recomputes only the artifacts that read it
+- Validation and export outputs match the full recomputation
+- Results persist on disk across processes (simulated by clearing memory)
+- Bumping a check's or record's version recomputes just those artifacts
+"""
+
+import dataclasses
+import os
+
+import pytest
+
+from src import incremental
+from src.calibration_registry import calibration_registry, mapping_functions
+from src.density_models import run_validation_suite
+
+
+@pytest.fixture
+def cache_root(tmp_path):
+    incremental.clear_artifact_cache()
+    yield tmp_path
+    incremental.clear_artifact_cache()
+
+
+def _with_changed_wakefulness(states):
+    states = dict(states)
+    wake = states["wakefulness"]
+    states["wakefulness"] = dataclasses.replace(
+        wake, kappa=dataclasses.replace(wake.kappa, value=0.9))
+    return states
+
+
+class TestRefresh:
+    """Cache reuse and dependency tracking."""
+
+    def test_second_refresh_reuses(self, cache_root):
+        first = incremental.refresh_calibration(cache_root=cache_root)
+        assert first.reused == ()
+        assert set(first.changed_states) == set(calibration_registry())
+        second = incremental.refresh_calibration(cache_root=cache_root)
+        assert second.recomputed == ()
+        assert second.changed_states == ()
+        assert second.results == first.results
+
+    def test_change_recomputes_dependents_only(self, cache_root):
+        incremental.refresh_calibration(cache_root=cache_root)
+        states = _with_changed_wakefulness(calibration_registry())
+        report = incremental.refresh_calibration(states, cache_root=cache_root)
+        assert report.changed_states == ("wakefulness",)
+        assert set(report.recomputed) == {
+            "density/wakefulness",
+            "export/wakefulness",
+            "validation/wakefulness_baseline",
+            "validation/flow_state",
+        }
+        assert set(report.recomputed) == set(
+            incremental.dependents(incremental.calibration_artifacts(states))["wakefulness"])
+        assert report.results["density/wakefulness"]["D"] == pytest.approx(
+            states["wakefulness"].density())
+
+    def test_persists_on_disk(self, cache_root):
+        first = incremental.refresh_calibration(cache_root=cache_root)
+        incremental.clear_artifact_cache()
+        second = incremental.refresh_calibration(cache_root=cache_root)
+        assert second.recomputed == ()
+        assert second.results == first.results
+        assert not list(cache_root.rglob("*.partial.json"))
+
+    def test_check_version_invalidates(self, cache_root, monkeypatch):
+        incremental.refresh_calibration(cache_root=cache_root)
+        check = incremental.VALIDATION_CHECKS["flow_state"]
+        monkeypatch.setitem(incremental.VALIDATION_CHECKS, "flow_state",
+                            dataclasses.replace(check, version="2"))
+        incremental.clear_artifact_cache()
+        report = incremental.refresh_calibration(cache_root=cache_root)
+        assert report.recomputed == ("validation/flow_state",)
+
+    def test_record_version_invalidates(self, cache_root, monkeypatch):
+        incremental.refresh_calibration(cache_root=cache_root)
+        monkeypatch.setattr(incremental, "EXPORT_RECORD_VERSION", "2")
+        report = incremental.refresh_calibration(cache_root=cache_root)
+        assert set(report.recomputed) == {f"export/{name}" for name in calibration_registry()}
+
+    def test_without_cache(self, cache_root):
+        report = incremental.refresh_calibration(use_cache=False)
+        assert report.reused == ()
+        assert not any(cache_root.iterdir())
+
+    def test_extra_artifacts(self, cache_root):
+        seed = incremental.Artifact("seed/panic_attack", ("panic_attack",),
+                                    lambda s: s["panic_attack"].name)
+        report = incremental.refresh_calibration(extra_artifacts=[seed], cache_root=cache_root)
+        assert report.results["seed/panic_attack"] == "Panic Attack"
+        unknown = incremental.Artifact("seed/nobody", ("nobody",), lambda s: None)
+        with pytest.raises(ValueError, match="unknown states"):
+            incremental.refresh_calibration(extra_artifacts=[unknown], cache_root=cache_root)
+
+
+class TestOutputs:
+    """Reports assembled from artifacts match the direct functions."""
+
+    def test_validation_report(self, cache_root):
+        report = incremental.refresh_calibration(cache_root=cache_root)
+        assert incremental.validation_report(report) == run_validation_suite()
+
+    def test_export_matches(self, cache_root):
+        incremental.refresh_calibration(cache_root=cache_root)
+        report = incremental.refresh_calibration(cache_root=cache_root)
+        assert incremental.export_grounded_states(report) == \
+            mapping_functions.export_grounded_states_json()
+
+    def test_export_file_rewritten_only_on_change(self, cache_root):
+        report = incremental.refresh_calibration(cache_root=cache_root)
+        target = cache_root / "grounded_states.json"
+        incremental.export_grounded_states(report, str(target))
+        os.utime(target, ns=(0, 0))
+        incremental.export_grounded_states(report, str(target))
+        assert target.stat().st_mtime_ns == 0
+
+        changed = incremental.refresh_calibration(
+            _with_changed_wakefulness(calibration_registry()), cache_root=cache_root)
+        incremental.export_grounded_states(changed, str(target))
+        assert target.stat().st_mtime_ns != 0
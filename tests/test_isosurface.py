@@ -0,0 +1,142 @@
+"""
+Tests for isosurface tracing.
+
+Validates:
+- Traced points lie on D = level, inside the box, with unit normals along ∇D
+- The cloud covers the surface at the requested spacing
+- Budget, empty surfaces and invalid arguments
+- Slice meshes: vertices on the level set, shared edges, full states
+- Point cloud and mesh export
+"""
+
+import numpy as np
+import pytest
+
+from src.batch_operators import density_batch
+from src.isosurface import density_gradient, trace_isosurface, trace_slice
+
+LEVEL = 0.05
+
+
+@pytest.fixture(scope="module")
+def cloud():
+    return trace_isosurface(LEVEL, spacing=0.2)
+
+
+def _surface_samples(n, seed=0):
+    """Uniform (τ, ρ, H, κ) lifted to the surface where φ = c / Q lies in [0, 1]."""
+    x = np.random.default_rng(seed).random((n, 4))
+    phi = LEVEL / (x[:, 0] * x[:, 1] * (1 - np.sqrt(x[:, 2]) + x[:, 2] * x[:, 3]))
+    return np.column_stack([phi, x])[phi <= 1.0]
+
+
+class TestDensityGradient:
+    def test_matches_finite_differences(self):
+        states = np.random.default_rng(1).uniform(0.1, 0.9, (50, 5))
+        step = 1e-6
+        numeric = np.stack([
+            (density_batch(states + step * e) - density_batch(states - step * e)) / (2 * step)
+            for e in np.eye(5)], axis=1)
+        np.testing.assert_allclose(density_gradient(states), numeric, rtol=1e-6, atol=1e-9)
+
+
+class TestTraceIsosurface:
+    def test_points_on_surface(self, cloud):
+        assert cloud.complete and len(cloud) > 0
+        np.testing.assert_allclose(density_batch(cloud.points), LEVEL, rtol=1e-12)
+        assert np.all((cloud.points >= 0) & (cloud.points <= 1))
+        assert np.all(cloud.cell_size <= 0.2)
+
+    def test_normals(self, cloud):
+        np.testing.assert_allclose(np.linalg.norm(cloud.normals, axis=1), 1.0)
+        interior = cloud.points[:, 3] > 1e-3
+        gradient = density_gradient(cloud.points[interior])
+        cosine = (gradient * cloud.normals[interior]).sum(axis=1) / np.linalg.norm(gradient, axis=1)
+        np.testing.assert_allclose(cosine, 1.0)
+
+    def test_coverage(self, cloud):
+        samples = _surface_samples(300)
+        gaps = np.linalg.norm(samples[:, None, :] - cloud.points[None, :, :], axis=-1).min(axis=1)
+        assert gaps.max() < 0.2 * np.sqrt(5)
+
+    def test_refines_with_spacing(self, cloud):
+        finer = trace_isosurface(LEVEL, spacing=0.1, max_points=1_000_000)
+        assert len(finer) > 4 * len(cloud)
+
+    def test_sub_box(self):
+        box = {"phi": (0.5, 1.0), "H": (0.2, 0.6)}
+        result = trace_isosurface(LEVEL, spacing=0.1, box=box)
+        assert np.all((result.points[:, 0] >= 0.5) & (result.points[:, 3] >= 0.2)
+                      & (result.points[:, 3] <= 0.6))
+        np.testing.assert_allclose(density_batch(result.points), LEVEL, rtol=1e-12)
+
+    def test_budget(self):
+        result = trace_isosurface(LEVEL, spacing=0.05, max_points=1000)
+        assert not result.complete and len(result) <= 1000
+        np.testing.assert_allclose(density_batch(result.points), LEVEL, rtol=1e-12)
+
+    def test_empty_surface(self):
+        result = trace_isosurface(1.5)
+        assert len(result) == 0 and result.complete
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            trace_isosurface(0.0)
+        with pytest.raises(ValueError):
+            trace_isosurface(LEVEL, spacing=0.0)
+        with pytest.raises(ValueError):
+            trace_isosurface(LEVEL, max_points=0)
+
+    def test_save(self, cloud, tmp_path):
+        table = np.loadtxt(cloud.save(tmp_path / "surface.csv"), delimiter=",", skiprows=1)
+        np.testing.assert_allclose(table[:, :5], cloud.points)
+        stored = np.load(cloud.save(tmp_path / "surface.npz"))
+        np.testing.assert_array_equal(stored["normals"], cloud.normals)
+        with pytest.raises(ValueError):
+            cloud.save(tmp_path / "surface.txt")
+
+
+class TestTraceSlice:
+    FIXED_2D = {"phi": 0.5, "tau": 0.5, "rho": 0.5}
+
+    def test_curve(self):
+        mesh = trace_slice(LEVEL, ("H", "kappa"), self.FIXED_2D, spacing=0.05)
+        assert mesh.faces.shape[1] == 2 and len(mesh.faces) > 0
+        states = mesh.states()
+        np.testing.assert_allclose(density_batch(states), LEVEL, atol=1e-12)
+        np.testing.assert_array_equal(states[:, :3], 0.5)
+        # A curve: no vertex is shared by more than two segments
+        assert np.bincount(mesh.faces.ravel()).max() <= 2
+
+    def test_surface(self):
+        mesh = trace_slice(LEVEL, ("tau", "H", "kappa"), {"phi": 0.5, "rho": 0.5}, spacing=0.05)
+        assert mesh.faces.shape[1] == 3 and len(mesh.faces) > 0
+        np.testing.assert_allclose(density_batch(mesh.states()), LEVEL, atol=1e-12)
+        # Each edge belongs to at most two triangles
+        edges = np.sort(mesh.faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+        _, counts = np.unique(edges, axis=0, return_counts=True)
+        assert counts.max() <= 2
+
+    def test_box(self):
+        mesh = trace_slice(LEVEL, ("H", "kappa"), self.FIXED_2D, box={"H": (0.5, 1.0)})
+        assert np.all(mesh.vertices[:, 0] >= 0.5)
+
+    def test_no_crossing(self):
+        mesh = trace_slice(0.9, ("H", "kappa"), self.FIXED_2D)
+        assert len(mesh.vertices) == 0 and mesh.faces.shape == (0, 2)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            trace_slice(LEVEL, ("H",), {"phi": 0.5, "tau": 0.5, "rho": 0.5, "kappa": 0.5})
+        with pytest.raises(ValueError):
+            trace_slice(LEVEL, ("H", "kappa"), {"phi": 0.5, "tau": 0.5})
+        with pytest.raises(ValueError):
+            trace_slice(LEVEL, ("H", "gamma"), self.FIXED_2D)
+
+    def test_save(self, tmp_path):
+        mesh = trace_slice(LEVEL, ("tau", "H", "kappa"), {"phi": 0.5, "rho": 0.5}, spacing=0.1)
+        lines = mesh.save(tmp_path / "slice.obj").read_text().splitlines()
+        assert sum(line.startswith("v ") for line in lines) == len(mesh.vertices)
+        assert sum(line.startswith("f ") for line in lines) == len(mesh.faces)
+        stored = np.load(mesh.save(tmp_path / "slice.npz"))
+        np.testing.assert_array_equal(stored["faces"], mesh.faces)
@@ -0,0 +1,123 @@
+"""
+Tests for the LZ76 complexity estimator.
+
+Validates:
+- The suffix-automaton parsing matches a direct LZ76 definition
+- Binarization methods produce balanced 0/1 sequences
+- Sliding windows and worker processes agree with direct evaluation
+- Noise maps to higher H than a regular signal
+"""
+
+import numpy as np
+import pytest
+
+from src.lempel_ziv import (
+    binarize,
+    estimate_H,
+    lz76_complexity,
+    lz_complexity,
+    normalized_lz76,
+)
+
+
+def _reference_lz76(sequence):
+    """LZ76 phrase count straight from the definition (cubic time)."""
+    s = "".join(chr(65 + int(x)) for x in sequence)
+    n, i, c = len(s), 0, 0
+    while i < n:
+        l = 0
+        while i + l < n and s[i:i + l + 1] in s[:i + l]:
+            l += 1
+        c += 1
+        i += l + 1 if i + l < n else l
+    return c
+
+
+@pytest.fixture(scope="module")
+def recording():
+    """White noise and a noisy sine, one per channel."""
+    rng = np.random.default_rng(3)
+    t = np.linspace(0, 100 * np.pi, 8000)
+    regular = np.sin(t) + 0.05 * rng.normal(size=t.size)
+    return np.stack([rng.normal(size=t.size), regular])
+
+
+class TestLZ76:
+    """Phrase counting."""
+
+    def test_kaspar_schuster_example(self):
+        assert lz76_complexity([0, 0, 0, 1, 1, 0, 1, 0, 0, 1, 0, 0, 0, 1, 0, 1]) == 6
+
+    @pytest.mark.parametrize("kind", ["random", "periodic", "sparse"])
+    def test_matches_reference(self, kind):
+        rng = np.random.default_rng(7)
+        for _ in range(300):
+            n = int(rng.integers(1, 80))
+            if kind == "random":
+                s = rng.integers(0, 3, n)
+            elif kind == "periodic":
+                s = np.tile(rng.integers(0, 2, rng.integers(1, 6)), 80)[:n]
+            else:
+                s = (rng.random(n) < 0.1).astype(int)
+            assert lz76_complexity(s) == _reference_lz76(s)
+
+    def test_edge_cases(self):
+        assert lz76_complexity([]) == 0
+        assert lz76_complexity([1]) == 1
+        assert lz76_complexity(np.zeros(10_000, dtype=np.uint8)) == 2
+
+    def test_buffer_input(self):
+        s = np.random.default_rng(0).integers(0, 2, 500).astype(np.uint8)
+        assert lz76_complexity(s.tobytes()) == lz76_complexity(s) == lz76_complexity(s.astype(bool))
+
+    def test_invalid_symbols(self):
+        with pytest.raises(ValueError):
+            lz76_complexity([0, 1, 256])
+
+    def test_normalization(self):
+        rng = np.random.default_rng(1)
+        noise = rng.integers(0, 2, 20_000)
+        assert normalized_lz76(noise) == pytest.approx(1.0, abs=0.05)
+        assert normalized_lz76(noise, "log") == pytest.approx(1.0, abs=0.15)
+        assert normalized_lz76(np.tile([0, 1, 1, 0], 5000)) < 0.01
+        with pytest.raises(ValueError):
+            normalized_lz76(noise, "zscore")
+
+
+class TestSignals:
+    """Binarization, windows and H estimation on synthetic recordings."""
+
+    @pytest.mark.parametrize("method", ["median", "hilbert"])
+    def test_binarize(self, recording, method):
+        bits = binarize(recording, method)
+        assert bits.dtype == np.uint8 and bits.shape == recording.shape
+        assert set(np.unique(bits)) == {0, 1}
+        if method == "median":
+            assert bits.mean(axis=1) == pytest.approx(0.5, abs=1e-3)
+
+    def test_unknown_method(self, recording):
+        with pytest.raises(ValueError):
+            binarize(recording, "wavelet")
+
+    def test_windows_match_direct(self, recording):
+        result = lz_complexity(recording, window=2000, step=1000, method="median")
+        assert result.shape == (2, 7)
+        direct = normalized_lz76(binarize(recording[1, 3000:5000], "median"), seed=3)
+        assert result[1, 3] == pytest.approx(direct)
+        assert np.all(result[0] > result[1])
+
+    def test_workers_agree(self, recording):
+        serial = lz_complexity(recording, window=4000)
+        parallel = lz_complexity(recording, window=4000, n_workers=2)
+        assert np.array_equal(serial, parallel)
+
+    def test_invalid_window(self, recording):
+        with pytest.raises(ValueError):
+            lz_complexity(recording, window=10_000)
+
+    def test_estimate_H(self, recording):
+        noisy, regular = recording
+        assert estimate_H(noisy, method="median").value > estimate_H(regular, method="median").value
+        relative = estimate_H(regular, baseline=noisy, window=2000, method="median")
+        assert relative.source == "LZc percent change"
+        assert relative.value < 0.5
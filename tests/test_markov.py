@@ -0,0 +1,84 @@
+"""
+Tests for the sparse Markov transition model.
+
+Validates:
+- The transition matrix is row-stochastic
+- Absorption probabilities and hitting times match a dense solve
+- Stationary distributions are fixed points of the chain
+- Matrices round-trip through the disk cache
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+
+from src.markov import build_markov_model
+
+
+@pytest.fixture(scope="module")
+def model():
+    """A small model (4^5 cells) so dense reference solves stay cheap."""
+    return build_markov_model(resolution=4, n_samples=8, use_cache=False)
+
+
+def _dense_absorption(P, target):
+    n = len(P)
+    A = np.eye(n) - P
+    A[target] = 0.0
+    A[target, target] = 1.0
+    b = target.astype(float)
+    return np.linalg.lstsq(A, b, rcond=None)[0]
+
+
+class TestMarkovModel:
+    """Transition matrix and derived quantities."""
+
+    def test_rows_sum_to_one(self, model):
+        sums = np.asarray(model.matrix.sum(axis=1)).ravel()
+        assert np.allclose(sums, 1.0)
+
+    def test_absorption_matches_dense(self, model):
+        target = model.below_threshold(0.05)
+        absorption = model.absorption_probabilities(0.05)
+        assert np.all(absorption[target] == 1.0)
+        reaching = model._cells_reaching(target)
+        dense = _dense_absorption(model.matrix.toarray(), target)
+        assert np.allclose(absorption[reaching], dense[reaching], atol=1e-8)
+        assert np.all(absorption[~reaching] == 0.0)
+
+    def test_hitting_times_match_dense(self, model):
+        target = model.below_threshold(0.05)
+        times = model.expected_hitting_times(0.05)
+        assert np.all(times[target] == 0.0)
+        finite = np.isfinite(times) & ~target
+        P = model.matrix.toarray()[np.ix_(finite, finite)]
+        dense = np.linalg.solve(np.eye(finite.sum()) - P, np.ones(finite.sum()))
+        assert np.allclose(times[finite], dense)
+
+    def test_stationary_is_fixed_point(self, model, wakefulness_state):
+        pi = model.stationary_distribution(wakefulness_state)
+        assert pi.sum() == pytest.approx(1.0)
+        assert np.abs(model.matrix.T @ pi - pi).sum() < 1e-6
+
+    def test_cache_round_trip(self, tmp_path):
+        kwargs = dict(resolution=3, n_samples=4, cache_root=tmp_path)
+        built = build_markov_model(**kwargs)
+        assert list(tmp_path.rglob("*.npz"))
+        loaded = build_markov_model(**kwargs)
+        assert (built.matrix != loaded.matrix).nnz == 0
+        assert not list(tmp_path.rglob("*.partial.npz"))
+
+    def test_cache_keyed_by_chunk_size(self, tmp_path):
+        # The chunk size fixes the order of the magnitude draws
+        kwargs = dict(resolution=4, n_samples=4, cache_root=tmp_path)
+        build_markov_model(chunk_size=50_000, **kwargs)
+        chunked = build_markov_model(chunk_size=100, **kwargs)
+        fresh = build_markov_model(chunk_size=100, resolution=4, n_samples=4, use_cache=False)
+        assert (chunked.matrix != fresh.matrix).nnz == 0
+        assert len(list(tmp_path.rglob("*.npz"))) == 2
+
+    def test_invalid_weights_rejected(self):
+        with pytest.raises(ValueError):
+            build_markov_model(resolution=3, operators={"perturb_binding": 0.0},
+                               use_cache=False)
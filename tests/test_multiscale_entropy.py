@@ -0,0 +1,111 @@
+"""
+Tests for the multiscale sample entropy engine.
+
+Validates:
+- Coarse-graining matches block means
+- KD-tree and sorted-sweep template counts match a brute-force count
+- White noise loses entropy across scales while 1/f noise keeps it
+- The MSE complexity ratio maps to κ at the white/pink anchors
+"""
+
+import numpy as np
+import pytest
+
+import src.multiscale_entropy as mse
+import mapping_functions as mf
+
+
+def _pink_noise(n, rng):
+    freqs = np.fft.rfftfreq(n)
+    freqs[0] = freqs[1]
+    spectrum = (rng.normal(size=len(freqs)) + 1j * rng.normal(size=len(freqs))) / np.sqrt(freqs)
+    return np.fft.irfft(spectrum, n)
+
+
+def _brute_force_sampen(x, m, r):
+    n = len(x) - m
+    windows = np.array([x[i:i + m + 1] for i in range(n)])
+    dist_m = np.abs(windows[:, None, :m] - windows[None, :, :m]).max(axis=2)
+    dist_m1 = np.abs(windows[:, None, :] - windows[None, :, :]).max(axis=2)
+    upper = np.triu_indices(n, k=1)
+    B = np.count_nonzero(dist_m[upper] <= r)
+    A = np.count_nonzero(dist_m1[upper] <= r)
+    return -np.log(A / B)
+
+
+@pytest.fixture(scope="module")
+def noises():
+    rng = np.random.default_rng(11)
+    return np.stack([rng.normal(size=12_000), _pink_noise(12_000, rng)])
+
+
+class TestSampleEntropy:
+    """Coarse-graining and template matching."""
+
+    def test_coarse_grain(self):
+        x = np.random.default_rng(0).normal(size=1003)
+        assert mse.coarse_grain(x, 1) is x
+        expected = x[:1000].reshape(-1, 5).mean(axis=1)
+        assert mse.coarse_grain(x, 5) == pytest.approx(expected)
+
+    @pytest.mark.parametrize("use_scipy", [True, False])
+    def test_matches_brute_force(self, use_scipy, monkeypatch):
+        if use_scipy and not mse.SCIPY_AVAILABLE:
+            pytest.skip("scipy not installed")
+        monkeypatch.setattr(mse, "SCIPY_AVAILABLE", use_scipy)
+        x = np.random.default_rng(2).normal(size=400)
+        for m in (1, 2, 3):
+            expected = _brute_force_sampen(x, m, 0.2 * x.std())
+            assert mse.sample_entropy(x, m, 0.2) == pytest.approx(expected)
+
+    def test_white_noise_reference(self, noises):
+        # Gaussian white noise, m = 2, r = 0.15 SD: SampEn ≈ 2.5 (Costa et al., 2005)
+        assert mse.sample_entropy(noises[0]) == pytest.approx(2.5, abs=0.1)
+
+    def test_degenerate(self):
+        assert np.isnan(mse.sample_entropy(np.arange(50.0), r=0.001))
+        with pytest.raises(ValueError):
+            mse.sample_entropy([1.0, 2.0])
+
+
+class TestMultiscaleEntropy:
+    """MSE curves and κ estimation."""
+
+    def test_curves(self, noises):
+        curves = mse.multiscale_entropy(noises, scales=range(1, 11))
+        assert curves.shape == (2, 10)
+        white, pink = curves
+        assert np.all(np.diff(white) < 0)
+        assert np.ptp(pink) < 0.3
+        ratio = mse.mse_complexity_ratio(curves)
+        assert ratio[0] < ratio[1]
+
+    def test_workers_agree(self, noises):
+        serial = mse.multiscale_entropy(noises[:, :3000], scales=(1, 2, 3))
+        parallel = mse.multiscale_entropy(noises[:, :3000], scales=(1, 2, 3), n_workers=2)
+        assert np.array_equal(serial, parallel)
+
+    def test_invalid_scales(self, noises):
+        with pytest.raises(ValueError):
+            mse.multiscale_entropy(noises[0, :100], scales=(1, 50))
+
+    def test_estimate_kappa(self, noises):
+        white = mse.estimate_kappa(noises[0])
+        pink = mse.estimate_kappa(noises[1])
+        assert white.value == pytest.approx(0.20, abs=0.1)
+        assert pink.value == pytest.approx(0.85, abs=0.1)
+        assert white.source == "MSE complexity ratio"
+
+
+class TestMseRatioToKappa:
+    """Calibration mapping."""
+
+    def test_anchors(self):
+        assert mf.mse_ratio_to_kappa(mf.MSE_RATIO_WHITE).value == pytest.approx(0.20)
+        assert mf.mse_ratio_to_kappa(mf.MSE_RATIO_PINK).value == pytest.approx(0.85)
+        assert mf.mse_ratio_to_kappa(0.0).value == 0.0
+        assert mf.mse_ratio_to_kappa(0.0).confidence == mf.Confidence.LOW
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            mf.mse_ratio_to_kappa(-0.1)
@@ -0,0 +1,104 @@
+"""
+Tests for the PCI pipeline.
+
+Validates:
+- Baseline correction and trial averaging
+- The bootstrap threshold is reproducible and worker-count independent
+- Noise-only recordings score zero; differentiated responses beat
+  stereotyped ones
+- The index feeds pci_to_rho
+"""
+
+import numpy as np
+import pytest
+
+from src.perturbational_complexity import (
+    bootstrap_threshold,
+    estimate_rho,
+    evoked_response,
+    pci_from_matrix,
+    perturbational_complexity,
+)
+
+CHANNELS, TIME, TRIALS, BASELINE = 24, 240, 40, 80
+
+
+def _recording(kind, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=(CHANNELS, TIME, TRIALS))
+    if kind == "differentiated":
+        for c in range(CHANNELS):
+            latency = rng.integers(0, 120)
+            wave = 2.0 * np.sin(2 * np.pi * rng.uniform(0.02, 0.1) * np.arange(40))
+            x[c, BASELINE + latency:BASELINE + latency + 40] += wave[:, None]
+    elif kind == "stereotyped":
+        wave = 2.0 * np.sin(2 * np.pi * 0.02 * np.arange(60))
+        x[:, BASELINE + 10:BASELINE + 70] += wave[None, :, None]
+    return x
+
+
+@pytest.fixture(scope="module")
+def recordings():
+    return {kind: _recording(kind) for kind in ("noise", "differentiated", "stereotyped")}
+
+
+class TestBootstrap:
+    """Evoked response and significance threshold."""
+
+    def test_evoked_response(self, recordings):
+        erp = evoked_response(recordings["noise"], BASELINE)
+        assert erp.shape == (CHANNELS, TIME)
+        assert np.abs(erp[:, :BASELINE].mean(axis=1)).max() < 1e-5
+
+    def test_reproducible_across_workers(self, recordings):
+        x = recordings["noise"]
+        serial = bootstrap_threshold(x, BASELINE, n_bootstrap=60, max_elements=500_000)
+        parallel = bootstrap_threshold(x, BASELINE, n_bootstrap=60, max_elements=500_000,
+                                       n_workers=2)
+        assert serial == parallel
+        assert bootstrap_threshold(x, BASELINE, n_bootstrap=60, seed=1) != serial
+
+    def test_alpha_orders_thresholds(self, recordings):
+        x = recordings["noise"]
+        strict = bootstrap_threshold(x, BASELINE, n_bootstrap=200, alpha=0.01)
+        loose = bootstrap_threshold(x, BASELINE, n_bootstrap=200, alpha=0.2)
+        assert strict > loose > 0
+
+    def test_invalid_inputs(self, recordings):
+        with pytest.raises(ValueError):
+            evoked_response(recordings["noise"][0], BASELINE)
+        with pytest.raises(ValueError):
+            bootstrap_threshold(recordings["noise"], TIME)
+        with pytest.raises(ValueError):
+            perturbational_complexity(recordings["noise"], BASELINE, response_window=(10, 50))
+
+
+class TestPCI:
+    """Complexity of the binarized source matrix."""
+
+    def test_matrix_extremes(self):
+        assert pci_from_matrix(np.zeros((8, 50)))[0] == 0.0
+        assert pci_from_matrix(np.ones((8, 50)))[0] == 0.0
+        random = np.random.default_rng(0).random((32, 400)) < 0.3
+        assert pci_from_matrix(random)[0] == pytest.approx(1.0, abs=0.15)
+
+    def test_noise_scores_zero(self, recordings):
+        result = perturbational_complexity(recordings["noise"], BASELINE, n_bootstrap=200)
+        assert result.n_significant <= 2
+        assert result.pci < 0.05
+
+    def test_differentiation(self, recordings):
+        differentiated = perturbational_complexity(recordings["differentiated"], BASELINE,
+                                                   n_bootstrap=200)
+        stereotyped = perturbational_complexity(recordings["stereotyped"], BASELINE,
+                                                n_bootstrap=200)
+        assert differentiated.significant.shape == (CHANNELS, TIME - BASELINE)
+        assert differentiated.pci > 2 * stereotyped.pci
+        assert stereotyped.n_significant > 0
+
+    def test_estimate_rho(self, recordings):
+        rho = estimate_rho(recordings["differentiated"], BASELINE, n_bootstrap=200)
+        result = perturbational_complexity(recordings["differentiated"], BASELINE,
+                                           n_bootstrap=200)
+        assert rho.value == pytest.approx(min(result.pci, 1.0))
+        assert rho.source == "PCI direct mapping"
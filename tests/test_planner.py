@@ -0,0 +1,91 @@
+"""
+Tests for the A* operator-path planner.
+
+Validates:
+- TargetRegion masks and gaps
+- The heuristic never overestimates the cost of a found plan
+- Plans are optimal against brute-force enumeration on a small edge set
+- Returned steps replay through the scalar operators
+"""
+
+import itertools
+import math
+
+import pytest
+
+from src.batch_operators import BATCH_OPERATORS
+from src.planner import Plan, TargetRegion, plan_intervention
+
+
+SMALL_EDGES = {
+    "perturb_binding": (0.1, 0.2),
+    "stretch_temporal_depth": (0.1, 0.2),
+    "inject_entropy": (-0.1,),
+    "flow_state_induction": (0.5,),
+}
+
+
+def _replay(start, operations):
+    state = start
+    for name, magnitude in operations:
+        op = BATCH_OPERATORS[name]
+        out = op.scalar(state, magnitude) if op.takes_magnitude else op.scalar(state)
+        state = out[0] if isinstance(out, tuple) else out
+    return state
+
+
+class TestTargetRegion:
+    """Region membership and distance-to-region."""
+
+    def test_contains(self, wakefulness_state, propofol_state):
+        region = TargetRegion(D_min=0.2, bounds={"H": (None, 0.6)})
+        assert region.contains(wakefulness_state)
+        assert not region.contains(propofol_state)
+
+    def test_unknown_bound_rejected(self):
+        with pytest.raises(ValueError):
+            TargetRegion(bounds={"psi": (0.0, 1.0)})
+
+
+class TestPlanner:
+    """A* search over operator applications."""
+
+    def test_start_inside_target(self, wakefulness_state):
+        """A start already in the region needs no steps."""
+        plan = plan_intervention(wakefulness_state, TargetRegion(D_min=0.1))
+        assert plan.found and plan.steps == [] and plan.cost == 0.0
+
+    def test_plan_reaches_target(self, wakefulness_state):
+        """The documented example: D ≥ 0.3 with H ≤ 0.4."""
+        target = TargetRegion(D_min=0.3, bounds={"H": (None, 0.4)})
+        plan = plan_intervention(wakefulness_state, target)
+        assert plan.found
+        assert target.contains(plan.final_state)
+        replayed = _replay(wakefulness_state, plan.operations)
+        assert replayed.to_vector() == pytest.approx(plan.final_state.to_vector())
+
+    def test_optimal_against_brute_force(self, propofol_state):
+        """With unit costs, A* finds the minimum number of applications."""
+        target = TargetRegion(D_min=0.05)
+        plan = plan_intervention(propofol_state, target, magnitudes=SMALL_EDGES,
+                                 step_cost=lambda name, m: 1.0, resolution=1001)
+        assert plan.found
+
+        edges = [(n, m) for n, mags in SMALL_EDGES.items() for m in mags]
+        best = math.inf
+        for depth in range(1, 5):
+            for seq in itertools.product(edges, repeat=depth):
+                if target.contains(_replay(propofol_state, seq)):
+                    best = depth
+                    break
+            if best < math.inf:
+                break
+        assert plan.cost == best
+
+    def test_unreachable_reports_not_found(self, wakefulness_state):
+        """Binding-only moves cannot lower H, so the search exhausts."""
+        plan = plan_intervention(wakefulness_state,
+                                 TargetRegion(bounds={"H": (None, 0.1)}),
+                                 magnitudes={"perturb_binding": (-0.1, 0.1)})
+        assert isinstance(plan, Plan)
+        assert not plan.found
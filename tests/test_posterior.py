@@ -0,0 +1,95 @@
+"""
+Tests for the Bayesian calibration fitter.
+
+Validates:
+- Split-R̂ and ESS behave on synthetic chains with known properties
+- Without constraints the posterior reproduces the Beta priors
+- Ordering constraints shift the posterior toward satisfying them
+- The full calibration table refits with convergence diagnostics
+"""
+
+import numpy as np
+import pytest
+
+import src.encoder  # noqa: F401  (puts calibration/ on sys.path)
+from mapping_functions import create_grounded_state
+from src.posterior import (
+    OrderingConstraint,
+    RangeConstraint,
+    VALIDATION_CONSTRAINTS,
+    effective_sample_size,
+    fit_posterior,
+    split_r_hat,
+)
+
+
+def _state(name, **overrides):
+    return create_grounded_state(name=name, **{f"{k}_override": v for k, v in overrides.items()})
+
+
+@pytest.fixture(scope="module")
+def twin_states():
+    """Two states with identical (LOW confidence) priors."""
+    values = dict(phi=0.6, tau=0.5, rho=0.5, H=0.4, kappa=0.5)
+    return {"a": _state("A", **values), "b": _state("B", **values)}
+
+
+class TestDiagnostics:
+    """Convergence diagnostics on synthetic draws."""
+
+    def test_iid_chains(self):
+        draws = np.random.default_rng(0).normal(size=(1000, 8, 3))
+        assert np.all(np.abs(split_r_hat(draws) - 1) < 0.01)
+        assert np.all(np.abs(effective_sample_size(draws) / 8000 - 1) < 0.2)
+
+    def test_disagreeing_chains(self):
+        draws = np.random.default_rng(1).normal(size=(500, 4))
+        draws[:, :2] += 3.0
+        assert split_r_hat(draws) > 1.5
+
+    def test_autocorrelated_chain(self):
+        rng = np.random.default_rng(2)
+        phi = 0.9
+        draws = np.empty((4000, 4))
+        draws[0] = rng.normal(size=4)
+        for t in range(1, len(draws)):
+            draws[t] = phi * draws[t - 1] + rng.normal(size=4) * np.sqrt(1 - phi ** 2)
+        expected = draws.size * (1 - phi) / (1 + phi)
+        assert effective_sample_size(draws) == pytest.approx(expected, rel=0.3)
+
+
+class TestFitPosterior:
+    """Multi-chain Metropolis-within-Gibbs sampler."""
+
+    def test_unconstrained_recovers_prior(self, twin_states):
+        fit = fit_posterior(twin_states, constraints=(), n_chains=32, n_draws=500, n_burn=300)
+        assert fit.mean == pytest.approx(fit.prior_mean, abs=0.02)
+        assert fit.sd == pytest.approx(0.15, abs=0.02)
+        assert fit.converged()
+
+    def test_ordering_constraint(self, twin_states):
+        fit = fit_posterior(twin_states, constraints=(OrderingConstraint("a", "b"),),
+                            n_chains=32, n_draws=500, n_burn=300)
+        D = fit.density_draws
+        assert D[..., 0].mean() > D[..., 1].mean()
+        assert list(fit.constraint_probabilities().values())[0] > 0.9
+
+    def test_range_constraint(self, twin_states):
+        fit = fit_posterior(twin_states, constraints=(RangeConstraint("a", 0.05, 0.06),),
+                            n_chains=32, n_draws=500, n_burn=300)
+        assert 0.045 < fit.density_draws[..., 0].mean() < 0.065
+
+    def test_unknown_state_rejected(self, twin_states):
+        with pytest.raises(ValueError, match="unknown states"):
+            fit_posterior(twin_states, constraints=(OrderingConstraint("a", "zzz"),))
+
+    def test_calibration_table(self):
+        """The registry with the validation-suite constraints refits and converges."""
+        fit = fit_posterior(n_chains=32, n_draws=400, n_burn=400)
+        assert fit.draws.shape[2:] == (len(fit.names), 5)
+        assert fit.converged(max_r_hat=1.1, min_ess=200)
+        probabilities = fit.constraint_probabilities()
+        assert len(probabilities) == len(VALIDATION_CONSTRAINTS)
+        assert min(probabilities.values()) > 0.8
+        summary = fit.summary("panic_attack")
+        assert set(summary) == {"phi", "tau", "rho", "H", "kappa", "D"}
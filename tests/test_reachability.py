@@ -0,0 +1,93 @@
+"""
+Tests for the operator reachability map over the quantized state grid.
+
+Validates:
+- Grid snapping and coordinates round-trip
+- Successor table agrees with the scalar operators
+- Reachable sets respect operator restrictions
+- Memoized queries return the same answers as fresh searches
+"""
+
+import numpy as np
+import pytest
+
+from src.advanced_operators import op_anesthesia_gradient, op_flow_state_induction
+from src.operators import op_perturb_binding
+from src.reachability import ReachabilityMap, StateGrid
+
+
+@pytest.fixture(scope="module")
+def reach_map():
+    """A coarse map shared by all tests (6^5 cells)."""
+    return ReachabilityMap(resolution=6, magnitudes={
+        "perturb_binding": (-0.2, 0.2),
+        "inject_entropy": (-0.2, 0.2),
+        "anesthesia_gradient": (0.5, 1.0),
+        "flow_state_induction": (0.5, 1.0),
+    })
+
+
+class TestStateGrid:
+    """Quantization of [0, 1]^5."""
+
+    def test_snap_coords_round_trip(self):
+        """Snapping a grid point returns its own cell."""
+        grid = StateGrid(5)
+        cells = np.arange(grid.n_cells)
+        assert np.array_equal(grid.snap(grid.coords(cells)), cells)
+
+    def test_cell_of_state(self, wakefulness_state):
+        """cell_of snaps to the nearest grid point."""
+        grid = StateGrid(11)
+        coords = grid.coords(grid.cell_of(wakefulness_state))
+        assert np.abs(coords - wakefulness_state.to_vector()).max() <= 0.05 + 1e-12
+
+
+class TestReachability:
+    """Forward reachability queries."""
+
+    def test_successor_matches_scalar_operator(self, reach_map):
+        """An edge's successor is the snapped scalar operator output."""
+        from src.batch_operators import array_to_state
+        grid = reach_map.grid
+        cell = 1234
+        state = array_to_state(grid.coords(cell))
+        e = reach_map.edges.index(("flow_state_induction", 0.5))
+        expected, _ = op_flow_state_induction(state, 0.5)
+        assert reach_map.successors[cell, e] == grid.cell_of(expected)
+
+    def test_start_is_reachable(self, reach_map, wakefulness_state):
+        """Every state reaches itself (zero applications)."""
+        assert reach_map.can_reach(wakefulness_state, wakefulness_state)
+
+    def test_operator_restriction(self, reach_map, wakefulness_state):
+        """Binding-only moves cannot change H."""
+        states = reach_map.reachable_states(wakefulness_state, [op_perturb_binding])
+        assert np.allclose(states[:, 3], states[0, 3])
+        assert np.allclose(states[:, 0], states[0, 0])
+        assert len(states) == reach_map.grid.resolution
+
+    def test_flow_rescues_post_anesthesia(self, reach_map, wakefulness_state):
+        """Flow induction alone lifts a deeply anesthetized state above D = 0.1."""
+        post, _ = op_anesthesia_gradient(wakefulness_state, 0.8)
+        assert post.density() < 0.05
+        assert reach_map.can_reach_region(
+            post, lambda s, D: D > 0.1, operators=["flow_state_induction"])
+        assert not reach_map.can_reach_region(
+            post, lambda s, D: D > 0.1, operators=["anesthesia_gradient"])
+
+    def test_memoized_matches_fresh(self, wakefulness_state):
+        """Answers reusing cached sub-results equal a fresh search."""
+        kwargs = dict(resolution=5, magnitudes={"inject_entropy": (-0.25, 0.25),
+                                                "panic_induction": (1.0,)})
+        warm = ReachabilityMap(**kwargs)
+        post = warm.grid.coords(warm.successors[warm.grid.cell_of(wakefulness_state), -1])
+        warm.reachable_cells(post)
+        fresh = ReachabilityMap(**kwargs)
+        assert np.array_equal(warm.reachable_cells(wakefulness_state),
+                              fresh.reachable_cells(wakefulness_state))
+
+    def test_unknown_operator_rejected(self, reach_map, wakefulness_state):
+        """Restricting to an operator without edges is an error."""
+        with pytest.raises(ValueError):
+            reach_map.reachable_cells(wakefulness_state, ["panic_induction"])
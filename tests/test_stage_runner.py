@@ -0,0 +1,81 @@
+"""
+Tests for the stage runner.
+
+Validates:
+- Results come back keyed by task name, in task order, with timings
+- Pool and in-process runs agree
+- SharedArray data reaches workers and is freed on close
+- Keyed tasks are cached and reused
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from src.stage_runner import SharedArray, Task, run_tasks
+
+
+def _tail_sum(shared, start):
+    return float(shared.array[start:].sum())
+
+
+def _power(x, exponent=2):
+    return x ** exponent
+
+
+class TestRunTasks:
+    """Ordering, timings and validation."""
+
+    def test_in_process(self):
+        tasks = [Task("cube", _power, (3,), {"exponent": 3}), Task("square", _power, (4,))]
+        report = run_tasks(tasks)
+        assert list(report.results) == ["cube", "square"]
+        assert report.results == {"cube": 27, "square": 16}
+        assert set(report.timings) == {"cube", "square"}
+        assert all(t >= 0 for t in report.timings.values())
+        assert "wall time" in report.timing_table()
+
+    def test_pool_matches_in_process(self):
+        tasks = [Task(f"p{k}", _power, (k,)) for k in range(6)]
+        assert run_tasks(tasks, n_workers=2).results == run_tasks(tasks).results
+
+    def test_cache(self, tmp_path):
+        tasks = [Task("keyed", _power, (5,), key="k1"), Task("plain", _power, (6,))]
+        first = run_tasks(tasks, cache_root=tmp_path)
+        assert first.reused == () and set(first.timings) == {"keyed", "plain"}
+
+        # A different function under the same key proves the result is loaded
+        tasks[0] = Task("keyed", _power, (7,), key="k1")
+        second = run_tasks(tasks, n_workers=2, cache_root=tmp_path)
+        assert second.results == {"keyed": 25, "plain": 36}
+        assert second.reused == ("keyed",) and set(second.timings) == {"plain"}
+        assert run_tasks(tasks, use_cache=False, cache_root=tmp_path).results["keyed"] == 49
+
+    def test_duplicate_names(self):
+        with pytest.raises(ValueError):
+            run_tasks([Task("a", _power, (1,)), Task("a", _power, (2,))])
+
+
+class TestSharedArray:
+    """Shared-memory hand-off."""
+
+    def test_workers_attach(self):
+        data = np.arange(1_000, dtype=np.int64)
+        with SharedArray(data) as shared:
+            tasks = [Task(f"tail{k}", _tail_sum, (shared, k)) for k in (0, 10, 500)]
+            report = run_tasks(tasks, n_workers=2)
+            np.testing.assert_array_equal(shared.array, data)
+        assert report.results == {f"tail{k}": float(data[k:].sum()) for k in (0, 10, 500)}
+
+    def test_freed_on_close(self):
+        shared = SharedArray(np.ones((3, 4)))
+        name = shared._shm.name
+        assert shared.array.shape == (3, 4)
+        shared.close()
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+    def test_empty_array(self):
+        with SharedArray(np.empty(0)) as shared:
+            assert shared.array.size == 0
@@ -0,0 +1,115 @@
+"""
+Tests for the nearest-calibrated-state lookup.
+
+Validates:
+- Labels match the brute-force scan exactly, inside and outside the cube
+- Boundary cells are the only ones deferred to refinement
+- Tables round-trip through the disk cache
+- Category restriction and single-point queries
+"""
+
+import numpy as np
+import pytest
+
+from src import state_lookup
+from src.calibration_registry import calibration_arrays, calibration_index
+from src.state_lookup import (
+    AMBIGUOUS,
+    StateLookup,
+    brute_force_labels,
+    build_label_table,
+    nearest_state_lookup,
+)
+
+
+@pytest.fixture
+def cache_root(tmp_path):
+    state_lookup.clear_lookup_cache()
+    yield tmp_path
+    state_lookup.clear_lookup_cache()
+
+
+@pytest.fixture(scope="module")
+def lookup():
+    arrays = calibration_arrays()
+    return StateLookup(arrays.names, arrays.invariants, resolution=8)
+
+
+class TestLabels:
+    """Agreement with the exact scan."""
+
+    def test_matches_brute_force(self, lookup):
+        points = np.random.default_rng(0).random((200_000, 5))
+        np.testing.assert_array_equal(lookup.classify(points, chunk_size=30_000),
+                                      brute_force_labels(lookup.anchors, points))
+
+    def test_outside_cube_and_edges(self, lookup):
+        rng = np.random.default_rng(1)
+        points = np.vstack([rng.uniform(-0.5, 1.5, (5_000, 5)),
+                            rng.integers(0, 2, (64, 5)).astype(float)])
+        np.testing.assert_array_equal(lookup.classify(points),
+                                      brute_force_labels(lookup.anchors, points))
+
+    def test_safe_cells_are_inside_one_region(self, lookup):
+        # Sample points inside every unambiguous cell and check their label
+        rng = np.random.default_rng(2)
+        cells = np.flatnonzero(lookup.table != AMBIGUOUS)
+        corners = np.stack(np.unravel_index(cells, (8,) * 5), axis=-1)
+        points = (corners + rng.random(corners.shape)) / 8
+        np.testing.assert_array_equal(brute_force_labels(lookup.anchors, points),
+                                      lookup.table[cells])
+
+    def test_two_anchors(self):
+        anchors = np.array([[0.25] * 5, [0.75] * 5])
+        table = build_label_table(anchors, 4)
+        assert set(np.unique(table)) == {AMBIGUOUS, 0, 1}
+        assert table[0] == 0 and table[-1] == 1
+        # Ties on the bisector go to the lower index, as in argmin
+        lookup = StateLookup(["low", "high"], anchors, resolution=4, table=table)
+        assert lookup.classify(np.full((1, 5), 0.5))[0] == 0
+
+    def test_nearest(self, lookup):
+        arrays = calibration_arrays()
+        name, distance = lookup.nearest(arrays.invariants[3] + 0.001)
+        assert name == arrays.names[3]
+        assert distance == pytest.approx(np.sqrt(5) * 0.001)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            StateLookup(["a", "b"], np.zeros((1, 5)), resolution=4)
+        with pytest.raises(ValueError):
+            StateLookup(["a"], np.zeros((1, 5)), resolution=0)
+
+
+class TestCache:
+    """Calibration-keyed disk cache."""
+
+    def test_round_trip(self, cache_root):
+        built = nearest_state_lookup(resolution=6, cache_root=cache_root)
+        assert nearest_state_lookup(resolution=6, cache_root=cache_root) is built
+        assert len(list((cache_root / "state_lookup").iterdir())) == 1
+        assert not list((cache_root / "state_lookup").glob("*.partial.npz"))
+
+        state_lookup.clear_lookup_cache()
+        loaded = nearest_state_lookup(resolution=6, cache_root=cache_root)
+        assert loaded is not built
+        np.testing.assert_array_equal(loaded.table, built.table)
+        assert loaded.names == calibration_arrays().names
+
+    def test_key_depends_on_inputs(self, cache_root):
+        nearest_state_lookup(resolution=6, cache_root=cache_root)
+        nearest_state_lookup(resolution=7, cache_root=cache_root)
+        nearest_state_lookup(resolution=6, category="anesthesia", cache_root=cache_root)
+        assert len(list((cache_root / "state_lookup").iterdir())) == 3
+
+    def test_without_cache(self, cache_root):
+        nearest_state_lookup(resolution=6, use_cache=False, cache_root=cache_root)
+        assert not any((cache_root / "state_lookup").iterdir())
+
+    def test_category(self, cache_root):
+        lookup = nearest_state_lookup(resolution=6, category="anesthesia", cache_root=cache_root)
+        assert lookup.names == calibration_index().members("anesthesia")
+        labels = lookup.classify(np.random.default_rng(3).random((1_000, 5)))
+        assert labels.max() < len(lookup.names)
+        with pytest.raises(ValueError):
+            nearest_state_lookup(resolution=6, category="nonexistent", cache_root=cache_root)
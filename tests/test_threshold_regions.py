@@ -0,0 +1,136 @@
+"""
+Tests for certified threshold regions.
+
+Validates:
+- Gate and D ranges over boxes are exact (contain samples, match support)
+- Certified boxes hold D on the right side of the threshold at every sample
+- Above, below and boundary boxes tile the searched box
+- Volume bounds contain the exact fraction from DensityDistribution
+- Stopping on atol and on the box budget, reported by `converged`
+"""
+
+import numpy as np
+import pytest
+
+from src.batch_operators import density_batch
+from src.density_distribution import DensityDistribution
+from src.threshold_regions import (
+    box_volumes,
+    density_bounds,
+    gate_range,
+    threshold_regions,
+)
+
+SUB_BOX = {"phi": (0.8, 1.0), "H": (0.3, 1.0), "kappa": (0.0, 0.4)}
+SUB_BOX_BOUNDS = np.array([[0.8, 1.0], [0.0, 1.0], [0.0, 1.0], [0.3, 1.0], [0.0, 0.4]])
+
+
+def _random_boxes(n, seed=0):
+    return np.sort(np.random.default_rng(seed).random((n, 5, 2)), axis=-1)
+
+
+def _samples_in(boxes, per_box, seed=1):
+    u = np.random.default_rng(seed).random((len(boxes), per_box, 5))
+    low, width = boxes[:, None, :, 0], boxes[:, None, :, 1] - boxes[:, None, :, 0]
+    return (low + width * u).reshape(-1, 5)
+
+
+@pytest.fixture(scope="module")
+def regions():
+    return threshold_regions(0.05, atol=0.1)
+
+
+class TestBounds:
+    """Ranges of the gate and of D over boxes."""
+
+    def test_gate_range_contains_samples(self):
+        boxes = _random_boxes(500)
+        g_min, g_max = gate_range(boxes[:, 3], boxes[:, 4])
+        points = _samples_in(boxes, 200).reshape(500, 200, 5)
+        gate = 1.0 - np.sqrt(points[..., 3]) + points[..., 3] * points[..., 4]
+        assert np.all(gate >= g_min[:, None] - 1e-15)
+        assert np.all(gate <= g_max[:, None] + 1e-15)
+
+    def test_gate_vertex(self):
+        # κ_lo = 0.8 puts the minimum at s = 0.625 inside [0.5, 0.7]
+        g_min, g_max = gate_range(np.array([0.25, 0.49]), np.array([0.8, 1.0]))
+        assert g_min == pytest.approx(1.0 - 0.25 / 0.8)
+        assert g_max == pytest.approx(1.0 - 0.7 + 0.49)
+
+    def test_density_bounds_match_support(self):
+        for box in _random_boxes(20, seed=3):
+            assert density_bounds(box) == pytest.approx(DensityDistribution(box).support)
+
+
+class TestRegions:
+    """Branch-and-bound output."""
+
+    def test_certified_boxes(self, regions):
+        c = regions.threshold
+        assert np.all(density_batch(_samples_in(regions.above, 4)) >= c)
+        assert np.all(density_batch(_samples_in(regions.below, 4)) <= c)
+        assert np.all(density_bounds(regions.above)[0] >= c)
+        assert np.all(density_bounds(regions.below)[1] <= c)
+
+    def test_tiling(self, regions):
+        total = sum(box_volumes(boxes).sum()
+                    for boxes in (regions.above, regions.below, regions.boundary))
+        assert total == pytest.approx(1.0)
+        assert regions.fraction_above[1] == pytest.approx(1.0 - regions.fraction_below[0])
+
+    @pytest.mark.parametrize("threshold", [0.001, 0.05, 0.3])
+    def test_volumes_contain_exact_fraction(self, threshold):
+        result = threshold_regions(threshold, atol=0.1)
+        low, high = result.fraction_below
+        assert low <= DensityDistribution().cdf(threshold) <= high
+        assert result.undecided <= 0.1
+        assert result.converged
+
+    def test_sub_box(self):
+        result = threshold_regions(0.01, SUB_BOX, atol=0.1)
+        low, high = result.fraction_below
+        assert low <= DensityDistribution(SUB_BOX).cdf(0.01) <= high
+        assert np.all(result.boundary[:, 0, 0] >= 0.8)
+
+    @pytest.mark.parametrize("threshold", [0.001, 0.01, 0.05, 0.1, 0.3])
+    def test_defaults_converge(self, threshold):
+        result = threshold_regions(threshold)
+        assert result.converged
+        assert result.undecided <= 0.1
+
+    def test_budget(self):
+        result = threshold_regions(0.05, atol=0.0, max_boxes=1000)
+        assert result.n_evaluated <= 1000
+        assert not result.converged
+        assert result.undecided > threshold_regions(0.05, atol=0.0, max_boxes=10_000).undecided
+
+    def test_trivial_thresholds(self):
+        below = threshold_regions(1.5)
+        assert below.fraction_below == (1.0, 1.0) and below.n_evaluated == 1
+        assert below.converged
+        above = threshold_regions(0.0)
+        assert above.fraction_above == (1.0, 1.0) and len(above.boundary) == 0
+
+    def test_extent(self):
+        result = threshold_regions(0.01, SUB_BOX, atol=0.1)
+        extent = result.extent("below")
+        points = _samples_in(SUB_BOX_BOUNDS[None], 20_000)
+        inside = np.all((points >= extent[:, 0]) & (points <= extent[:, 1]), axis=1)
+        assert np.all(density_batch(points[~inside]) >= 0.01)
+        assert np.all(extent[:, 0] >= SUB_BOX_BOUNDS[:, 0])
+        with pytest.raises(ValueError):
+            result.extent("left")
+
+    def test_to_dict(self, regions):
+        summary = regions.to_dict()
+        assert summary["n_boundary_boxes"] == len(regions.boundary)
+        assert summary["fraction_below"] == list(regions.fraction_below)
+        assert summary["converged"] is regions.converged
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            threshold_regions(0.1, atol=-1.0)
+        with pytest.raises(ValueError):
+            threshold_regions(0.1, max_boxes=0)
+        with pytest.raises(ValueError):
+            threshold_regions(0.1, {"phi": (0.5, 0.5)})
@@ -0,0 +1,100 @@
+"""
+Tests for Monte Carlo uncertainty propagation.
+
+Validates:
+- Beta marginals reproduce the requested means and standard deviations
+- Empirical ranges take precedence over confidence levels
+- The propagated mean of D matches its closed form under independence
+- Ordering probabilities are complementary and seed-reproducible
+"""
+
+import numpy as np
+import pytest
+
+from src import uncertainty
+from src.calibration_registry import calibration_registry
+from src.uncertainty import (
+    InvariantDistributions,
+    invariant_distributions,
+    propagate_uncertainty,
+)
+
+scipy_special = pytest.importorskip("scipy.special")
+
+
+def _expected_D(dist):
+    """E[D] = E[φ]E[τ]E[ρ]·(1 - E[√H] + E[H]E[κ]) for independent Betas."""
+    a, b = dist.alpha, dist.beta
+    m = a / (a + b)
+    sqrt_H = scipy_special.beta(a[:, 3] + 0.5, b[:, 3]) / scipy_special.beta(a[:, 3], b[:, 3])
+    return m[:, 0] * m[:, 1] * m[:, 2] * (1 - sqrt_H + m[:, 3] * m[:, 4])
+
+
+@pytest.fixture(scope="module")
+def two_states():
+    return InvariantDistributions.from_moments(
+        ["high", "low"],
+        mean=[[0.8, 0.7, 0.6, 0.4, 0.7], [0.3, 0.2, 0.3, 0.5, 0.3]],
+        sd=0.08,
+    )
+
+
+class TestInvariantDistributions:
+    """Beta moment matching."""
+
+    def test_moments(self, two_states):
+        a, b = two_states.alpha, two_states.beta
+        var = a * b / ((a + b) ** 2 * (a + b + 1))
+        assert a / (a + b) == pytest.approx(two_states.mean)
+        assert np.sqrt(var) == pytest.approx(0.08)
+
+    def test_range_and_confidence(self):
+        dist = invariant_distributions()
+        states = calibration_registry()
+        i = dist.names.index("wakefulness")
+        lo, hi = states["wakefulness"].rho.empirical_range
+        assert dist.sd[i, 2] == pytest.approx((hi - lo) / 4)
+        confidence = states["wakefulness"].tau.confidence.value
+        assert dist.sd[i, 1] == uncertainty.CONFIDENCE_SD[confidence]
+
+    def test_invalid_sd(self):
+        with pytest.raises(ValueError):
+            InvariantDistributions.from_moments(["x"], [[0.5] * 5], 0.0)
+
+
+class TestPropagation:
+    """Batched Monte Carlo over all states."""
+
+    def test_mean_matches_closed_form(self, two_states):
+        result = propagate_uncertainty(two_states, n_samples=200_000, chunk_size=50_000)
+        se = result.std / np.sqrt(result.n_samples)
+        assert np.all(np.abs(result.mean - _expected_D(two_states)) < 5 * se + 1e-4)
+
+    def test_direct_sampler_agrees(self, two_states, monkeypatch):
+        monkeypatch.setattr(uncertainty, "SCIPY_AVAILABLE", False)
+        result = propagate_uncertainty(two_states, n_samples=100_000)
+        se = result.std / np.sqrt(result.n_samples)
+        assert np.all(np.abs(result.mean - _expected_D(two_states)) < 5 * se)
+
+    def test_ordering_probabilities(self, two_states):
+        result = propagate_uncertainty(two_states, n_samples=50_000)
+        p = result.prob_greater("high", "low")
+        assert p > 0.99
+        assert p + result.prob_greater("low", "high") == pytest.approx(1.0)
+        assert np.all(np.diag(result.ordering_probabilities()) == 0)
+
+    def test_credible_interval_contains_mean(self, two_states):
+        result = propagate_uncertainty(two_states, n_samples=50_000)
+        for i, (lo, hi) in enumerate(result.credible_interval(0.9).values()):
+            assert lo < result.mean[i] < hi
+
+    def test_reproducible(self, two_states):
+        first = propagate_uncertainty(two_states, n_samples=20_000, seed=3)
+        second = propagate_uncertainty(two_states, n_samples=20_000, seed=3)
+        assert np.array_equal(first.greater_counts, second.greater_counts)
+        assert np.array_equal(first.mean, second.mean)
+
+    def test_registry_states(self):
+        result = propagate_uncertainty(n_samples=20_000)
+        assert result.prob_greater("wakefulness", "propofol_anesthesia") > 0.95
+        assert set(result.summary()) == set(calibration_registry())